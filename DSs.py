@@ -10,12 +10,17 @@ import sys, os
 sys.path.append(os.path.join(os.path.dirname(__file__), '', 'Tools'))
 import assertions
 import precision
+import constants
 import counters
 import particleData
 import kinematics
+import fourVectorArrays
 import sudakovs
+import sudakovTables
+import trialBudgets
 import chains
 import showers
+import showerArrays
 import LHEFHandlers
 
 print "\n///////////////////"
@@ -33,22 +38,110 @@ def check_is_controller(toCheck):
 class controller(object):
 	"""A class for handling a dipole shower."""
 
-	def __init__(self,fileName,activeQCodes):
+	def __init__(self,fileName,activeQCodes,competitionSolver = False,sudakovTables = False,firstEmissionCache = False,lockstepBatchSize = 0,streamInput = False,
+		solveTrialBudget = constants.solve_trial_budget(),eventTrialBudget = constants.event_trial_budget(),trialBudgetPolicy = constants.trial_budget_policy(),eventRange = None,
+		columnInput = False):
 		"""A function to initiate a controller for showering an LHEF XML file."""
+		##competitionSolver gives each process its own Sudakov trial sequence instead of one summed veto.
+		##sudakovTables samples emissions from Sudakov tables built for the largest event S123, checked against the veto algorithm first.
+		##firstEmissionCache tabulates the first emission of starting dipoles that repeat, i.e. for fixed energy samples. Each..
+		##..table takes about 1 s to build, so it only saves time with thousands of events for each starting dipole.
+		##lockstepBatchSize > 0 showers that many events at once with showerArrays, 0 showers one at a time.
+		##streamInput reads the events one at a time with LHEFStreamReader, for files too large to hold.
+		##A solve or event taking more veto trials than its budget follows trialBudgetPolicy: 'abort', 'skip' or 'fail'.
+		##eventRange = [first,last) showers only those events, seeking to them with LHEFIndexedReader, so runs can share a file.
+		##columnInput reads the events with LHEFColumnReader, from arrays kept beside the file so later runs on it parse nothing.
 		assert (type(fileName) == str)
 		assert (type(activeQCodes) == list)
 		for qCode in activeQCodes:
 			assert qCode in particleData.knownParticles.get_known_quarks()
+		assert (type(competitionSolver) == bool)
+		assert (type(sudakovTables) == bool)
+		self.__sudakovTables = sudakovTables
+		assert (type(firstEmissionCache) == bool)
+		self.__firstEmissionCache = firstEmissionCache
+		assert ((type(lockstepBatchSize) == int) and (lockstepBatchSize >= 0))
+		self.__lockstepBatchSize = lockstepBatchSize
+		assert (type(streamInput) == bool)
+		self.__streamInput = streamInput
+		assert ((type(solveTrialBudget) == int) and (type(eventTrialBudget) == int) and (trialBudgetPolicy in trialBudgets.policies))
+		self.__trialBudgets = [solveTrialBudget,eventTrialBudget,trialBudgetPolicy]
+		assert ((eventRange == None) or ((type(eventRange) == list) and (len(eventRange) == 2)))
+		assert not (streamInput and (eventRange != None))
+		self.__eventRange = eventRange
+		assert (type(columnInput) == bool)
+		assert not (columnInput and (streamInput or (eventRange != None)))
+		self.__columnInput = columnInput
+		self.__competitionSolver = competitionSolver
 		self.__activeQCodes = activeQCodes
 		if not (fileName[-4:] == '.lhe'):
 			self.__toLoad = fileName + '.lhe'
 		else:
 			self.__toLoad = fileName
 
+	def check_conservation(self,particlesIn,eventIndicesIn,particlesOut,eventIndicesOut,numEvents):
+		"""A function to check the energy and S123 of every event are conserved by the shower, given each particle's event index."""
+		__momentaIn = fourVectorArrays.from_particles(particlesIn)
+		__momentaOut = fourVectorArrays.from_particles(particlesOut)
+		__EIn = fourVectorArrays.energies_per_event(__momentaIn,eventIndicesIn,numEvents)
+		__EOut = fourVectorArrays.energies_per_event(__momentaOut,eventIndicesOut,numEvents)
+		__S123In = fourVectorArrays.Sijk_per_event(__momentaIn,eventIndicesIn,numEvents)
+		__S123Out = fourVectorArrays.Sijk_per_event(__momentaOut,eventIndicesOut,numEvents)
+		return (fourVectorArrays.check_numbers_equal(__EIn,__EOut) and fourVectorArrays.check_numbers_equal(__S123In,__S123Out))
+
+	def build_sudakov_tables(self,reader):
+		"""A function to build, validate and return the Sudakov tables for the events in a LHEF file."""
+		__maxS123 = 0.0
+		for __eventIndex in reader:
+			__showerParticle1 = reader.get_event_particle(__eventIndex,2)
+			__showerParticle2 = reader.get_event_particle(__eventIndex,3)
+			__S123 = kinematics.Sijk([__showerParticle1.get_four_momentum(),__showerParticle2.get_four_momentum()])
+			__maxS123 = max(__maxS123,__S123)
+		print "Building the Sudakov tables up to S123 =", __maxS123
+		__tables = sudakovTables.sudakovTableSet(self.__activeQCodes,__maxS123)
+		__tables.validate()
+		return __tables
+
+	def read_event(self,reader,eventIndex):
+		"""A function to return the ME particles, the q and qBar to shower and the values to write of an event in a LHEF file."""
+		__particlesIn = [reader.get_event_particle(eventIndex,0),reader.get_event_particle(eventIndex,1)]
+		__showerParticles = [reader.get_event_particle(eventIndex,2),reader.get_event_particle(eventIndex,3)]
+		__values = [reader.get_event_trials(eventIndex),reader.get_event_muf2(eventIndex),reader.get_event_mur2(eventIndex)]
+		__values += [reader.get_event_process_ID(eventIndex),reader.get_event_weight(eventIndex),reader.get_event_scale(eventIndex)]
+		__values += [reader.get_event_alphaEM(eventIndex),reader.get_event_alphaS(eventIndex)]
+		return [__particlesIn,__showerParticles,__values]
+
+	def run_lockstep_batch(self,events):
+		"""A function to run a lockstep shower of the events given, as from read_event, returning the particles out of each."""
+		__batch = showerArrays.qqBarShowerBatch([__event[1] for __event in events],self.__activeQCodes)
+		__batch.run_shower()
+		return [__batch.export_results(__i1) for __i1 in range(len(events))]
+
+	def write_events(self,writer,events,particlesOuts):
+		"""A function to check conservation for showered events, as from read_event, and add them to the writer."""
+		##Checked for each block written, as one array operation over its events, not the whole file at once,..
+		##..so nothing is kept for every event.
+		__particlesIn, __eventIndicesIn, __particlesOut, __eventIndicesOut = [], [], [], []
+		for __i1, (__event, __particlesOuti) in enumerate(zip(events,particlesOuts)):
+			__particlesIn += __event[0]
+			__eventIndicesIn += [__i1]*len(__event[0])
+			__particlesOut += __particlesOuti
+			__eventIndicesOut += [__i1]*len(__particlesOuti)
+		assert self.check_conservation(__particlesIn,__eventIndicesIn,__particlesOut,__eventIndicesOut,len(events))
+		for __event, __particlesOuti in zip(events,particlesOuts):
+			writer.add_event(*(__event[2] + [__event[0],__particlesOuti]))
+
 	def run(self):
 		"""A function to run a shower for the given LHEF file."""
 		##For e+e- -> qqBar (massless).
-		__reader = LHEFHandlers.LHEFReader(self.__toLoad)
+		if self.__streamInput:
+			__reader = LHEFHandlers.LHEFStreamReader(self.__toLoad)
+		elif (self.__eventRange != None):
+			__reader = LHEFHandlers.LHEFIndexedReader(self.__toLoad,*self.__eventRange)
+		elif self.__columnInput:
+			__reader = LHEFHandlers.LHEFColumnReader(self.__toLoad)
+		else:
+			__reader = LHEFHandlers.LHEFReader(self.__toLoad)
 		self.__numEvents = __reader.get_number_events()
 		__writer = LHEFHandlers.LHEFShowerWriter(__reader,self.__numEvents)
 		__alertEvery = self.__numEvents/10
@@ -56,41 +149,56 @@ class controller(object):
 			__alertEvery = 1000
 		elif (__alertEvery == 0): ##i.e < 10 events.
 			__alertEvery = 1
-		for __eventIndex in range(self.__numEvents):
+		sudakovs.set_competition_solver(self.__competitionSolver)
+		trialBudgets.budget.set_budgets(*self.__trialBudgets)
+		if self.__sudakovTables:
+			sudakovs.set_sudakov_tables(self.build_sudakov_tables(__reader))
+		else:
+			sudakovs.set_sudakov_tables(None)
+		if self.__firstEmissionCache:
+			sudakovs.set_first_emission_cache(sudakovTables.firstEmissionCache())
+		else:
+			sudakovs.set_first_emission_cache(None)
+		__batchEvents = [] ##Waiting to be showered in lockstep.
+		__doneEvents, __doneParticlesOuts = [], [] ##Showered, waiting to be checked and written together.
+		__writeEvery = constants.LHEF_flush_events() ##As the writer writes them to the file.
+		for __eventIndex in __reader:
 			if (__eventIndex%__alertEvery == 0):
 				if (__eventIndex == 0):
 					print "Begin showering...\n"
 				else:
 					print "Showering event", __eventIndex
-			__MEParticle1 = __reader.get_event_particle(__eventIndex,0)
-			__MEParticle2 = __reader.get_event_particle(__eventIndex,1)
-			__EIn = __MEParticle1[0] + __MEParticle2[0]
-			__S123In = kinematics.Sijk([__MEParticle1.get_four_momentum(), __MEParticle2.get_four_momentum()])
-			__particlesIn = [__MEParticle1,__MEParticle2]
-			__showerParticle1 = __reader.get_event_particle(__eventIndex,2)
-			__showerParticle2 = __reader.get_event_particle(__eventIndex,3)
-			__showeri = showers.qqBarShower(__showerParticle1,__showerParticle2,self.__activeQCodes)
-			__showeri.run_shower()
-			__particlesOut = __showeri.export_results()
-			__EOut = 0.0
-			__fourVectorsOut = []
-			for __p in __particlesOut:
-				__ePV = __p.get_four_momentum()
-				__EOut += __ePV[0]
-				__fourVectorsOut.append(__ePV)
-			assert precision.check_numbers_equal(kinematics.Sijk(__fourVectorsOut),__S123In)
-			assert precision.check_numbers_equal(__EIn,__EOut)
-			__trials, __muf2, __mur2 = __reader.get_event_trials(__eventIndex), __reader.get_event_muf2(__eventIndex), __reader.get_event_mur2(__eventIndex)
-			__processID, __weight = __reader.get_event_process_ID(__eventIndex), __reader.get_event_weight(__eventIndex)
-			__scale, __alphaEM = __reader.get_event_scale(__eventIndex), __reader.get_event_alphaEM(__eventIndex)
-			__alphaS = __reader.get_event_alphaS(__eventIndex)
-			__writer.add_event(__trials,__muf2,__mur2,__processID,__weight,__scale,__alphaEM,__alphaS,__particlesIn,__particlesOut)
+			__event = self.read_event(__reader,__eventIndex)
+			if (self.__lockstepBatchSize > 0):
+				__batchEvents.append(__event)
+				if (len(__batchEvents) == self.__lockstepBatchSize):
+					__doneEvents += __batchEvents
+					__doneParticlesOuts += self.run_lockstep_batch(__batchEvents)
+					__batchEvents = []
+			else:
+				__showeri = showers.qqBarShower(__event[1][0],__event[1][1],self.__activeQCodes)
+				__showeri.run_shower()
+				__doneEvents.append(__event)
+				__doneParticlesOuts.append(__showeri.export_results())
+			if (len(__doneEvents) >= __writeEvery):
+				self.write_events(__writer,__doneEvents,__doneParticlesOuts)
+				__doneEvents, __doneParticlesOuts = [], []
+		if __batchEvents: ##The last, smaller, batch.
+			__doneEvents += __batchEvents
+			__doneParticlesOuts += self.run_lockstep_batch(__batchEvents)
+		if __doneEvents:
+			self.write_events(__writer,__doneEvents,__doneParticlesOuts)
 		__writer.save()
 		__numGluonsSplit = counters.gluonSplitCounter.counted()
 		print "\nThere were", counters.gluonProdCounter.counted(), "gluons produced!"
 		print "\nThere were", __numGluonsSplit, "gluons split!"
 		print "\nThere were", counters.photonProdCounter.counted(), "photons produced!"
-		print "\nThere were", counters.kPerpProdWarningCounter.counted(), "warnings for E1 or E3 < E2!\n"
+		print "\nThere were", counters.kPerpProdWarningCounter.counted(), "warnings for E1 or E3 < E2!"
+		print "\nThere were", counters.solveBudgetHitCounter.counted(), "solves and", counters.eventBudgetHitCounter.counted(), "events over their trial budgets!\n"
+		sudakovs.overestimates.report()
+		trialBudgets.budget.report()
+		if self.__firstEmissionCache:
+			print "\nThere were", sudakovs.firstEmissionCacheInUse.number_tables(), "first emission tables built."
 		print "\n---------------------"
 		print "Quark content report:"
 		print "---------------------"
@@ -158,7 +266,8 @@ if __name__ == "__main__":
 		assertions.show_graph()
 
 	##Setup here:##
-	__thePath, __activeQCodes = None, None
+	__thePath, __activeQCodes, __competitionSolver, __sudakovTables, __firstEmissionCache = None, None, False, False, False
+	__lockstepBatchSize, __trialBudgetPolicy, __streamInput, __eventRange, __columnInput = 0, constants.trial_budget_policy(), False, None, False
 	while ((type(__thePath) != str) or (__thePath == "")):
 		try:
 			__thePath = str(raw_input("\nEnter the relative path of the LHEF input or leave blank to use clipboard: "))
@@ -169,10 +278,32 @@ if __name__ == "__main__":
 				__activeQCodes = constants.active_q_codes()
 			else:
 				__activeQCodes = [int(__x) for __x in __activeQCodes if __x != ' ']
+			__competitionSolver = (raw_input("\nEnter y to use the competition Sudakov solver or leave blank for the summed one: ") == "y")
+			__sudakovTables = (raw_input("\nEnter y to sample from tabulated Sudakovs or leave blank for the veto algorithm: ") == "y")
+			__firstEmissionCache = (raw_input("\nEnter y to cache tables of repeated first emissions or leave blank to solve them with the veto algorithm: ") == "y")
+			__lockstepBatchSize = raw_input("\nEnter the number of events to shower together in lockstep or leave blank to shower one at a time: ")
+			if (__lockstepBatchSize == ""):
+				__lockstepBatchSize = 0
+			else:
+				__lockstepBatchSize = int(__lockstepBatchSize)
+			__streamInput = (raw_input("\nEnter y to read the events one at a time or leave blank to read the whole file first: ") == "y")
+			if not __streamInput:
+				__columnInput = (raw_input("\nEnter y to read the events from columns kept beside the file or leave blank to parse them: ") == "y")
+			if not (__streamInput or __columnInput):
+				__eventRange = raw_input("\nEnter the first and last (not showered) events seperated by a space or leave blank for all: ")
+				if (__eventRange == ""):
+					__eventRange = None
+				else:
+					__eventRange = [int(__x) for __x in __eventRange.split(' ') if __x != '']
+			__trialBudgetPolicy = raw_input("\nEnter abort, skip or fail for solves and events over their trial budgets or leave blank for the default: ")
+			if (__trialBudgetPolicy == ""):
+				__trialBudgetPolicy = constants.trial_budget_policy()
 		except:
 			pass
 	##Run##
-	theController = controller(__thePath,__activeQCodes)
+	theController = controller(__thePath,__activeQCodes,__competitionSolver,__sudakovTables,__firstEmissionCache,__lockstepBatchSize,__streamInput,
+		constants.solve_trial_budget(),constants.event_trial_budget(),__trialBudgetPolicy,__eventRange,
+		__columnInput)
 	theController.run()
 	__crossSecsGluSplit = sudakovs.crossSecsGluSplit.output()
 	__crossSecsGluProd = sudakovs.crossSecsGluProd.output()
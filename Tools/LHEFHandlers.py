@@ -7,10 +7,16 @@
 
 ##Uses DOM instead of SAX which was the other option.
 ##Document Object Model should be faster but could use more memory.
+##LHEFStreamReader instead scans the file a line at a time, for files too large to hold as a DOM.
+##LHEFIndexedReader seeks to each event with a sidecar index of where they are in the file, so any events can be read,..
+##..or a range of them given to each of several runs of one file.
+##LHEFColumnReader reads the events from arrays of all their values, converted once and kept in a sidecar, with no parsing.
 
 ##Import required modules:##
 import xml.dom.minidom
 import os
+import re
+import numpy
 import pyperclip
 import datetime
 import assertions
@@ -32,6 +38,26 @@ def check_is_LHEFReader(toCheck):
 	"""A function to check for an instance of the LHEFReader class."""
 	return isinstance(toCheck,LHEFReader)
 
+def check_is_LHEFStreamReader(toCheck):
+	"""A function to check for an instance of the LHEFStreamReader class."""
+	return isinstance(toCheck,LHEFStreamReader)
+
+def check_is_LHEFIndexedReader(toCheck):
+	"""A function to check for an instance of the LHEFIndexedReader class."""
+	return isinstance(toCheck,LHEFIndexedReader)
+
+def check_is_LHEFColumnReader(toCheck):
+	"""A function to check for an instance of the LHEFColumnReader class."""
+	return isinstance(toCheck,LHEFColumnReader)
+
+def check_is_LHEFEventRecord(toCheck):
+	"""A function to check for an instance of the LHEFEventRecord class."""
+	return isinstance(toCheck,LHEFEventRecord)
+
+def check_is_LHEFEventBuffer(toCheck):
+	"""A function to check for an instance of the LHEFEventBuffer class."""
+	return isinstance(toCheck,LHEFEventBuffer)
+
 def check_is_LHEFShowerWriter(toCheck):
 	"""A function to check for an instance of the LHEFShowerWriter class."""
 	return isinstance(toCheck,LHEFShowerWriter)
@@ -49,8 +75,201 @@ def zero_or(value):
 	else:
 		return value
 
+def is_event_start(line):
+	"""A function to check whether a line of a LHEF XML file opens an event."""
+	return (re.match(r'\s*<event[\s>]',line) != None)
+
+def is_event_end(line):
+	"""A function to check whether a line of a LHEF XML file closes an event."""
+	return line.lstrip().startswith('</event>')
+
+def event_index_path(fileName):
+	"""A function to return the path of the sidecar event index of a LHEF XML file."""
+	assert (type(fileName) == str)
+	return fileName + '.idx.npy'
+
+def file_stamp(fileName):
+	"""A function to return the size and modification time (in microseconds) of a file, for checking an event index is of it."""
+	__stat = os.stat(fileName)
+	return [int(__stat.st_size),int(round(__stat.st_mtime*1.0e6))]
+
+def build_event_index(fileName):
+	"""A function to scan a LHEF XML file once for the byte offset and length of every event and save them as its sidecar index."""
+	##Saved as an int64 array with the file's size and modification time in the first row and an [offset,length] row for each event.
+	##Each event runs from the start of its <event> line to the end of its </event> line, so as LHEFStreamReader they must begin lines.
+	__rows, __offset, __start = [file_stamp(fileName)], 0, None
+	with open(fileName, 'rb') as fileToRead:
+		for __line in fileToRead:
+			if is_event_start(__line):
+				__start = __offset
+			__offset += len(__line)
+			if ((__start != None) and is_event_end(__line)):
+				__rows.append([__start,__offset - __start])
+				__start = None
+	__index = numpy.array(__rows,dtype=numpy.int64).reshape((len(__rows),2))
+	try:
+		with open(event_index_path(fileName), 'wb') as indexFile:
+			numpy.save(indexFile,__index)
+	except IOError:
+		print "\nWARNING: Couldn't save the event index of", fileName, "so it will be rebuilt next time.\n"
+	return __index[1:]
+
+def load_event_index(fileName):
+	"""A function to return the [offset,length] of every event in a LHEF XML file, from its sidecar index unless out of date."""
+	##The index is rebuilt if missing, unreadable or the file's size or modification time have changed since it was built.
+	try:
+		__index = numpy.load(event_index_path(fileName))
+		if ((__index.ndim == 2) and (__index.shape[1] == 2) and ([int(x) for x in __index[0]] == file_stamp(fileName))):
+			return __index[1:]
+	except (IOError,ValueError):
+		pass
+	print "\nIndexing events...\n"
+	return build_event_index(fileName)
+
+def event_columns_path(fileName):
+	"""A function to return the path of the sidecar event columns of a LHEF XML file."""
+	assert (type(fileName) == str)
+	return fileName + '.cols.npz'
+
+def build_event_columns(fileName):
+	"""A function to convert every event of a LHEF XML file to columns in one pass and save them as its sidecar columns."""
+	##'events' has a row of header values for each event and 'particles' a row for every particle of every event in turn,..
+	##..with 'offsets' giving where each event's particles start and end. The top row and attributes of each event are also..
+	##..kept as read in 'eventStrings', as they are written back out so. 'stamp' is the file's size and modification time.
+	__stamp = file_stamp(fileName)
+	__reader = LHEFStreamReader(fileName)
+	__events, __eventStrings, __particles, __offsets = [], [], [], [0]
+	for __eventIndex in __reader:
+		__record = __reader.get_event_record(__eventIndex)
+		__top = __record.get_top_row_values()[:6]
+		__events.append((int(__top[0]),int(__top[1]),float(__top[2]),float(__top[3]),float(__top[4]),float(__top[5])))
+		__attributes = [__reader.get_event_trials(__eventIndex),__reader.get_event_muf2(__eventIndex),__reader.get_event_mur2(__eventIndex)]
+		__eventStrings.append(__top + [str(x) for x in __attributes])
+		__particles += [(__eventIndex,) + __record.get_particle_values(__i1) for __i1 in range(__record.number_particles())]
+		__offsets.append(len(__particles))
+	__columns = {'stamp':numpy.array(__stamp,dtype=numpy.int64),'offsets':numpy.array(__offsets,dtype=numpy.int64)}
+	__columns['events'] = numpy.array(__events,dtype=eventColumnsType)
+	__columns['eventStrings'] = numpy.array(__eventStrings,dtype=str).reshape((len(__eventStrings),9))
+	__columns['particles'] = numpy.array(__particles,dtype=particleColumnsType)
+	try:
+		with open(event_columns_path(fileName), 'wb') as columnsFile:
+			numpy.savez(columnsFile,**__columns)
+	except IOError:
+		print "\nWARNING: Couldn't save the event columns of", fileName, "so they will be rebuilt next time.\n"
+	return __columns
+
+def load_event_columns(fileName):
+	"""A function to return the columns of every event in a LHEF XML file, from its sidecar columns unless out of date."""
+	##The columns are rebuilt if missing, unreadable or the file's size or modification time have changed since they were built.
+	try:
+		with numpy.load(event_columns_path(fileName)) as __loaded:
+			__columns = dict([(__key,__loaded[__key]) for __key in ['stamp','offsets','events','eventStrings','particles']])
+		if ([int(x) for x in __columns['stamp']] == file_stamp(fileName)):
+			return __columns
+	except (IOError,ValueError,KeyError):
+		pass
+	print "\nConverting events to columns...\n"
+	return build_event_columns(fileName)
+
+def shard_event_range(numberEvents,numberShards,shardIndex):
+	"""A function to return the [first,last) events of one of a number of near equal, disjoint ranges covering all the events."""
+	assert ((type(numberEvents) == int) and (numberEvents >= 0))
+	assert ((type(numberShards) == int) and (numberShards > 0))
+	assert ((type(shardIndex) == int) and (0 <= shardIndex < numberShards))
+	return [(numberEvents*shardIndex)/numberShards,(numberEvents*(shardIndex + 1))/numberShards]
+
+##Column types of LHEFColumnReader:##
+eventColumnsType = numpy.dtype([('numberParticles',numpy.int64),('processID',numpy.int64),('weight',numpy.float64),('scale',numpy.float64),
+	('alphaEM',numpy.float64),('alphaS',numpy.float64)])
+particleColumnsType = numpy.dtype([('event',numpy.int64),('ID',numpy.int64),('status',numpy.int64),('mother1',numpy.int64),('mother2',numpy.int64),
+	('colour1',numpy.int64),('colour2',numpy.int64),('px',numpy.float64),('py',numpy.float64),('pz',numpy.float64),('E',numpy.float64),
+	('m',numpy.float64),('lifetime',numpy.float64),('spin',numpy.float64)])
+
 ##Classes:##
 
+class LHEFEventRecord(object):
+	"""A class for the values of an event from a LHEF XML file, parsed once from its lines."""
+	##The top row is kept as strings, as it is written back out as read, and each particle row is also converted to numbers.
+	##Only the number of particles the top row gives are converted, so any other lines in the event are left alone.
+	##Each particle's values are kept in the order of the LHEF, i.e. ID, status, mothers, colours, px, py, pz, E, mass, lifetime, spin.
+
+	def __init__(self,rowStrings):
+		"""A function to initiate a record from the lines of an event, ignoring blank lines."""
+		assert (type(rowStrings) == list)
+		__rows = [__row.split() for __row in rowStrings]
+		__rows = [__row for __row in __rows if __row] ##Blank lines would otherwise be taken as particles.
+		assert __rows ##An event needs at least its top row.
+		self.__topRowValues = __rows[0]
+		self.__particleStrings = __rows[1:]
+		self.__particleValues = []
+		for __row in self.__particleStrings[:int(self.__topRowValues[0])]:
+			__ints = tuple([int(x) for x in __row[:6]])
+			self.__particleValues.append(__ints + tuple([float(x) for x in __row[6:13]]))
+
+	@staticmethod
+	def from_values(topRowValues,particleValues):
+		"""A function to create a record directly from the top row strings and each particle's values, as from LHEFColumnReader."""
+		##No particle strings are kept as there are none to keep.
+		__result0 = object.__new__(LHEFEventRecord)
+		__result0.__topRowValues = topRowValues
+		__result0.__particleStrings = None
+		__result0.__particleValues = particleValues
+		return __result0
+
+	def get_top_row_values(self):
+		"""A function to return the strings of the top row of the event."""
+		return list(self.__topRowValues)
+
+	def get_top_row_value(self,index):
+		"""A function to return a string of the top row of the event."""
+		return self.__topRowValues[index]
+
+	def number_particles(self):
+		"""A function to return the number of particles converted to numbers."""
+		return len(self.__particleValues)
+
+	def get_particle_strings(self,particleIndex):
+		"""A function to return the strings of a particle row of the event."""
+		assert (self.__particleStrings != None) ##Not kept by records from values.
+		return list(self.__particleStrings[particleIndex])
+
+	def get_particle_values(self,particleIndex):
+		"""A function to return the values of a particle in the order of the LHEF."""
+		return self.__particleValues[particleIndex]
+
+	def get_particle_ID(self,particleIndex):
+		"""A function to return the ID of a particle."""
+		return self.__particleValues[particleIndex][0]
+
+	def get_particle_when(self,particleIndex):
+		"""A function to return the initial/intermediate/final state code of a particle."""
+		return self.__particleValues[particleIndex][1]
+
+	def get_particle_mothers(self,particleIndex):
+		"""A function to return the mothers of a particle."""
+		return list(self.__particleValues[particleIndex][2:4])
+
+	def get_particle_colours(self,particleIndex):
+		"""A function to return the colours of a particle."""
+		return list(self.__particleValues[particleIndex][4:6])
+
+	def get_particle_four_momentum(self,particleIndex):
+		"""A function to return a new four-momentum of a particle."""
+		__p = self.__particleValues[particleIndex]
+		return fourVectors.fourVector.from_floats(__p[9],__p[6],__p[7],__p[8]) ##Energy is the last component in the LHEF.
+
+	def get_particle_mass(self,particleIndex):
+		"""A function to return the mass of a particle."""
+		return self.__particleValues[particleIndex][10]
+
+	def get_particle_lifetime(self,particleIndex):
+		"""A function to return the proper lifetime of a particle."""
+		return self.__particleValues[particleIndex][11]
+
+	def get_particle_spin(self,particleIndex):
+		"""A function to return the spin of a particle."""
+		return self.__particleValues[particleIndex][12]
+
 class LHEFReader(object):
 	"""A class for reading events from LHEF XML files."""
 
@@ -61,12 +280,21 @@ class LHEFReader(object):
 			self.__toRead = fileName + '.lhe'
 		else:
 			self.__toRead = fileName
+		self.__recordIndex, self.__record = None, None ##Of the last event asked for, so each event is parsed once.
+		self.load()
+
+	def load(self):
+		"""A function to read the events of the LHEF XML file."""
 		##Open XML document using minidom parser.
 		print "\nReading file...\n"
 		self.__DOMTree = xml.dom.minidom.parse(self.__toRead)
 		self.__data = self.__DOMTree.documentElement
 		self.__events = self.__data.getElementsByTagName("event")
 
+	def __iter__(self):
+		"""A function to iterate over the indices of the events."""
+		return iter(xrange(self.get_number_events()))
+
 	def get_source_string(self):
 		"""A function to return a string of the source file used."""
 		return self.__toRead
@@ -77,6 +305,17 @@ class LHEFReader(object):
 			__theString = fileToRead.read()
 		return __theString
 
+	def get_top_string(self):
+		"""A function to return the LHEF XML file above the first event as a string."""
+		##Read a line at a time so the events are never loaded.
+		__lines = []
+		with open(self.__toRead, 'r') as fileToRead:
+			for __line in fileToRead:
+				if is_event_start(__line):
+					break
+				__lines.append(__line)
+		return ''.join(__lines)[:-1] ##Without the line break before the first event.
+
 	def get_number_events(self):
 		"""A function to return the number of events in a LHEF XML file."""
 		return len(self.__events)
@@ -108,136 +347,327 @@ class LHEFReader(object):
 		"""A function to return the data of an event from a LHEF XML file."""
 		##Returns a list of each line in the event, ignoring blank lines.
 		assert (type(eventIndex) == int)
-		__theEventStr = str(self.__events[eventIndex].childNodes[0].data)
+		__theEventStr = str(self.get_event_object(eventIndex).childNodes[0].data)
 		__theEventLines = __theEventStr.split('\n')
 		__theEventLines = __theEventLines[1:-1] ##Cut off blank lines.
 		return __theEventLines
 
+	def get_event_record(self,eventIndex):
+		"""A function to return the values of an event in a LHEF XML file, parsing its lines only if not the last event asked for."""
+		assert (type(eventIndex) == int)
+		if (eventIndex != self.__recordIndex):
+			self.__record = self.read_event_record(eventIndex)
+			self.__recordIndex = eventIndex
+		return self.__record
+
+	def read_event_record(self,eventIndex):
+		"""A function to parse the values of an event in a LHEF XML file from its lines."""
+		return LHEFEventRecord(self.get_event_row_strings(eventIndex))
+
+	def clear_event_record(self):
+		"""A function to forget the last event parsed, for when the events read change."""
+		self.__recordIndex, self.__record = None, None
+
 	def get_event_top_row_values(self,eventIndex):
 		"""A function to return the top row of a LHEF XML file."""
 		assert (type(eventIndex) == int)
-		__topRowValues = self.get_event_row_strings(eventIndex)[0]
-		##Strip out any spaces
-		__topRowValues = __topRowValues.replace('\t',' ').split(' ')
-		return [x for x in __topRowValues if (x != '' and x != '\t')]
+		return self.get_event_record(eventIndex).get_top_row_values()
 
 	def get_event_number_particles(self,eventIndex):
 		"""A function to get the number of particles in an event in a LHEF XML file."""
 		assert (type(eventIndex) == int)
-		return self.get_event_top_row_values(eventIndex)[0]
+		return self.get_event_record(eventIndex).get_top_row_value(0)
 
 	def get_event_process_ID(self,eventIndex):
 		"""A function to get the process ID in an event in a LHEF XML file."""
 		assert (type(eventIndex) == int)
-		return self.get_event_top_row_values(eventIndex)[1]
+		return self.get_event_record(eventIndex).get_top_row_value(1)
 
 	def get_event_weight(self,eventIndex):
 		"""A function to get the weight in an event in a LHEF XML file."""
 		assert (type(eventIndex) == int)
-		return self.get_event_top_row_values(eventIndex)[2]
+		return self.get_event_record(eventIndex).get_top_row_value(2)
 
 	def get_event_scale(self,eventIndex):
 		"""A function to get the scale in an event in a LHEF XML file."""
 		assert (type(eventIndex) == int)
-		return self.get_event_top_row_values(eventIndex)[3]
+		return self.get_event_record(eventIndex).get_top_row_value(3)
 
 	def get_event_alphaEM(self,eventIndex):
 		"""A function to get the EM coupling constant in an event in a LHEF XML file."""
 		assert (type(eventIndex) == int)
-		return self.get_event_top_row_values(eventIndex)[4]
+		return self.get_event_record(eventIndex).get_top_row_value(4)
 
 	def get_event_alphaS(self,eventIndex):
 		"""A function to get the strong coupling constant in an event in a LHEF XML file."""
 		assert (type(eventIndex) == int)
-		return self.get_event_top_row_values(eventIndex)[5]
+		return self.get_event_record(eventIndex).get_top_row_value(5)
 
 	def get_event_particle_strings(self,eventIndex,particleIndex):
 		"""A function to return the details of a particle from an event in an LHEF XML file."""
 		assert ((type(eventIndex) == int) and (type(particleIndex) == int))
-		##Ignore the top line which is not a particle gives +1 in index below.
-		__theDetails = self.get_event_row_strings(eventIndex)[particleIndex + 1].replace('\t',' ').split(' ')
-		__theDetails = [x for x in __theDetails if (x != '' and x != '\t')]
-		return __theDetails
+		return self.get_event_record(eventIndex).get_particle_strings(particleIndex)
 
 	def get_event_particle_ID(self,eventIndex,particleIndex):
 		"""A function to get the ID of a particle in an event in an LHEF XML file."""
 		assert ((type(eventIndex) == int) and (type(particleIndex) == int))
-		return int(self.get_event_particle_strings(eventIndex,particleIndex)[0])
+		return self.get_event_record(eventIndex).get_particle_ID(particleIndex)
 
 	def get_event_particle_when(self,eventIndex,particleIndex):
 		"""A function to get the initial/intermediate/final state code of a particle in an event in an LHEF XML file."""
 		assert ((type(eventIndex) == int) and (type(particleIndex) == int))
-		##Assumed when code should be an integer when outputting.
-		return int(self.get_event_particle_strings(eventIndex,particleIndex)[1])
+		return self.get_event_record(eventIndex).get_particle_when(particleIndex)
 
 	def get_event_particle_mothers(self,eventIndex,particleIndex):
 		"""A function to get the mothers of a particle in an event in an LHEF XML file."""
 		assert ((type(eventIndex) == int) and (type(particleIndex) == int))
-		##Assumed mother codes should be an integer when outputting.
-		__mother1 = int(self.get_event_particle_strings(eventIndex,particleIndex)[2])
-		__mother2 = int(self.get_event_particle_strings(eventIndex,particleIndex)[3])
-		return [__mother1,__mother2]
+		return self.get_event_record(eventIndex).get_particle_mothers(particleIndex)
 
 	def get_event_particle_colours(self,eventIndex,particleIndex):
 		"""A function to get the coloursL of a particle in an event in an LHEF XML file."""
 		assert ((type(eventIndex) == int) and (type(particleIndex) == int))
-		##Assumed colour codes should be an integer when outputting.
-		__colour1 = int(self.get_event_particle_strings(eventIndex,particleIndex)[4])
-		__colour2 = int(self.get_event_particle_strings(eventIndex,particleIndex)[5])
-		return [__colour1,__colour2]
+		return self.get_event_record(eventIndex).get_particle_colours(particleIndex)
 
 	def get_event_particle_four_momentum(self,eventIndex,particleIndex):
 		"""A function to get the four-momentum of a particle in an event in an LHEF XML file."""
 		assert ((type(eventIndex) == int) and (type(particleIndex) == int))
-		__fourVector = fourVectors.fourVector()
-		##Energy is the last component in the LHEF
-		__fourVector[0] = float(self.get_event_particle_strings(eventIndex,particleIndex)[9])
-		__fourVector[1] = float(self.get_event_particle_strings(eventIndex,particleIndex)[6])
-		__fourVector[2] = float(self.get_event_particle_strings(eventIndex,particleIndex)[7])
-		__fourVector[3] = float(self.get_event_particle_strings(eventIndex,particleIndex)[8])
-		return __fourVector
+		return self.get_event_record(eventIndex).get_particle_four_momentum(particleIndex)
 
 	def get_event_particle_mass(self,eventIndex,particleIndex):
 		"""A function to get the mass of a particle in an event in an LHEF XML file."""
 		assert ((type(eventIndex) == int) and (type(particleIndex) == int))
-		return float(self.get_event_particle_strings(eventIndex,particleIndex)[10])
+		return self.get_event_record(eventIndex).get_particle_mass(particleIndex)
 
 	def get_event_particle_lifetime(self,eventIndex,particleIndex):
 		"""A function to get the proper lifetime of a particle in an event in an LHEF XML file."""
 		assert ((type(eventIndex) == int) and (type(particleIndex) == int))
-		return float(self.get_event_particle_strings(eventIndex,particleIndex)[11])
+		return self.get_event_record(eventIndex).get_particle_lifetime(particleIndex)
 
 	def get_event_particle_spin(self,eventIndex,particleIndex):
 		"""A function to get the spin of a particle in an event in an LHEF XML file."""
 		assert ((type(eventIndex) == int) and (type(particleIndex) == int))
-		return float(self.get_event_particle_strings(eventIndex,particleIndex)[12])
+		return self.get_event_record(eventIndex).get_particle_spin(particleIndex)
 
 	def get_event_particle(self,eventIndex,particleIndex):
 		"""A function to return a particle object from an LHEF XML file given it's indices."""
-		__code = self.get_event_particle_ID(eventIndex,particleIndex)
-		__fM = self.get_event_particle_four_momentum(eventIndex,particleIndex)
-		__mothers = self.get_event_particle_mothers(eventIndex,particleIndex)
+		__record = self.get_event_record(eventIndex)
+		__code = __record.get_particle_ID(particleIndex)
+		__fM = __record.get_particle_four_momentum(particleIndex)
+		__mothers = __record.get_particle_mothers(particleIndex)
 		__children = [0,0] ##LHEF doesn't have children; only mothers.
-		__colours = self.get_event_particle_colours(eventIndex,particleIndex)
-		__statusCode = self.get_event_particle_when(eventIndex,particleIndex)
+		__colours = __record.get_particle_colours(particleIndex)
+		__statusCode = __record.get_particle_when(particleIndex)
 		__theParticle = particles.particle(__code,__fM,__mothers,__children,__colours,__statusCode)
 		##Assuming the LHEF file is appropriately ordered:
 		__theParticle.set_unique_ID(particleIndex+1) ##+1 as start at particle 1.
 		return __theParticle
 
+class LHEFStreamReader(LHEFReader):
+	"""A class for reading events from LHEF XML files one at a time, without holding the whole file."""
+	##Iterating over the reader makes each event the current one in turn, and only it is kept, so memory doesn't grow with the file.
+	##The get_event_* functions of LHEFReader then work for the current event only.
+	##Assumes every <event> and </event> tag begins a line, as LHEFShowerWriter and LHEFMEWriter write them.
+
+	def load(self):
+		"""A function to prepare to read the events of the LHEF XML file, which happens as they are iterated over."""
+		self.__numEvents = None
+		self.__eventIndex, self.__eventAttributes, self.__eventLines = None, {}, []
+
+	def __iter__(self):
+		"""A function to iterate over the events from the start of the file, making each the current event and yielding its index."""
+		##The rows are the lines before </event> or any tag in the event, as the first text node of the event in LHEFReader.
+		self.__eventIndex = -1
+		self.clear_event_record()
+		__inEvent, __inRows = False, False
+		with open(self.get_source_string(), 'r') as fileToRead:
+			for __line in fileToRead:
+				if is_event_start(__line):
+					self.__eventAttributes = dict(re.findall(r'(\w+)\s*=\s*[\'"]([^\'"]*)[\'"]',__line))
+					self.__eventLines = []
+					__inEvent, __inRows = True, True
+				elif (__inEvent and is_event_end(__line)):
+					__inEvent = False
+					self.__eventIndex += 1
+					yield self.__eventIndex
+				elif (__inRows and __line.lstrip().startswith('<')):
+					__inRows = False
+				elif __inRows:
+					self.__eventLines.append(__line.rstrip('\r\n'))
+
+	def get_number_events(self):
+		"""A function to return the number of events in a LHEF XML file, counted once by scanning it."""
+		if (self.__numEvents == None):
+			self.__numEvents = 0
+			with open(self.get_source_string(), 'r') as fileToRead:
+				for __line in fileToRead:
+					if is_event_start(__line):
+						self.__numEvents += 1
+		return self.__numEvents
+
+	def check_current_event(self,eventIndex):
+		"""A function to check an event index is that of the current event."""
+		assert (type(eventIndex) == int)
+		assert (eventIndex == self.__eventIndex) ##Only the current event is held.
+
+	def get_event_object(self,eventIndex):
+		"""A function to return an event object from a LHEF XML file."""
+		assert False ##No DOM is built when streaming.
+
+	def get_event_trials(self,eventIndex):
+		"""A function to get the number of trials for the current event."""
+		self.check_current_event(eventIndex)
+		return self.__eventAttributes.get("trials","")
+
+	def get_event_muf2(self,eventIndex):
+		"""A function to get the muf2 value for the current event."""
+		self.check_current_event(eventIndex)
+		return self.__eventAttributes.get("muf2","")
+
+	def get_event_mur2(self,eventIndex):
+		"""A function to get the mur2 value for the current event."""
+		self.check_current_event(eventIndex)
+		return self.__eventAttributes.get("mur2","")
+
+	def get_event_row_strings(self,eventIndex):
+		"""A function to return the data of the current event, as a list of each line in it."""
+		self.check_current_event(eventIndex)
+		return list(self.__eventLines)
+
+class LHEFIndexedReader(LHEFReader):
+	"""A class for reading events from LHEF XML files by seeking to them with a sidecar index, without holding the whole file."""
+	##Only the events from firstEvent up to but not including lastEvent are read, and are indexed from 0 as though the whole file.
+	##Several runs can then each take a disjoint range of one file, as from shard_event_range, without each parsing all of it.
+
+	def __init__(self,fileName,firstEvent = 0,lastEvent = None):
+		"""A function to initiate an indexed LHEF XML file reader for a range of the events, or all of them if not given."""
+		assert ((type(firstEvent) == int) and (firstEvent >= 0))
+		assert ((lastEvent == None) or ((type(lastEvent) == int) and (lastEvent >= firstEvent)))
+		self.__eventRange = [firstEvent,lastEvent]
+		LHEFReader.__init__(self,fileName)
+
+	def load(self):
+		"""A function to load, or build, the index of the events of the LHEF XML file and keep that of those in range."""
+		__index = load_event_index(self.get_source_string())
+		if (self.__eventRange[1] == None):
+			self.__eventRange[1] = len(__index)
+		assert (self.__eventRange[1] <= len(__index))
+		self.__index = __index[self.__eventRange[0]:self.__eventRange[1]]
+		self.__objectIndex, self.__object = None, None
+
+	def get_event_range(self):
+		"""A function to return the [first,last) events of the file read."""
+		return list(self.__eventRange)
+
+	def get_number_events(self):
+		"""A function to return the number of events in range."""
+		return len(self.__index)
+
+	def get_event_object(self,eventIndex):
+		"""A function to return an event object from a LHEF XML file, parsing only that event's lines unless it was the last asked for."""
+		assert ((type(eventIndex) == int) and (0 <= eventIndex < len(self.__index)))
+		if (eventIndex != self.__objectIndex):
+			with open(self.get_source_string(), 'rb') as fileToRead:
+				fileToRead.seek(int(self.__index[eventIndex,0]))
+				__eventString = fileToRead.read(int(self.__index[eventIndex,1]))
+			self.__object = xml.dom.minidom.parseString(__eventString).documentElement
+			self.__objectIndex = eventIndex
+		return self.__object
+
+class LHEFColumnReader(LHEFReader):
+	"""A class for reading events from the columns of a LHEF XML file's values, converted once and kept in a sidecar."""
+	##The get_event_* functions of LHEFReader work as for the file, other than those needing its text, e.g. get_event_particle_strings.
+	##get_columns gives the arrays themselves, for analysing all the events at once.
+
+	def load(self):
+		"""A function to load, or build, the columns of the events of the LHEF XML file."""
+		self.__columns = load_event_columns(self.get_source_string())
+		self.__offsets = self.__columns['offsets'].tolist()
+
+	def get_columns(self):
+		"""A function to return a dictionary of the column arrays of the events, as described in build_event_columns."""
+		return self.__columns
+
+	def get_number_events(self):
+		"""A function to return the number of events in a LHEF XML file."""
+		return len(self.__columns['events'])
+
+	def get_event_object(self,eventIndex):
+		"""A function to return an event object from a LHEF XML file."""
+		assert False ##No XML is kept in the columns.
+
+	def get_event_row_strings(self,eventIndex):
+		"""A function to return the data of an event from a LHEF XML file."""
+		assert False ##No text is kept in the columns.
+
+	def get_event_trials(self,eventIndex):
+		"""A function to get the number of trials for an event in a LHEF XML file."""
+		assert (type(eventIndex) == int)
+		return str(self.__columns['eventStrings'][eventIndex,6])
+
+	def get_event_muf2(self,eventIndex):
+		"""A function to get the muf2 value for an event in a LHEF XML file."""
+		assert (type(eventIndex) == int)
+		return str(self.__columns['eventStrings'][eventIndex,7])
+
+	def get_event_mur2(self,eventIndex):
+		"""A function to get the mur2 value for an event in a LHEF XML file."""
+		assert (type(eventIndex) == int)
+		return str(self.__columns['eventStrings'][eventIndex,8])
+
+	def read_event_record(self,eventIndex):
+		"""A function to return the values of an event in a LHEF XML file from the columns."""
+		assert ((type(eventIndex) == int) and (0 <= eventIndex < len(self.__columns['events'])))
+		__topRowValues = self.__columns['eventStrings'][eventIndex,:6].tolist()
+		__particleRows = self.__columns['particles'][self.__offsets[eventIndex]:self.__offsets[eventIndex + 1]].tolist()
+		return LHEFEventRecord.from_values(__topRowValues,[__row[1:] for __row in __particleRows]) ##Without the event index.
+
+class LHEFEventBuffer(object):
+	"""A class for writing to a LHEF XML file through one file handle, holding what is added until there is enough to write at once."""
+	##What is held is written once flushEvents events or flushBytes bytes are waiting, so the file isn't opened for every event.
+
+	def __init__(self,saveName,flushEvents,flushBytes):
+		"""A function to create, or write over, a file and hold what is added to it."""
+		assert (type(saveName) == str)
+		assert ((type(flushEvents) == int) and (flushEvents > 0))
+		assert ((type(flushBytes) == int) and (flushBytes > 0))
+		self.__flushEvents, self.__flushBytes = flushEvents, flushBytes
+		self.__file = open(saveName,'w') ##'w' will create new file but also write over if already existing!
+		self.__waiting, self.__waitingEvents, self.__waitingBytes = [], 0, 0
+
+	def add(self,toSave,isEvent = True):
+		"""A function to add a string to those waiting to be written, writing them all if enough are waiting."""
+		self.__waiting.append(toSave)
+		self.__waitingBytes += len(toSave)
+		if isEvent:
+			self.__waitingEvents += 1
+		if ((self.__waitingEvents >= self.__flushEvents) or (self.__waitingBytes >= self.__flushBytes)):
+			self.flush()
+
+	def flush(self):
+		"""A function to write everything waiting to the file."""
+		if self.__waiting:
+			self.__file.write(''.join(self.__waiting))
+			self.__waiting, self.__waitingEvents, self.__waitingBytes = [], 0, 0
+		self.__file.flush()
+
+	def close(self):
+		"""A function to write everything waiting to the file and close it."""
+		self.flush()
+		self.__file.close()
+
 class LHEFShowerWriter(object):
 	"""A class for writing LHEF XML files for Dipole Showered events."""
 
-	def __init__(self,sourceFileReader,numberEvents):
-		"""A function to initialise a Dipole Shower LHEF XML writer."""
+	def __init__(self,sourceFileReader,numberEvents,flushEvents = constants.LHEF_flush_events(),flushBytes = constants.LHEF_flush_bytes()):
+		"""A function to initialise a Dipole Shower LHEF XML writer, writing events to the file in blocks of flushEvents or flushBytes."""
 		assert check_is_LHEFReader(sourceFileReader)
 		assert (type(numberEvents) == int)
 		self.__numberEvents = numberEvents
+		self.__flushEvents, self.__flushBytes = flushEvents, flushBytes
 		##Strips out and replaces events in source LHEF file, only changing required values.
 		self.__readFrom = sourceFileReader
 		self.__sourceFileString = self.__readFrom.get_source_string()
-		self.__stringFile = self.__readFrom.get_all_as_string()
-		self.__top = self.__stringFile.split('\n<event')[0]
+		self.__top = self.__readFrom.get_top_string() ##Not the whole file, which may be too large to hold.
 		self.__bottom = "\n</LesHouchesEvents>"
 		self.__numberEventsSaved = 0
 		self.__haveEvents = False ##To track if at least one has been added.
@@ -279,7 +709,7 @@ class LHEFShowerWriter(object):
 		__line1 = "\n<event>" # trials='" + str(trials) + "' muf2='" + str(muf2) + "' mur2='" + str(mur2) + "'>"
 		__line2 = ("\n\t\t" + str(__numberParticles) + "\t" + str(processID) + "\t" + str(weight) + "\t" + str(scale))
 		__line2 += ("\t" + str(alphaEM) + "\t" + str(alphaS))
-		__inLines, __outLines = "", ""
+		__lines = [__line1,__line2] ##Joined once at the end rather than added to for each particle.
 		__endLine = "\n</event>"
 		__zO = zero_or
 		__pHS = "{:." + str(constants.LHEF_DS_number_decimal_places()) + "e}"
@@ -297,11 +727,9 @@ class LHEFShowerWriter(object):
 			__newLine += ("\t\t" + __pHS.format(__zO(fFV[1])) + "\t" + __pHS.format(__zO(fFV[2])) + "\t")
 			__newLine += (__pHS.format(__zO(fFV[3])) + "\t" + __pHS.format(__zO(fFV[0])) + "\t")
 			__newLine += (__pHS.format(__zO(p.get_mass())) + "\t" + str(__zO(p.get_width())) + "\t\t" + str(p.get_spin()))
-			__inLines += __newLine
-		__toSave = __line1 + __line2 + __inLines + __outLines + __endLine
-		__file = open(self.__saveName,'a') ##'a' means append to.
-		__file.write(__toSave)
-		__file.close()
+			__lines.append(__newLine)
+		__lines.append(__endLine)
+		self.__buffer.add(''.join(__lines))
 		self.__numberEventsSaved += 1
 
 	def create(self):
@@ -318,6 +746,8 @@ class LHEFShowerWriter(object):
 			__saveName = 'DS' + datetime.datetime.now().strftime("at%H.%M.%S") + "_" + __split3[2]
 		if not (__saveName[-4:] == '.lhe'):
 			__saveName = __saveName + '.lhe'
+		if check_is_LHEFIndexedReader(self.__readFrom): ##Keep the files of runs on different ranges of events apart.
+			__saveName = __saveName[:-4] + "_events" + "-".join([str(x) for x in self.__readFrom.get_event_range()]) + '.lhe'
 		__saveName = "ME_DSs\\" + __date + "\\" + __saveName
 		__toSave = self.__top
 		##Make the directory for the date if it doesn't exist.
@@ -327,20 +757,24 @@ class LHEFShowerWriter(object):
 			except OSError as exc: ##Guard against race condition.
 				if exc.errno != errno.EEXIST:
 					raise
-		__file = open(__saveName,'w') ##'w' will create new file but also write over if already existing!
-		__file.write(__toSave)
-		__file.close()
+		self.__buffer = LHEFEventBuffer(__saveName,self.__flushEvents,self.__flushBytes) ##Kept open until saved.
+		self.__buffer.add(__toSave,False)
+		self.__buffer.flush()
 		self.__saveName = __saveName ##So it can be used elsewhere to access the file.
 
+	def flush(self):
+		"""A function to write any events waiting to the LHEF XML file."""
+		if self.__topWritten:
+			self.__buffer.flush()
+
 	def save(self):
 		"""A function to finalise the produced LHEF XML file."""
 		assert self.__haveEvents
 		if not (self.__numberEvents == self.__numberEventsSaved):
 			print "\nWARNING: Missing" + str( self.__numberEvents - self.__numberEventsSaved) + "events.\n"
 		__toSave = self.__bottom
-		__file = open(self.__saveName,'a') ##'a' means append to.
-		__file.write(__toSave)
-		__file.close()
+		self.__buffer.add(__toSave,False)
+		self.__buffer.close()
 		__totalNumProd = sum(self.__numProdLogger.output())
 		__averageNumProd = __totalNumProd / self.__numberEvents
 		print "\nThe average number of partons produced was:", __averageNumProd
@@ -353,8 +787,8 @@ class LHEFShowerWriter(object):
 class LHEFMEWriter(object):
 	"""A class for writing LHEF XML files for ME events."""
 
-	def __init__(self,processName,numberEvents,S123,qCodes):
-		"""A function to initialise a ME LHEF XML writer."""
+	def __init__(self,processName,numberEvents,S123,qCodes,flushEvents = constants.LHEF_flush_events(),flushBytes = constants.LHEF_flush_bytes()):
+		"""A function to initialise a ME LHEF XML writer, writing events to the file in blocks of flushEvents or flushBytes."""
 		knownQuarkCodes = particleData.knownParticles.get_known_quarks()
 		assert (type(processName) == str)
 		assert (type(numberEvents) == int)
@@ -363,6 +797,7 @@ class LHEFMEWriter(object):
 		for qCode in qCodes:
 			assert ((type(qCode) == int) and (qCode in knownQuarkCodes))
 		self.__numberEvents, self.__S123, self.__qCodes = numberEvents, S123, qCodes
+		self.__flushEvents, self.__flushBytes = flushEvents, flushBytes
 		##Strips out and replaces events in source LHEF file, only changing required values.
 		self.__processName = processName
 		__templateLoc = "Templates/LHEF_ME_Template.lhe"
@@ -408,7 +843,7 @@ class LHEFMEWriter(object):
 		__line1 = "\n<event>" #trials='" + str(trials) + "' muf2='" + str(muf2) + "' mur2='" + str(mur2) + "'>"
 		__line2 = ("\n\t\t" + str(__numberParticles) + "\t" + str(processID) + "\t" + str(weight) + "\t" + str(scale))
 		__line2 += ("\t" + str(alphaEM) + "\t" + str(alphaS))
-		__inLines, __outLines = "", ""
+		__lines = [__line1,__line2] ##Joined once at the end rather than added to for each particle.
 		__endLine = "\n</event>"
 		__zO = zero_or
 		__pHS = "{:." + str(constants.LHEF_ME_number_decimal_places()) + "e}"
@@ -422,11 +857,9 @@ class LHEFMEWriter(object):
 			__newLine += ("\t\t" + __pHS.format(__zO(fFV[1])) + "\t" + __pHS.format(__zO(fFV[2])) + "\t")
 			__newLine += (__pHS.format(__zO(fFV[3])) + "\t" + __pHS.format(__zO(fFV[0])) + "\t")
 			__newLine += (__pHS.format(__zO(p.get_mass())) + "\t" + str(__zO(p.get_width())) + "\t\t" + str(p.get_spin()))
-			__inLines += __newLine
-		__toSave = __line1 + __line2 + __inLines + __outLines + __endLine
-		__file = open(self.__saveName,'a') ##'a' means append to.
-		__file.write(__toSave)
-		__file.close()
+			__lines.append(__newLine)
+		__lines.append(__endLine)
+		self.__buffer.add(''.join(__lines))
 		self.__numberEventsSaved += 1
 
 	def create(self):
@@ -444,20 +877,24 @@ class LHEFMEWriter(object):
 			except OSError as exc: ##Guard against race condition.
 				if exc.errno != errno.EEXIST:
 					raise
-		__file = open(__saveName,'w') ##'w' will create new file but also write over if already existing!
-		__file.write(__toSave)
-		__file.close()
+		self.__buffer = LHEFEventBuffer(__saveName,self.__flushEvents,self.__flushBytes) ##Kept open until saved.
+		self.__buffer.add(__toSave,False)
+		self.__buffer.flush()
 		self.__saveName = __saveName ##So it can be used elsewhere to access the file.
 
+	def flush(self):
+		"""A function to write any events waiting to the LHEF XML file."""
+		if self.__topWritten:
+			self.__buffer.flush()
+
 	def save(self):
 		"""A function to finalise the produced LHEF XML file."""
 		assert self.__haveEvents
 		if not (self.__numberEvents == self.__numberEventsSaved):
 			print "\nWARNING: Missing" + str(self.__numberEvents - self.__numberEventsSaved) + "events.\n"
 		__toSave = self.__bottom
-		__file = open(self.__saveName,'a') ##'a' means append to.
-		__file.write(__toSave)
-		__file.close()
+		self.__buffer.add(__toSave,False)
+		self.__buffer.close()
 		print "\n////////////////////////////////////////////////////////////////////"
 		print "Saved as:", self.__saveName
 		print "////////////////////////////////////////////////////////////////////\n"
@@ -16,6 +16,7 @@ import fourVectors
 import particles
 import kinematics
 import sudakovs
+import sudakovArrays
 import dipoles
 import quarkPairs
 
@@ -36,8 +37,9 @@ def check_is_chain(toCheck):
 
 class chain(object):
 	"""A class to handle a chain."""
-	##Dipoles are accessed by list index. The same particle can be in two neighbouring dipoles.
-	##e.g. [[a,b],[b,c],[c,d],[d,e]], where for a closed chain e == a.
+	##Dipoles are linked to their neighbours, from firstDipole to lastDipole. The same particle can be in two neighbouring dipoles.
+	##e.g. [a,b]<->[b,c]<->[c,d]<->[d,e], where for a closed chain e == a and [d,e] is also linked to [a,b].
+	##Dipoles can still be accessed by chain index but this walks the links so is only for convenience.
 
 	def __init__(self,orderedListOfParticles,isLoop = False,maxPperpSquaredFromSplit = None):
 		"""A function to initialise a chain using the ordered list of particles given."""
@@ -46,24 +48,33 @@ class chain(object):
 			assert particles.check_is_particle(particle)
 		assert (isLoop or not(isLoop))
 		assert ((maxPperpSquaredFromSplit == None) or (assertions.all_are_numbers([maxPperpSquaredFromSplit])))
-		self.__chainList = []
+		assert ((len(orderedListOfParticles) > 1) or (maxPperpSquaredFromSplit != None))
+		__chainList = []
 		for i in range(len(orderedListOfParticles) - 1): ##Iterate through all particle pairs.
-			self.__chainList.append(dipoles.dipole(orderedListOfParticles[i],orderedListOfParticles[i+1]))
+			__chainList.append(dipoles.dipole(orderedListOfParticles[i],orderedListOfParticles[i+1]))
 		self.__isLoop = isLoop
+		self.__firstDipole, self.__lastDipole = None, None ##An empty chain can be given its dipoles by set_end_dipoles.
+		if (len(__chainList) > 0):
+			for i in range(len(__chainList) - 1):
+				dipoles.link_dipoles(__chainList[i],__chainList[i+1])
+			if self.__isLoop:
+				dipoles.link_dipoles(__chainList[-1],__chainList[0])
+			self.__firstDipole, self.__lastDipole = __chainList[0], __chainList[-1]
 		if (maxPperpSquaredFromSplit == None):
-			if (len(self.__chainList) == 1):
-				self.__maxPperpSquared = self.__chainList[0].get_mass_squared()
+			if (len(__chainList) == 1):
+				self.__maxPperpSquared = __chainList[0].get_mass_squared()
 			else:
 				print "\n! ! ! ! ! ! ! ! ! ! ! ! ! ! ! ! ! !"
 				print "Not sure what to do here yet!"
 				#assert False
-				self.__maxPperpSquared = self.__chainList[0].get_mass_squared()
+				self.__maxPperpSquared = __chainList[0].get_mass_squared()
 				assertions.pause_loading_module()
 				##Or do you find that of the entire chain. Or do you find that of each -> Need list?
 		else:
 			self.__maxPperpSquared = maxPperpSquaredFromSplit
 		self.__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
 		self.__nextPperpSquared = None ##Initiation value.
+		self.__proceed = False ##Set by find_next_event.
 		self.__showeringCompleted = False
 
 	def set_showering_completed(self):
@@ -78,10 +89,44 @@ class chain(object):
 		"""A function to check whether the chain is a closed loop or not."""
 		return self.__isLoop
 
+	def __iter__(self):
+		"""A function to iterate through the dipoles in the chain from first to last."""
+		__dipole = self.__firstDipole
+		while (__dipole is not None):
+			yield __dipole
+			if (__dipole is self.__lastDipole): ##Also stops a closed chain going round again.
+				break
+			__dipole = __dipole.get_next_dipole()
+
+	def __len__(self):
+		"""A function to return the number of dipoles in the chain."""
+		__chainLength = 0
+		for __dipole in self:
+			__chainLength += 1
+		return __chainLength
+
+	def get_first_dipole(self):
+		"""A function to return the first dipole in the chain."""
+		return self.__firstDipole
+
+	def get_last_dipole(self):
+		"""A function to return the last dipole in the chain."""
+		return self.__lastDipole
+
+	def set_end_dipoles(self,firstDipole,lastDipole):
+		"""A function to set the first and last dipoles of an already linked run of dipoles as the chain."""
+		assert (dipoles.check_is_dipole(firstDipole) and dipoles.check_is_dipole(lastDipole))
+		self.__firstDipole, self.__lastDipole = firstDipole, lastDipole
+		if self.__isLoop:
+			dipoles.link_dipoles(self.__lastDipole,self.__firstDipole)
+		else:
+			dipoles.link_dipoles(None,self.__firstDipole)
+			dipoles.link_dipoles(self.__lastDipole,None)
+
 	def get_chain_index(self,indexIn):
 		"""A function to check a chain index, taking into account if the chain is a loop."""
 		assert (type(indexIn) == int)
-		__chainLength = len(self.__chainList)
+		__chainLength = len(self)
 		__chainIndex = indexIn%__chainLength
 		##__chainLength runs from 1 not 0 hence < not <= below.
 		assert ((__chainIndex < __chainLength) and (__chainIndex >= 0))
@@ -92,11 +137,13 @@ class chain(object):
 		 ##Don't need a __setitem__ as only set when making chain. Other changes are made to the list.
 		assert (type(indexIn) == int)
 		__listIndexOfDipole = self.get_chain_index(indexIn)
-		return self.__chainList[__listIndexOfDipole]
+		for __index, __dipole in enumerate(self):
+			if (__index == __listIndexOfDipole):
+				return __dipole
 
 	def get_chain_list(self):
 		"""A function to return the chain list of dipoles."""
-		return self.__chainList
+		return [__dipole for __dipole in self]
 
 	def get_next_Pperp_squared(self):
 		"""A function to return the next value of PperpSquared currently being used by a chain."""
@@ -109,7 +156,7 @@ class chain(object):
 	def __str__(self):
 		"""A function to return a string of a chain object."""
 		__stringOfChain = "\n[chain-"
-		for dipole in self.__chainList:
+		for dipole in self:
 			__stringOfChain += (str(dipole) + " |\n")
 		__stringOfChain += ("   Loop: " + str(self.__isLoop) + ", Cut-off: " + str(self.__cutOff) + "\n-]")
 		return __stringOfChain
@@ -118,7 +165,7 @@ class chain(object):
 		"""A function to return a simplified string of a chain object."""
 		##Uses arrows at beginning and end to indicate a closed/looped chain.
 		__simpleStringOfChain = "["
-		for dipole in self.__chainList:
+		for dipole in self:
 			__simpleStringOfChain += dipole.simple_str()
 		__simpleStringOfChain += "]"
 		if self.__isLoop:
@@ -129,23 +176,42 @@ class chain(object):
 	def __repr__(self):
 		"""A function to return a string of a chain object."""
 		__reprOfChain = "\n<chain(["
-		for dipole in self.__chainList:
+		for dipole in self:
 			__reprOfChain += (repr(dipole) + " |\n")
 		__reprOfChain += ("   Loop: " + str(self.__isLoop) + ", Cut-off: " + str(self.__cutOff) + "])>")
 		return __reprOfChain
 
 	def run_sudakovs(self):
-		"""A function to run the sudakov module for each dipole in the chain."""
+		"""A function to run the sudakov module for each dipole in the chain that doesn't have a valid stored trial."""
 		##If self.__maxPperpSquared > self.__cutOff, still run as process_sudakovs will catch.
-		##sudakovList contains lists of Pperp^2, y and processCode for each dipole.
+		##sudakovList contains lists of Pperp^2, y and processCode for each dipole, in the order of sudakovDipoles.
+		##Only dipoles changed by the last event are re-solved. The others keep their trials as the veto..
+		##..algorithm is memoryless and their trials are still below the new, lower maximum.
+		##Enough dipoles needing trials at once are solved together by sudakovArrays.
 		self.__sudakovLists = [[],[],[]]
-		for dipole in self.__chainList:
-			__S123 = dipole.get_mass_squared()
-			__code1, __code2 = dipole[0].get_code(), dipole[1].get_code()
-			__PperpSquared,__y,__processCode = sudakovs.solve(self.__maxPperpSquared,__S123,__code1,__code2)
+		self.__sudakovDipoles = []
+		__toSolve = [dipole for dipole in self if (not dipole.has_sudakov_trial())]
+		if (len(__toSolve) >= constants.batch_sudakov_minimum_dipoles()):
+			__S123s = [dipole.get_mass_squared() for dipole in __toSolve]
+			__code1s, __code2s = [dipole[0].get_code() for dipole in __toSolve], [dipole[1].get_code() for dipole in __toSolve]
+			__PperpSquareds,__ys,__processCodes,__numTrials = sudakovArrays.solve_array([self.__maxPperpSquared]*len(__toSolve),__S123s,__code1s,__code2s)
+			for dipole, __PperpSquared, __y, __processCode in zip(__toSolve,__PperpSquareds,__ys,__processCodes):
+				if (__processCode == 0):
+					dipole.set_sudakov_trial(None,None,0)
+				else:
+					dipole.set_sudakov_trial(float(__PperpSquared),float(__y),int(__processCode))
+		else:
+			for dipole in __toSolve:
+				__S123 = dipole.get_mass_squared()
+				__code1, __code2 = dipole[0].get_code(), dipole[1].get_code()
+				__PperpSquared,__y,__processCode = sudakovs.solve(self.__maxPperpSquared,__S123,__code1,__code2)
+				dipole.set_sudakov_trial(__PperpSquared,__y,__processCode)
+		for dipole in self:
+			__PperpSquared,__y,__processCode = dipole.get_sudakov_trial()
 			self.__sudakovLists[0].append(__PperpSquared)
 			self.__sudakovLists[1].append(__y)
 			self.__sudakovLists[2].append(__processCode)
+			self.__sudakovDipoles.append(dipole)
 	
 	def process_sudakovs(self):
 		"""A function to process the list of sudakov results."""
@@ -161,66 +227,81 @@ class chain(object):
 			else: ##Randomly choose if more than one had the same maxPperp^2.
 				__randIndex = int(round(random.random()*len(__indices)-1)) ##-1 for index from length.
 				self.__nextIndex = __indices[__randIndex] 
+			self.__nextDipole = self.__sudakovDipoles[self.__nextIndex]
 			self.__nextY = self.__sudakovLists[1][self.__nextIndex]
 			self.__nextProcessCode = self.__sudakovLists[2][self.__nextIndex]
 			self.__maxPperpSquared = self.__nextPperpSquared ##Set the new maximum to that currently occuring.
 			return True
 	
 	def prepare_dipoles(self):
-		"""A function to prepare the two relevant dipoles for updating."""
+		"""A function to prepare the relevant dipoles for updating."""
 		assert (self.__maxPperpSquared > self.__cutOff)
-		self.__chainList[self.__nextIndex].set_not_updated()
-		if (self.__isLoop or (self.__nextIndex > 0)):
-			self.__chainList[self.get_chain_index(self.__nextIndex - 1)].set_not_updated()
-		elif (self.__isLoop or (self.__nextIndex < (len(self.__chainList) - 1))): ##-1 for index from length.
-			self.__chainList[self.get_chain_index(self.__nextIndex + 1)].set_not_updated()
-		self.__dipoleRecoilIndex = self.__chainList[self.__nextIndex].get_index_to_recoil(self.__nextProcessCode)
-		if (self.__dipoleRecoilIndex == 0): ## LHS recoils.
-			if self.__isLoop:
-				self.__toRecoil = [self.get_chain_index(self.__nextIndex - 1),1] ##Store [dipole index, particle index].
-				self.__chainList[self.get_chain_index(self.__nextIndex - 1)].set_not_updated()
-			elif (self.__nextIndex == 0):
-				self.__toRecoil = [None,None] ##Store [dipole index, particle index].
-			else:
-				self.__toRecoil = [self.__nextIndex - 1,1] ##Store [dipole index, particle index].
-				self.__chainList[self.__nextIndex - 1].set_not_updated()
-		else: ##RHS recoils.
-			if self.__isLoop:
-				self.__toRecoil = [self.get_chain_index(self.__nextIndex + 1),0]
-				self.__chainList[self.get_chain_index(self.__nextIndex + 1)].set_not_updated()
-			elif self.__nextIndex == (len(self.__chainList) - 1): ##-1 to get index from length.
-				self.__toRecoil = [None,None]
-			else:
-				self.__toRecoil = [self.__nextIndex + 1,0]
-				self.__chainList[self.__nextIndex + 1].set_not_updated()
+		##Neighbours are None at the ends of an open chain.
+		self.__nextDipole.set_not_updated()
+		for __neighbour in [self.__nextDipole.get_previous_dipole(),self.__nextDipole.get_next_dipole()]:
+			if (__neighbour is not None):
+				__neighbour.set_not_updated()
+		self.__dipoleRecoilIndex = self.__nextDipole.get_index_to_recoil(self.__nextProcessCode)
 	
 	def run_kinematics(self):
 		"""A function to run the kinematics module for a given chain event."""
 		assert (self.__maxPperpSquared > self.__cutOff)
 		self.__dipoleProduceIndex = (self.__dipoleRecoilIndex + 1)%2
-		__v1 = self.__chainList[self.__nextIndex][self.__dipoleProduceIndex].get_four_momentum()
-		__v3 = self.__chainList[self.__nextIndex][self.__dipoleRecoilIndex].get_four_momentum()
-		__nV1, __nV2, __nV3 = kinematics.produce_new_vectors(__v1,__v3,self.__nextPperpSquared,self.__nextY)
+		__v1 = self.__nextDipole[self.__dipoleProduceIndex].get_four_momentum()
+		__v3 = self.__nextDipole[self.__dipoleRecoilIndex].get_four_momentum()
+		__frame = self.__nextDipole.get_dipole_frame(self.__dipoleRecoilIndex)
+		__nV1, __nV2, __nV3 = kinematics.produce_new_vectors(__v1,__v3,self.__nextPperpSquared,self.__nextY,__frame)
 		return __nV1, __nV2, __nV3
 
+	def splice_dipoles(self,oldDipole,newDipoles):
+		"""A function to replace a dipole in the chain with the list of new dipoles given, in order."""
+		assert dipoles.check_is_dipole(oldDipole)
+		for __newDipole in newDipoles:
+			assert dipoles.check_is_dipole(__newDipole)
+		__previousDipole, __nextDipole = oldDipole.get_previous_dipole(), oldDipole.get_next_dipole()
+		if (__previousDipole is oldDipole): ##Closed chain of one dipole.
+			__previousDipole, __nextDipole = newDipoles[-1], newDipoles[0]
+		for i in range(len(newDipoles) - 1):
+			dipoles.link_dipoles(newDipoles[i],newDipoles[i+1])
+		dipoles.link_dipoles(__previousDipole,newDipoles[0])
+		dipoles.link_dipoles(newDipoles[-1],__nextDipole)
+		if (oldDipole is self.__firstDipole):
+			self.__firstDipole = newDipoles[0]
+		if (oldDipole is self.__lastDipole):
+			self.__lastDipole = newDipoles[-1]
+		oldDipole.set_previous_dipole(None)
+		oldDipole.set_next_dipole(None)
+
 	def update_dipole_values(self,nPLHS,nDPLHS,nDPRHS,nPRHS):
 		"""A function to update the values in the surrounding dipoles and insert the new one."""
 		assert particles.check_is_particle(nPLHS)
 		assert dipoles.check_is_dipole(nDPLHS)
 		assert dipoles.check_is_dipole(nDPRHS)
 		assert particles.check_is_particle(nPRHS)
-		if ((not self.__isLoop) and (self.__nextIndex == 0)): ##No particle of dipole to left to update.
-			pass
-		else:
-			__uLHIndex = self.get_chain_index(self.__nextIndex - 1)
-			self.__chainList[__uLHIndex][1] = nPLHS.copy()
-		if ((not self.__isLoop) and (self.__nextIndex == (len(self.__chainList) - 1))): ##-1 for list index from length.
-			pass ##No particle of dipole to right to update.
-		else:
-			__uRHIndex = self.get_chain_index(self.__nextIndex + 1)
-			self.__chainList[__uRHIndex][0] = nPRHS.copy()
-		self.__chainList[self.__nextIndex] = nDPRHS.copy()
-		self.__chainList.insert(self.__nextIndex,nDPLHS.copy())
+		__uLHDipole, __uRHDipole = self.__nextDipole.get_previous_dipole(), self.__nextDipole.get_next_dipole()
+		if (__uLHDipole is not None): ##No particle of dipole to left to update if None.
+			__uLHDipole[1] = nPLHS
+		if (__uRHDipole is not None): ##No particle of dipole to right to update if None.
+			__uRHDipole[0] = nPRHS
+		self.__newDipoles = [nDPLHS,nDPRHS]
+		self.splice_dipoles(self.__nextDipole,self.__newDipoles)
+
+	def split(self,middleDipole,maxPperpSquared):
+		"""A function to split the chain either side of the given dipole, keeping the LHS and returning the RHS as a new chain."""
+		##The middle dipole is dropped and no particles are copied.
+		assert dipoles.check_is_dipole(middleDipole)
+		assert assertions.all_are_numbers([maxPperpSquared])
+		#Splitting of loops not yet treated here:
+		assert (not self.__isLoop)
+		__lastLHSDipole, __firstRHSDipole = middleDipole.get_previous_dipole(), middleDipole.get_next_dipole()
+		assert ((__lastLHSDipole is not None) and (__firstRHSDipole is not None))
+		__newChain = chain([],False,maxPperpSquared)
+		__newChain.set_end_dipoles(__firstRHSDipole,self.__lastDipole)
+		self.set_end_dipoles(self.__firstDipole,__lastLHSDipole)
+		middleDipole.set_previous_dipole(None)
+		middleDipole.set_next_dipole(None)
+		self.__maxPperpSquared = maxPperpSquared
+		return __newChain
 
 	##~~Gluon Emission~~##
 
@@ -230,39 +311,39 @@ class chain(object):
 		for p in [p1,p2,p3]:
 			assert particles.check_is_particle(p)
 			assert p.__nonzero__()
-		__kQs = particleData.knownParticles.get_known_quarks()
-		__gC = particleData.knownParticles.get_code_from_name('gluon')
-		if ((p1.get_code() in __kQs) and ((-p3.get_code()) in __kQs)): ##qqBar.
+		__p1IsQ, __p1IsQBar = (p1.is_quark() and (not p1.is_anti_particle())), (p1.is_quark() and p1.is_anti_particle())
+		__p3IsQ, __p3IsQBar = (p3.is_quark() and (not p3.is_anti_particle())), (p3.is_quark() and p3.is_anti_particle())
+		if (__p1IsQ and __p3IsQBar): ##qqBar.
 			__nC = cC.next()
 			p2.set_colour(0,__nC)
 			p2.set_colour(1,p1.get_colour(0))
 			p3.set_colour(1,__nC)
-		elif (((-p1.get_code()) in __kQs) and (p3.get_code() in __kQs)): ##qBarq.
+		elif (__p1IsQBar and __p3IsQ): ##qBarq.
 			__nC = cC.next()
 			p1.set_colour(1,__nC)
 			p2.set_colour(0,__nC)
 			p2.set_colour(1,p3.get_colour(0))
-		elif ((p1.get_code() in __kQs) and (p3.get_code() == __gC)): ##qg.
+		elif (__p1IsQ and p3.is_gluon()): ##qg.
 			__nC = cC.next()
 			p2.set_colour(0,__nC)
 			p2.set_colour(1,p1.get_colour(0))
 			p3.set_colour(1,__nC)
-		elif (((-p1.get_code()) in __kQs) and (p3.get_code() == __gC)): ##qBarg.
+		elif (__p1IsQBar and p3.is_gluon()): ##qBarg.
 			__nC = cC.next()
 			p2.set_colour(0,p1.get_colour(1))
 			p2.set_colour(1,__nC)
 			p3.set_colour(0,__nC)
-		elif ((p1.get_code() == __gC) and (p3.get_code() in __kQs)): ##gq.
+		elif (p1.is_gluon() and __p3IsQ): ##gq.
 			__nC = cC.next()
 			p1.set_colour(1,__nC)
 			p2.set_colour(0,__nC)
 			p2.set_colour(1,p3.get_colour(0))
-		elif ((p1.get_code() == __gC) and ((-p3.get_code()) in __kQs)): ##gqBar.
+		elif (p1.is_gluon() and __p3IsQBar): ##gqBar.
 			__nC = cC.next()
 			p1.set_colour(0,__nC)
 			p2.set_colour(0,p3.get_colour(1))
 			p2.set_colour(1,__nC)
-		elif ((p1.get_code() == __gC) and (p3.get_code() == __gC)): ##gg.
+		elif (p1.is_gluon() and p3.is_gluon()): ##gg.
 			##Two possibilities so randomly choose which keeps colour code.
 			__R = random.random()
 			if (self.__dipoleRecoilIndex == 0): ##qBar at p3 end, i.e LHS.
@@ -295,9 +376,9 @@ class chain(object):
 		for nV in [nV1,nV2,nV3]:
 			assert fourVectors.check_is_fourVector(nV)
 		assert (self.__maxPperpSquared > self.__cutOff)
-		__p1 = self.__chainList[self.__nextIndex][1].copy()
+		__p1 = self.__nextDipole[1].copy()
 		__p2 = particles.particle('gluon',nV2,[0,0],[0,0],[0,0],1)
-		__p3 = self.__chainList[self.__nextIndex][0].copy()
+		__p3 = self.__nextDipole[0].copy()
 		__p1.set_four_momentum(nV1)
 		__p3.set_four_momentum(nV3)
 		__p2.set_unique_ID(pC.next()) ##Set unique particle ID when produced.
@@ -309,11 +390,9 @@ class chain(object):
 		if __p3.get_child(1) != 0: ##i.e don't overwrite
 			__p3.set_child(1,__p2.get_unique_ID())
 		__p1, __p2, __p3 = self.set_new_colours_g_prod(cC,__p1,__p2,__p3)
-		__nDPLHS = self.__chainList[self.__nextIndex].copy()
-		__nDPRHS = self.__chainList[self.__nextIndex].copy()
-		__nDPLHS[0], __nDPLHS[1] = __p3.copy(), __p2.copy()
-		__nDPRHS[0], __nDPRHS[1] = __p2.copy(), __p1.copy()
-		self.update_dipole_values(__p3.copy(),__nDPLHS,__nDPRHS,__p1.copy())
+		__nDPLHS = dipoles.dipole(__p3,__p2)
+		__nDPRHS = dipoles.dipole(__p2,__p1)
+		self.update_dipole_values(__p3,__nDPLHS,__nDPRHS,__p1)
 
 	def update_dipoles_g_prod_RHS_recoil(self,pC,cC,nV1,nV2,nV3):
 		"""A function to update the relevant dipoles when a gluon is produced with the RHS recoiling."""
@@ -321,9 +400,9 @@ class chain(object):
 		for nV in [nV1,nV2,nV3]:
 			assert fourVectors.check_is_fourVector(nV)
 		assert (self.__maxPperpSquared > self.__cutOff)
-		__p1 = self.__chainList[self.__nextIndex][0].copy()
+		__p1 = self.__nextDipole[0].copy()
 		__p2 = particles.particle('gluon',nV2,[0,0],[0,0],[0,0],1)
-		__p3 = self.__chainList[self.__nextIndex][1].copy()
+		__p3 = self.__nextDipole[1].copy()
 		__p1.set_four_momentum(nV1)
 		__p3.set_four_momentum(nV3)
 		__p2.set_unique_ID(pC.next()) ##Set unique particle ID when produced.
@@ -335,11 +414,9 @@ class chain(object):
 		if __p3.get_child(0) != 0: ##i.e don't overwrite
 			__p3.set_child(0,__p2.get_unique_ID())
 		__p1, __p2, __p3 = self.set_new_colours_g_prod(cC,__p1,__p2,__p3)
-		__nDPLHS = self.__chainList[self.__nextIndex].copy()
-		__nDPRHS = self.__chainList[self.__nextIndex].copy()
-		__nDPLHS[0], __nDPLHS[1] = __p1.copy(), __p2.copy()
-		__nDPRHS[0], __nDPRHS[1] = __p2.copy(), __p3.copy()
-		self.update_dipole_values(__p1.copy(),__nDPLHS,__nDPRHS,__p3.copy())
+		__nDPLHS = dipoles.dipole(__p1,__p2)
+		__nDPRHS = dipoles.dipole(__p2,__p3)
+		self.update_dipole_values(__p1,__nDPLHS,__nDPRHS,__p3)
 
 	def update_dipoles_g_prod(self,pC,cC,nV1,nV2,nV3):
 		"""A function to update the relevant dipoles when a gluon is produced."""
@@ -362,17 +439,15 @@ class chain(object):
 			assert p.__nonzero__()
 		assert ((type(p1C0B) == int) and (type(p1C1B) == int))
 		assert ((hS == "LHS") or (hS == "RHS"))
-		__kQs = particleData.knownParticles.get_known_quarks()
-		__gC = particleData.knownParticles.get_code_from_name('gluon')
 		if (hS == "LHS"):
-			if (p1.get_code() > 0): ##Q
+			if (not p1.is_anti_particle()): ##Q
 				p1.set_colour(0,p1C0B)
 				p2.set_colour(1,p1C1B)
 			else: ##QBar
 				p1.set_colour(0,p1C0B)
 				p2.set_colour(1,p1C1B)
 		elif (hS == "RHS"):
-			if (p1.get_code() > 0): ##Q
+			if (not p1.is_anti_particle()): ##Q
 				p1.set_colour(1,p1C0B)
 				p2.set_colour(0,p1C1B)
 			else: ##QBar
@@ -386,14 +461,14 @@ class chain(object):
 		for nV in [nV1,nV2,nV3]:
 			assert fourVectors.check_is_fourVector(nV)
 		assert (self.__maxPperpSquared > self.__cutOff)
-		__p1B = self.__chainList[self.__nextIndex][1].copy()
+		__p1B = self.__nextDipole[1] ##Only read from so not copied.
 		__p1BMs, __p1BCs = [__p1B.get_mother(0),__p1B.get_mother(1)], [__p1B.get_child(0),__p1B.get_child(1)]
 		__qCode = quarkPairs.get_quark_code(self.__maxPperpSquared,self.__activeQCodes) ##As maxPperpSquared now set to S123 of splitting.
 		producedQuarkCodes.store(__qCode)
 		__p1C0B, __p1C1B = __p1B.get_colour(0), __p1B.get_colour(1)
 		__p1 = particles.particle(__qCode,__p1B.get_four_momentum(),__p1BMs,__p1BCs,[0,0],__p1B.get_status_code())
 		__p2 = particles.particle(-__qCode,nV2,[0,0],[0,0],[0,0],1)
-		__p3 = self.__chainList[self.__nextIndex][0].copy()
+		__p3 = self.__nextDipole[0].copy()
 		__p1.set_four_momentum(nV1)
 		__p3.set_four_momentum(nV3)
 		__p1.set_unique_ID(pC.next()) ##Set unique particle IDs when produced.
@@ -405,11 +480,9 @@ class chain(object):
 		if __p3.get_child(1) != 0: ##i.e don't overwrite
 			__p3.set_child(1,__p2.get_unique_ID())
 		__p1, __p2, __p3 = self.set_new_colours_g_split(cC,__p1,__p2,__p3, __p1C0B, __p1C1B,"LHS")
-		__nDPLHS = self.__chainList[self.__nextIndex].copy()
-		__nDPRHS = self.__chainList[self.__nextIndex].copy()
-		__nDPLHS[0], __nDPLHS[1] = __p3.copy(), __p2.copy()
-		__nDPRHS[0], __nDPRHS[1] = __p2.copy(), __p1.copy()
-		self.update_dipole_values(__p3.copy(),__nDPLHS,__nDPRHS,__p1.copy())
+		__nDPLHS = dipoles.dipole(__p3,__p2)
+		__nDPRHS = dipoles.dipole(__p2,__p1)
+		self.update_dipole_values(__p3,__nDPLHS,__nDPRHS,__p1)
 		self.__sideOfSplit = "LHS"
 
 	def update_dipoles_g_split_RHS_recoil(self,pC,cC,nV1,nV2,nV3):
@@ -418,14 +491,14 @@ class chain(object):
 		for nV in [nV1,nV2,nV3]:
 			assert fourVectors.check_is_fourVector(nV)
 		assert (self.__maxPperpSquared > self.__cutOff)
-		__p1B = self.__chainList[self.__nextIndex][0].copy()
+		__p1B = self.__nextDipole[0] ##Only read from so not copied.
 		__p1BMs, __p1BCs = [__p1B.get_mother(0),__p1B.get_mother(1)], [__p1B.get_child(0),__p1B.get_child(1)]
 		__qCode = quarkPairs.get_quark_code(self.__maxPperpSquared,self.__activeQCodes) ##As maxPperpSquared now set to S123 of splitting.
 		producedQuarkCodes.store(__qCode)
 		__p1C0B, __p1C1B = __p1B.get_colour(0), __p1B.get_colour(1)
 		__p1 = particles.particle(-__qCode,__p1B.get_four_momentum(),__p1BMs,__p1BCs,[0,0],__p1B.get_status_code())
 		__p2 = particles.particle(__qCode,nV2,[0,0],[0,0],[0,0],1)
-		__p3 = self.__chainList[self.__nextIndex][1].copy()
+		__p3 = self.__nextDipole[1].copy()
 		__p1.set_four_momentum(nV1)
 		__p3.set_four_momentum(nV3)
 		__p1.set_unique_ID(pC.next()) ##Set unique particle IDs when produced.
@@ -437,11 +510,9 @@ class chain(object):
 		if __p3.get_child(0) != 0: ##i.e don't overwrite.
 			__p3.set_child(0,__p2.get_unique_ID())
 		__p1, __p2, __p3 = self.set_new_colours_g_split(cC,__p1,__p2,__p3, __p1C0B, __p1C1B,"RHS")
-		__nDPLHS = self.__chainList[self.__nextIndex].copy()
-		__nDPRHS = self.__chainList[self.__nextIndex].copy()
-		__nDPLHS[0], __nDPLHS[1] = __p1.copy(), __p2.copy()
-		__nDPRHS[0], __nDPRHS[1] = __p2.copy(), __p3.copy()
-		self.update_dipole_values(__p1.copy(),__nDPLHS,__nDPRHS,__p3.copy())
+		__nDPLHS = dipoles.dipole(__p1,__p2)
+		__nDPRHS = dipoles.dipole(__p2,__p3)
+		self.update_dipole_values(__p1,__nDPLHS,__nDPRHS,__p3)
 		self.__sideOfSplit = "RHS"
 
 	def update_dipoles_g_split(self,pC,cC,nV1,nV2,nV3):
@@ -462,17 +533,12 @@ class chain(object):
 		assert particles.check_is_particle(nPLHS)
 		assert dipoles.check_is_dipole(uDDP)
 		assert particles.check_is_particle(nPRHS)
-		if ((not self.__isLoop) and (self.__nextIndex == 0)): ##No particle of dipole to left to update.
-			pass
-		else:
-			__uLHIndex = self.get_chain_index(self.__nextIndex - 1)
-			self.__chainList[__uLHIndex][1] = nPLHS.copy()
-		if ((not self.__isLoop) and (self.__nextIndex == (len(self.__chainList) - 1))): ##-1 for list index from length.
-			pass ##No particle of dipole to right to update.
-		else:
-			__uRHIndex = self.get_chain_index(self.__nextIndex + 1)
-			self.__chainList[__uRHIndex][0] = nPRHS.copy()
-		self.__chainList[self.__nextIndex] = uDDP.copy()
+		__uLHDipole, __uRHDipole = self.__nextDipole.get_previous_dipole(), self.__nextDipole.get_next_dipole()
+		if (__uLHDipole is not None): ##No particle of dipole to left to update if None.
+			__uLHDipole[1] = nPLHS
+		if (__uRHDipole is not None): ##No particle of dipole to right to update if None.
+			__uRHDipole[0] = nPRHS
+		self.splice_dipoles(self.__nextDipole,[uDDP])
 
 	def update_dipoles_p_prod_LHS_recoil(self,pC,nV1,nV2,nV3):
 		"""A function to update the relevant dipoles when a photon is emitted with the LHS recoiling."""
@@ -480,9 +546,9 @@ class chain(object):
 		for nV in [nV1,nV2,nV3]:
 			assert fourVectors.check_is_fourVector(nV)
 		assert (self.__maxPperpSquared > self.__cutOff)
-		__p1 = self.__chainList[self.__nextIndex][1].copy()
+		__p1 = self.__nextDipole[1].copy()
 		__p2 = particles.particle('photon',nV2,[0,0],[0,0],[0,0],1)
-		__p3 = self.__chainList[self.__nextIndex][0].copy()
+		__p3 = self.__nextDipole[0].copy()
 		__p1.set_four_momentum(nV1)
 		__p3.set_four_momentum(nV3)
 		__p2.set_unique_ID(pC.next()) ##Set unique particle ID when produced.
@@ -493,10 +559,9 @@ class chain(object):
 			__1.set_child(0,__p2.get_unique_ID())
 		if __p3.get_child(1) != 0: ##i.e don't overwrite
 			__p3.set_child(1,__p2.get_unique_ID())
-		__uDDP = self.__chainList[self.__nextIndex].copy()
-		__uDDP[0], __uDDP[1] = __p3.copy(), __p1.copy()
-		self.update_dipole_values_p_prod(__p3.copy(),__uDDP,__p1.copy())
-		self.__producedPhoton = __p2.copy()
+		__uDDP = dipoles.dipole(__p3,__p1)
+		self.update_dipole_values_p_prod(__p3,__uDDP,__p1)
+		self.__producedPhoton = __p2
 
 	def update_dipoles_p_prod_RHS_recoil(self,pC,nV1,nV2,nV3):
 		"""A function to update the relevant dipoles when a photon is emitted with the RHS recoiling."""
@@ -504,9 +569,9 @@ class chain(object):
 		for nV in [nV1,nV2,nV3]:
 			assert fourVectors.check_is_fourVector(nV)
 		assert (self.__maxPperpSquared > self.__cutOff)
-		__p1 = self.__chainList[self.__nextIndex][0].copy()
+		__p1 = self.__nextDipole[0].copy()
 		__p2 = particles.particle('photon',nV2,[0,0],[0,0],[0,0],1)
-		__p3 = self.__chainList[self.__nextIndex][1].copy()
+		__p3 = self.__nextDipole[1].copy()
 		__p1.set_four_momentum(nV1)
 		__p3.set_four_momentum(nV3)
 		__p2.set_unique_ID(pC.next()) ##Set unique particle ID when produced.
@@ -517,10 +582,9 @@ class chain(object):
 			__p1.set_child(1,__p2.get_unique_ID())
 		if __p3.get_child(0) != 0: ##i.e don't overwrite
 			__p3.set_child(0,__p2.get_unique_ID())
-		__uDDP = self.__chainList[self.__nextIndex].copy()
-		__uDDP[0], __uDDP[1] = __p1.copy(), __p3.copy()
-		self.update_dipole_values_p_prod(__p1.copy(),__uDDP,__p3.copy())
-		self.__producedPhoton = __p2.copy()
+		__uDDP = dipoles.dipole(__p1,__p3)
+		self.update_dipole_values_p_prod(__p1,__uDDP,__p3)
+		self.__producedPhoton = __p2
 
 	def update_dipoles_p_prod(self,pC,nV1,nV2,nV3):
 		"""A function to update the relevant dipoles when a photon is emitted."""
@@ -535,38 +599,51 @@ class chain(object):
 
 	##~Control~##
 
-	def evolve(self,activeQCodes,pC,cC):
-		"""A function to evolve a chain through the next event if one is possible."""
-		assert ((counters.check_is_counter(pC)) and (counters.check_is_counter(cC)))
-		for __dipole in self.__chainList:
+	def find_next_event(self):
+		"""A function to find the next event of a chain, returning its PperpSquared or None if showering is completed."""
+		for __dipole in self:
 			assert __dipole.is_updated()
-		assert (type(activeQCodes) == list)
-		for qCode in activeQCodes:
-			assert qCode in particleData.knownParticles.get_known_quarks()
-		self.__activeQCodes = activeQCodes
 		##If self.__maxPperpSquared > self.__cutOff, should get not self.__proceed.
 		self.run_sudakovs() ##Get values and process for each dipole.
 		self.__proceed = self.process_sudakovs() ##Work out what's happening next.
 		if (not self.__proceed):
 			self.set_showering_completed()
+			return None
+		return self.__nextPperpSquared
+
+	def perform_next_event(self,activeQCodes,pC,cC):
+		"""A function to carry out the event found by find_next_event."""
+		assert ((counters.check_is_counter(pC)) and (counters.check_is_counter(cC)))
+		assert (type(activeQCodes) == list)
+		for qCode in activeQCodes:
+			assert qCode in particleData.knownParticles.get_known_quarks()
+		assert self.__proceed
+		self.__activeQCodes = activeQCodes
+		self.__proceed = False ##Each found event can only be carried out once.
+		self.prepare_dipoles()
+		__nV1, __nV2, __nV3 = self.run_kinematics()
+		if (self.__nextProcessCode == 1): ##Gluon emission.
+			self.update_dipoles_g_prod(pC,cC,__nV1, __nV2, __nV3)
+			return [1,None]
+		elif (self.__nextProcessCode == 2): ##Gluon splitting.
+			#Currently doesn't account for loops
+			self.update_dipoles_g_split(pC,cC,__nV1, __nV2, __nV3)
+			if (self.__sideOfSplit == "LHS"): ##i.e RHS is gluon splitting.
+				__middleDipole = self.__newDipoles[1]
+			elif (self.__sideOfSplit == "RHS"): ##i.e LHS is gluon splitting.
+				__middleDipole = self.__newDipoles[0]
+			##This chain keeps the LHS and the RHS is returned as a new chain.
+			return [2,self.split(__middleDipole,self.__nextPperpSquared)]
+		elif (self.__nextProcessCode == 3): ##Photon emission.
+			self.update_dipoles_p_prod(pC,__nV1,__nV2,__nV3)
+			return [3,self.__producedPhoton]
+
+	def evolve(self,activeQCodes,pC,cC):
+		"""A function to evolve a chain through the next event if one is possible."""
+		##Equivalent to find_next_event followed by perform_next_event.
+		if (self.find_next_event() == None):
 			return [0,None]
-		else:
-			self.prepare_dipoles()
-			__nV1, __nV2, __nV3 = self.run_kinematics()
-			if (self.__nextProcessCode == 1): ##Gluon emission.
-				self.update_dipoles_g_prod(pC,cC,__nV1, __nV2, __nV3)
-				return [1,None]
-			elif (self.__nextProcessCode == 2): ##Gluon splitting.
-				#Currently doesn't account for loops
-				self.update_dipoles_g_split(pC,cC,__nV1, __nV2, __nV3)
-				if (self.__sideOfSplit == "LHS"): ##i.e RHS is gluon splitting.
-					__splitBeforeIndex = self.__nextIndex + 1
-				elif (self.__sideOfSplit == "RHS"): ##i.e LHS is gluon splitting.
-					__splitBeforeIndex = self.__nextIndex
-				return [2,[__splitBeforeIndex,self.__nextPperpSquared]]
-			elif (self.__nextProcessCode == 3): ##Photon emission.
-				self.update_dipoles_p_prod(pC,__nV1,__nV2,__nV3)
-				return [3,self.__producedPhoton]
+		return self.perform_next_event(activeQCodes,pC,cC)
 
 ##Module test code:##
 if __name__ == "__main__":
@@ -73,12 +73,49 @@ def four_loop_lambda():
 	__fourLoopLambda = 0.208364759205
 	return __fourLoopLambda
 
+def LHEF_flush_events():
+	"""A function to define the number of events a LHEF writer holds before writing them to its file."""
+	__flushEvents = 1000
+	return __flushEvents
+
+def LHEF_flush_bytes():
+	"""A function to define the number of bytes of events a LHEF writer holds before writing them to its file."""
+	__flushBytes = 1048576 ##1 MB.
+	return __flushBytes
+
 def cut_off_energy():
 	"""Return a value for the cut off energy at which showering ends and hadronisation begins."""
 	##Chosen after viewing multiple sources. To be varied to fit hadronisation results.
 	__cutOff = 1.0
 	return __cutOff
 
+def overestimate_safety_margin():
+	"""Return the fractional margin added when raising a Sudakov overestimate prefactor to cover a veto ratio seen above 1."""
+	__safetyMargin = 0.1
+	return __safetyMargin
+
+def batch_sudakov_minimum_dipoles():
+	"""Return the number of dipoles needing a Sudakov trial at once from which they are solved as one numpy batch."""
+	##Below this the numpy overhead of a batch outweighs the Python loop of single solves.
+	__minimumDipoles = 12
+	return __minimumDipoles
+
+def solve_trial_budget():
+	"""Return the number of veto trials a single Sudakov or angle solve may take before its trial budget is exceeded."""
+	##Far beyond any normal solve, which takes tens of trials, so only a runaway loop reaches it.
+	__solveBudget = 100000
+	return __solveBudget
+
+def event_trial_budget():
+	"""Return the number of veto trials the shower of a single event may take before its trial budget is exceeded."""
+	__eventBudget = 1000000
+	return __eventBudget
+
+def trial_budget_policy():
+	"""Return what is done when a trial budget is exceeded: 'abort' the event, 'skip' the dipole or 'fail' the run."""
+	__policy = 'abort'
+	return __policy
+
 def aperys_constant():
 	"""Return a value for aperys constant."""
 	##Source: Wikipedia page on 'Apery's Constant'.
@@ -46,6 +46,8 @@ gluonProdCounter = counter(1)
 gluonSplitCounter = counter(1)
 photonProdCounter = counter(1)
 kPerpProdWarningCounter = counter(1)
+solveBudgetHitCounter = counter(1)
+eventBudgetHitCounter = counter(1)
 
 ##Module test code:##
 if __name__ == "__main__":
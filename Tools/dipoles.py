@@ -10,6 +10,7 @@ import random
 import assertions
 import particleData
 import particles
+import lorentz
 
 print "\n///////////////////////"
 print "Loading dipoles module:"
@@ -21,22 +22,34 @@ def check_is_dipole(toCheck):
 	"""A function to check for an instance of the dipole class."""
 	return isinstance(toCheck,dipole)
 
+def link_dipoles(lHSDipole,rHSDipole):
+	"""A function to link two neighbouring dipoles, either of which can be None for the end of a chain."""
+	##'is' used throughout as dipole.__eq__ only accepts dipoles.
+	assert ((lHSDipole is None) or check_is_dipole(lHSDipole))
+	assert ((rHSDipole is None) or check_is_dipole(rHSDipole))
+	if (lHSDipole is not None):
+		lHSDipole.set_next_dipole(rHSDipole)
+	if (rHSDipole is not None):
+		rHSDipole.set_previous_dipole(lHSDipole)
+
 ##Classes:##
 
 class dipole(object):
 	"""A class to handle a dipole."""
 	##updated tracks changes in a particle and relevant variables.
+	##sudakovTrial stores the last [Pperp^2, y, processCode] solved for the dipole until it is changed.
+	##COMFourVector, massSquared and dipoleFrames are calculated when first asked for and kept until the dipole changes.
+	##previousDipole and nextDipole link the dipole to its neighbours in a chain, None at the end of an open chain.
 
 	def update_dipole_COM_four_vector(self):
 		"""A function to update the COM four-vector of the dipole."""
-		__newCOMFourVector = self.__dipoleList[0].get_four_momentum().copy() + self.__dipoleList[1].get_four_momentum().copy()
+		__newCOMFourVector = self.__dipoleList[0].get_four_momentum() + self.__dipoleList[1].get_four_momentum()
 		self.__COMFourVector = __newCOMFourVector
 
 	def update_dipole_mass_squared(self):
 		"""A function to update the mass of the dipole."""
 		self.update_dipole_COM_four_vector()
-		__COMFourVector = self.__COMFourVector.copy()
-		__newDipoleMassSquared = __COMFourVector * __COMFourVector
+		__newDipoleMassSquared = self.__COMFourVector * self.__COMFourVector
 		self.__massSquared = __newDipoleMassSquared
 
 	def __init__(self,particle1,particle2):
@@ -45,45 +58,107 @@ class dipole(object):
 		##Can't have a 'zero dipole' so no check present; creation requires both particles non-zero.
 		assert (particles.check_is_particle(particle1) and particles.check_is_particle(particle2))
 		assert (particle1.__nonzero__() and particle2.__nonzero__())
-		__particle1, __particle2 = particle1.copy(), particle2.copy()
-		self.__dipoleList = [__particle1,__particle2]
-		self.update_dipole_mass_squared() #Set mass squared and also COM four-vector.
+		##The dipole takes the particles given, which can be shared with a neighbouring dipole as they aren't changed in place.
+		self.__dipoleList = [particle1,particle2]
+		self.reset_calculated_values() ##Mass squared and COM four-vector are calculated when needed.
 		self.__updated = True
+		self.__sudakovTrial = None
+		self.__previousDipole, self.__nextDipole = None, None
 
 	def set_not_updated(self):
 		"""A function to tell a dipole that it needs updating."""
 		self.__updated = False
+		self.__sudakovTrial = None ##Any stored trial is no longer valid once changed.
 
 	def copy(self):
 		"""A function to create a copy of a dipole."""
+		##The copy isn't linked into any chain.
 		__aCopy = dipole(self.__dipoleList[0].copy(),self.__dipoleList[1].copy())
 		if (not self.__updated):
 			__aCopy.set_not_updated()
+		elif self.has_sudakov_trial():
+			__aCopy.set_sudakov_trial(*self.__sudakovTrial)
 		return __aCopy
 
 	def __getitem__(self,listIndexOfParticle):
 		"""A function to return one of the particles in the dipole using its dipole-list index."""
 		##No set_particle as update used instead.
+		##The stored particle is returned so copy it before making any changes and then replace it using __setitem__.
 		assert assertions.valid_dipole_index(listIndexOfParticle)
-		return self.__dipoleList[listIndexOfParticle].copy()
+		return self.__dipoleList[listIndexOfParticle]
 
 	def __setitem__(self,listIndexToUpdate,updatedParticle):
 		"""A function to update a dipole, e.g after a recoil from another dipole has occured."""
 		assert assertions.valid_dipole_index(listIndexToUpdate)
 		assert particles.check_is_particle(updatedParticle)
 		assert updatedParticle.__nonzero__()
-		self.__dipoleList[listIndexToUpdate] = updatedParticle.copy()
-		self.update_dipole_mass_squared()
+		self.__dipoleList[listIndexToUpdate] = updatedParticle
+		self.reset_calculated_values()
 		self.__updated = True
+		self.__sudakovTrial = None ##S123 and codes may have changed so must be solved again.
+
+	def reset_calculated_values(self):
+		"""A function to clear the values calculated from the particles of the dipole after a change."""
+		self.__COMFourVector, self.__massSquared = None, None
+		self.__dipoleFrames = [None,None] ##Indexed by the particle recoiling.
 
 	def get_COM_four_vector(self):
 		"""A function to return the COM four-vector associated with the dipole."""
+		if (self.__COMFourVector is None): ##fourVector.__eq__ is for four-vectors only.
+			self.update_dipole_COM_four_vector()
 		return self.__COMFourVector
 
 	def get_mass_squared(self):
 		"""A function to return the mass squared of the dipole."""
+		if (self.__massSquared == None):
+			self.update_dipole_mass_squared()
 		return self.__massSquared
 
+	def get_dipole_frame(self,recoilIndex):
+		"""A function to return the frame of the orientated CMF of the dipole for the particle at recoilIndex recoiling."""
+		assert assertions.valid_dipole_index(recoilIndex)
+		if (self.__dipoleFrames[recoilIndex] is None):
+			__produceIndex = (recoilIndex + 1)%2
+			__v1 = self.__dipoleList[__produceIndex].get_four_momentum()
+			__v3 = self.__dipoleList[recoilIndex].get_four_momentum()
+			self.__dipoleFrames[recoilIndex] = lorentz.dipoleFrame(__v1,__v3) ##v3 recoils, as in kinematics.produce_new_vectors.
+		return self.__dipoleFrames[recoilIndex]
+
+	def set_sudakov_trial(self,PperpSquared,y,processCode):
+		"""A function to store the last Sudakov trial solved for the dipole."""
+		##The veto algorithm is memoryless so the trial stays valid for any lower maximum until the dipole changes.
+		assert ((PperpSquared == None) or assertions.all_are_numbers([PperpSquared]))
+		assert ((y == None) or assertions.all_are_numbers([y]))
+		assert ((0 <= processCode) and (processCode <= 3))
+		self.__sudakovTrial = [PperpSquared,y,processCode]
+
+	def get_sudakov_trial(self):
+		"""A function to return the stored Sudakov trial of the dipole as [Pperp^2, y, processCode]."""
+		assert self.has_sudakov_trial()
+		return self.__sudakovTrial
+
+	def has_sudakov_trial(self):
+		"""A function to check whether the dipole has a valid stored Sudakov trial."""
+		return (self.__sudakovTrial != None)
+
+	def set_previous_dipole(self,previousDipole):
+		"""A function to set the neighbouring dipole to the left in a chain."""
+		assert ((previousDipole is None) or check_is_dipole(previousDipole))
+		self.__previousDipole = previousDipole
+
+	def get_previous_dipole(self):
+		"""A function to return the neighbouring dipole to the left in a chain."""
+		return self.__previousDipole
+
+	def set_next_dipole(self,nextDipole):
+		"""A function to set the neighbouring dipole to the right in a chain."""
+		assert ((nextDipole is None) or check_is_dipole(nextDipole))
+		self.__nextDipole = nextDipole
+
+	def get_next_dipole(self):
+		"""A function to return the neighbouring dipole to the right in a chain."""
+		return self.__nextDipole
+
 	def get_index_to_recoil(self,processCode):
 		"""A function to return the index of the particle in the dipole which would take the recoil during splitting."""
 		##Returns 0 or 1
@@ -91,15 +166,12 @@ class dipole(object):
 		if (processCode == 1):
 			return particles.which_particle_to_recoil_g_emission(self.__dipoleList[0],self.__dipoleList[1])
 		elif (processCode == 2):
-			__code0, __code1 = self.__dipoleList[0].get_code(), self.__dipoleList[1].get_code()
-			__kQs = particleData.knownParticles.get_known_quarks()
-			__gC = particleData.knownParticles.get_code_from_name('gluon')
-			__expectedQCodes = __kQs + [-x for x in __kQs]
-			if ((__code0 in __expectedQCodes) and (__code1 == __gC)):
+			__p0, __p1 = self.__dipoleList[0], self.__dipoleList[1]
+			if (__p0.is_quark() and __p1.is_gluon()):
 				return 0
-			elif ((__code0 == __gC) and (__code1 in __expectedQCodes)):
+			elif (__p0.is_gluon() and __p1.is_quark()):
 				return 1
-			elif ((__code0 == __gC) and (__code1 == __gC)):
+			elif (__p0.is_gluon() and __p1.is_gluon()):
 				__R = random.random() ##Choose randomly as sudakov doesn't specify.
 				if (__R < 0.5):
 					return 0
@@ -0,0 +1,264 @@
+####~~ PyShower 1.0 ~~####
+###Copyright 2015/16, Daniel Osborne, All Rights Reserved###
+##Durham Thesis: 'Simulations for Particle Physics: Implementing the Colour Dipole Model with Invariant Transverse Momentum Ordering'.##
+##For: MPhys Theoretical Physics.##
+
+"""A module for handling many four-momenta at once, stored as the rows of an (N,4) numpy array."""
+
+##Each row is (E,px,py,pz), as in the fourVector class, so the functions here mirror those in fourVectors, lorentz and kinematics.
+##Used where many four-momenta are handled together, e.g. validating whole files of events, rather than inside the shower itself.
+
+##Import required modules:##
+import numpy
+import assertions
+import precision
+import fourVectors
+import particles
+
+print "\n////////////////////////////////"
+print "Loading fourVectorArrays module:"
+print "////////////////////////////////\n"
+
+##Functions:##
+
+def check_is_four_vector_array(toCheck):
+	"""A function to check for an (N,4) numpy array of four-momenta."""
+	return (isinstance(toCheck,numpy.ndarray) and (toCheck.ndim == 2) and (toCheck.shape[1] == 4))
+
+def from_four_vectors(listOfFourVectors):
+	"""A function to return an (N,4) array from a list of fourVector objects."""
+	assert type(listOfFourVectors) == list
+	for __v in listOfFourVectors:
+		assert fourVectors.check_is_fourVector(__v)
+		assert __v.__nonzero__()
+	return numpy.array([[__v[0],__v[1],__v[2],__v[3]] for __v in listOfFourVectors],dtype=float).reshape(-1,4)
+
+def from_particles(listOfParticles):
+	"""A function to return an (N,4) array of the four-momenta of a list of particle objects."""
+	assert type(listOfParticles) == list
+	for __p in listOfParticles:
+		assert particles.check_is_particle(__p)
+	return from_four_vectors([__p.get_four_momentum() for __p in listOfParticles])
+
+def to_four_vectors(arrayIn):
+	"""A function to return a list of fourVector objects from an (N,4) array."""
+	assert check_is_four_vector_array(arrayIn)
+	return [fourVectors.fourVector.from_floats(*[float(__x) for __x in __row]) for __row in arrayIn]
+
+def minkowski_products(arrayA,arrayB):
+	"""A function to return the Minkowski product of each row of one (N,4) array with the same row of another."""
+	##A single row (i.e a (1,4) array) is broadcast against every row of the other.
+	assert (check_is_four_vector_array(arrayA) and check_is_four_vector_array(arrayB))
+	return arrayA[:,0]*arrayB[:,0] - numpy.sum(arrayA[:,1:]*arrayB[:,1:],axis=1)
+
+def masses_squared(arrayIn):
+	"""A function to return P.P for each row of an (N,4) array."""
+	return minkowski_products(arrayIn,arrayIn)
+
+def Sijk(arrayIn):
+	"""A function to calculate the invariant quantity Sijk for all the rows of an (N,4) array, as kinematics.Sijk."""
+	assert check_is_four_vector_array(arrayIn)
+	return float(masses_squared(numpy.sum(arrayIn,axis=0).reshape(1,4))[0])
+
+def sum_per_event(arrayIn,eventIndices,numEvents = None):
+	"""A function to sum the rows of an (N,4) array belonging to each event, given the event index of each row."""
+	##Returns a (numEvents,4) array, with row i the total four-momentum of event i.
+	assert check_is_four_vector_array(arrayIn)
+	__eventIndices = numpy.asarray(eventIndices,dtype=int)
+	assert (__eventIndices.shape == (arrayIn.shape[0],))
+	if (numEvents == None):
+		numEvents = int(__eventIndices.max()) + 1 if (__eventIndices.size > 0) else 0
+	assert (type(numEvents) == int)
+	return numpy.column_stack([numpy.bincount(__eventIndices,weights=arrayIn[:,__i],minlength=numEvents) for __i in range(4)]).reshape(-1,4)
+
+def energies_per_event(arrayIn,eventIndices,numEvents = None):
+	"""A function to return the total energy of each event, given the event index of each row."""
+	return sum_per_event(arrayIn,eventIndices,numEvents)[:,0]
+
+def Sijk_per_event(arrayIn,eventIndices,numEvents = None):
+	"""A function to return the invariant quantity Sijk of each event, given the event index of each row."""
+	return masses_squared(sum_per_event(arrayIn,eventIndices,numEvents))
+
+def check_numbers_equal(arrayA,arrayB):
+	"""A function to check if all elements of two arrays are equal to the number of decimal places used throughout."""
+	return bool(numpy.all(numpy.abs(numpy.asarray(arrayA,dtype=float) - numpy.asarray(arrayB,dtype=float)) <= precision.precise_to()))
+
+def boost_to_frames(arrayIn,momentaOfCMFs):
+	"""A function to boost each row of an (N,4) array into the CMF with the matching row of momenta, as lorentz.lorentzBoost.boost."""
+	##A single CMF momentum (i.e a (1,4) array) boosts every row into the same frame.
+	assert (check_is_four_vector_array(arrayIn) and check_is_four_vector_array(momentaOfCMFs))
+	__masses = numpy.sqrt(masses_squared(momentaOfCMFs))
+	assert numpy.all(__masses > 0.0)
+	__energiesPrime = minkowski_products(momentaOfCMFs,arrayIn)/__masses
+	__alphas = (arrayIn[:,0] + __energiesPrime)/(__masses + momentaOfCMFs[:,0])
+	return numpy.column_stack((__energiesPrime,arrayIn[:,1:] - __alphas[:,numpy.newaxis]*momentaOfCMFs[:,1:])).reshape(-1,4)
+
+def inverse_boost_from_frames(arrayIn,momentaOfCMFs):
+	"""A function to boost each row of an (N,4) array back out of the CMF with the matching row of momenta, as lorentz.lorentzBoost.inverse_boost."""
+	assert (check_is_four_vector_array(arrayIn) and check_is_four_vector_array(momentaOfCMFs))
+	__masses = numpy.sqrt(masses_squared(momentaOfCMFs))
+	assert numpy.all(__masses > 0.0)
+	__energiesOut = (momentaOfCMFs[:,0]*arrayIn[:,0] + numpy.sum(momentaOfCMFs[:,1:]*arrayIn[:,1:],axis=1))/__masses
+	__alphas = (arrayIn[:,0] + __energiesOut)/(__masses + momentaOfCMFs[:,0])
+	return numpy.column_stack((__energiesOut,arrayIn[:,1:] + __alphas[:,numpy.newaxis]*momentaOfCMFs[:,1:])).reshape(-1,4)
+
+def rotation_bases(axes):
+	"""A function to return the orthonormal bases (eX,eY,eZ) taking each row of an (N,4) array of axes onto the +ve z-axis."""
+	##The same basis as lorentz.dipoleFrame, so eZ is the unit three-vector of the axis; each basis is an (N,3) array.
+	assert check_is_four_vector_array(axes)
+	__r = numpy.sqrt(numpy.sum(axes[:,1:]*axes[:,1:],axis=1))
+	assert numpy.all(__r > 0.0)
+	__eZ = axes[:,1:]/__r[:,numpy.newaxis]
+	__rho = numpy.sqrt(__eZ[:,0]*__eZ[:,0] + __eZ[:,1]*__eZ[:,1])
+	__onAxis = (__rho == 0.0) ##Along the z-axis, where phi = 0 as in lorentzRotation.
+	__safeRho = numpy.where(__onAxis,1.0,__rho)
+	__cosPhi = numpy.where(__onAxis,1.0,__eZ[:,0]/__safeRho)
+	__sinPhi = numpy.where(__onAxis,0.0,__eZ[:,1]/__safeRho)
+	__eX = numpy.column_stack((__cosPhi*__eZ[:,2],__sinPhi*__eZ[:,2],-__rho))
+	__eY = numpy.column_stack((-__sinPhi,__cosPhi,numpy.zeros(__rho.shape)))
+	return __eX, __eY, __eZ
+
+def rotate_onto_z(arrayIn,axes):
+	"""A function to rotate each row of an (N,4) array so the matching row of axes lies along the +ve z-axis."""
+	assert check_is_four_vector_array(arrayIn)
+	__eX, __eY, __eZ = rotation_bases(axes)
+	__p = arrayIn[:,1:]
+	return numpy.column_stack((arrayIn[:,0],numpy.sum(__eX*__p,axis=1),numpy.sum(__eY*__p,axis=1),numpy.sum(__eZ*__p,axis=1))).reshape(-1,4)
+
+def inverse_rotate_onto_z(arrayIn,axes):
+	"""A function to undo rotate_onto_z for each row of an (N,4) array, given the same axes."""
+	assert check_is_four_vector_array(arrayIn)
+	__eX, __eY, __eZ = rotation_bases(axes)
+	__p = arrayIn[:,1:2]*__eX + arrayIn[:,2:3]*__eY + arrayIn[:,3:4]*__eZ
+	return numpy.column_stack((arrayIn[:,0],__p)).reshape(-1,4)
+
+def fix_not_massless(arrayIn):
+	"""A function to return an (N,4) array with the same three-momenta as that given but exactly massless, as kinematics.fix_not_massless."""
+	assert check_is_four_vector_array(arrayIn)
+	return numpy.column_stack((numpy.sqrt(numpy.sum(arrayIn[:,1:]*arrayIn[:,1:],axis=1)),arrayIn[:,1:])).reshape(-1,4)
+
+##Module test code:##
+if __name__ == "__main__":
+	##Import modules required for testing:##
+	import random
+	import lorentz
+	import kinematics
+
+	##Begin testing:##
+	print "\n----------------------------------------------------------------------"
+	print "----------------------------------------------------------------------\n"
+	print "/////////////////////////////////"
+	print "Testing fourVectorArrays module:"
+	print "/////////////////////////////////"
+	assertions.pause(__name__)
+
+	##Setup here:##
+	print "\nSetting up four-vectors with random massless momenta:"
+	tFourVectorList = []
+	for tI1 in range(6):
+		tP = [random.uniform(-10.0,10.0) for tI2 in range(3)]
+		tFourVectorList.append(fourVectors.fourVector(0.0,tP[0],tP[1],tP[2]))
+		tFourVectorList[-1][0] = tFourVectorList[-1].calculate_cartesian_magnitude()
+	tArray = from_four_vectors(tFourVectorList)
+	print tArray
+	tCMF = tFourVectorList[0] + tFourVectorList[1]
+	tCMFArray = from_four_vectors([tCMF])
+
+	##Test check_is_four_vector_array:##
+	print "\n--------------------------------------------------\n"
+	print "Testing check_is_four_vector_array:\n"
+	tSuccessful = True
+	print "Given an (N,4) array the function returns:" , check_is_four_vector_array(tArray)
+	if not check_is_four_vector_array(tArray):
+		tSuccessful = False
+	print "Given a list the function returns:" , check_is_four_vector_array(tFourVectorList)
+	if check_is_four_vector_array(tFourVectorList):
+		tSuccessful = False
+	if tSuccessful:
+		print "\nTest successful!"
+	else:
+		print "\nTest failed!"
+	print "\nFinished testing check_is_four_vector_array."
+	assertions.pause(__name__)
+
+	##Test Sijk and Sijk_per_event:##
+	print "\n--------------------------------------------------\n"
+	print "Testing Sijk and Sijk_per_event:\n"
+	tSuccessful = True
+	print "kinematics.Sijk gives:" , kinematics.Sijk(tFourVectorList)
+	print "Sijk gives:" , Sijk(tArray)
+	if not precision.check_numbers_equal(kinematics.Sijk(tFourVectorList),Sijk(tArray)):
+		tSuccessful = False
+	tEventIndices = [0,0,0,1,1,1]
+	print "Splitting into two events, kinematics.Sijk gives:" , kinematics.Sijk(tFourVectorList[:3]) , kinematics.Sijk(tFourVectorList[3:])
+	print "Sijk_per_event gives:" , Sijk_per_event(tArray,tEventIndices)
+	if not check_numbers_equal(Sijk_per_event(tArray,tEventIndices),[kinematics.Sijk(tFourVectorList[:3]),kinematics.Sijk(tFourVectorList[3:])]):
+		tSuccessful = False
+	if tSuccessful:
+		print "\nTest successful!"
+	else:
+		print "\nTest failed!"
+	print "\nFinished testing Sijk and Sijk_per_event."
+	assertions.pause(__name__)
+
+	##Test boost_to_frames and inverse_boost_from_frames:##
+	print "\n--------------------------------------------------\n"
+	print "Testing boost_to_frames and inverse_boost_from_frames:\n"
+	tSuccessful = True
+	tBoost = lorentz.lorentzBoost(tCMF)
+	tBoosted = boost_to_frames(tArray,tCMFArray)
+	print "Boosting into the CMF of the first two rows gives:\n" , tBoosted
+	if not check_numbers_equal(tBoosted,from_four_vectors([tBoost.boost(tV) for tV in tFourVectorList])):
+		tSuccessful = False
+	print "Total three-momentum of the first two rows in the CMF:" , tBoosted[0,1:] + tBoosted[1,1:]
+	if not check_numbers_equal(tBoosted[0,1:] + tBoosted[1,1:],[0.0,0.0,0.0]):
+		tSuccessful = False
+	if not check_numbers_equal(inverse_boost_from_frames(tBoosted,tCMFArray),tArray):
+		tSuccessful = False
+	if tSuccessful:
+		print "\nTest successful!"
+	else:
+		print "\nTest failed!"
+	print "\nFinished testing boost_to_frames and inverse_boost_from_frames."
+	assertions.pause(__name__)
+
+	##Test rotate_onto_z and inverse_rotate_onto_z:##
+	print "\n--------------------------------------------------\n"
+	print "Testing rotate_onto_z and inverse_rotate_onto_z:\n"
+	tSuccessful = True
+	tFrame = lorentz.dipoleFrame(tFourVectorList[0],tFourVectorList[1])
+	tRotated = rotate_onto_z(tBoosted,tBoosted[0:1])
+	print "Rotating so the first boosted row lies along z gives:\n" , tRotated
+	if not check_numbers_equal(tRotated,from_four_vectors([tFrame.boost_rotate(tV) for tV in tFourVectorList])):
+		tSuccessful = False
+	if not check_numbers_equal(inverse_rotate_onto_z(tRotated,tBoosted[0:1]),tBoosted):
+		tSuccessful = False
+	if tSuccessful:
+		print "\nTest successful!"
+	else:
+		print "\nTest failed!"
+	print "\nFinished testing rotate_onto_z and inverse_rotate_onto_z."
+	assertions.pause(__name__)
+
+	##Test fix_not_massless:##
+	print "\n--------------------------------------------------\n"
+	print "Testing fix_not_massless:\n"
+	tSuccessful = True
+	tNotMassless = tArray.copy()
+	tNotMassless[:,0] *= 1.01
+	print "Masses squared before:" , masses_squared(tNotMassless)
+	print "Masses squared after:" , masses_squared(fix_not_massless(tNotMassless))
+	if not check_numbers_equal(masses_squared(fix_not_massless(tNotMassless)),numpy.zeros(tArray.shape[0])):
+		tSuccessful = False
+	if tSuccessful:
+		print "\nTest successful!"
+	else:
+		print "\nTest failed!"
+	print "\nFinished testing fix_not_massless."
+	assertions.pause(__name__)
+
+	##Done testing:##
+	print "\n---------------------------------------------\n"
+	print "//////////////////////////////////////////"
+	print "Finished checking fourVectorArrays module!"
+	print "//////////////////////////////////////////"
@@ -38,72 +38,64 @@ def check_different_direction(toCheck1,toCheck2):
 
 class fourVector(object):
 	"""A class for a four-vector."""
-	
+	##Stored as a list of four floats in a single slot to keep four-vectors small and quick to create.
+	##Empty (un-filled) positions are None, to prevent an empty vector appearing as a zero vector.
+	__slots__ = ('__vector',)
+
+	@staticmethod
+	def from_floats(tX0,tX1,tX2,tX3):
+		"""A function to create a four-vector directly from four floats without any checks."""
+		##Only for values known to be floats, e.g. from four-vector arithmetic, as used in the shower.
+		__result0 = object.__new__(fourVector)
+		__result0.__vector = [tX0,tX1,tX2,tX3]
+		return __result0
+
 	def count_initially_empty(self):
-		"""A function to count the number of empty inputs passed to an initiated four-vector object."""
-		self.__numberInitiallyEmpty = 0
-		for __i1, __tX1 in enumerate([self.__initialX0,self.__initialX1,self.__initialX2,self.__initialX3]):
-			if __tX1 == None:
-				self.__numberInitiallyEmpty += 1
-				self.__positionsEmpty[__i1] = True
+		"""A function to count the number of empty positions in a four-vector object."""
+		return self.__vector.count(None)
+
+	def get_positions_empty(self):
+		"""A function to return which positions of a four-vector object are empty."""
+		return [(__tX1 is None) for __tX1 in self.__vector]
 
 	def force_float_vector(self):
 		"""A function to convert all vector integers to floats but leave doubles."""
 		for __i2 in range(4):
-			assert assertions.all_are_numbers([__i2])
-			if (not assertions.check_float(self.__vector[__i2])):
+			if ((self.__vector[__i2] is not None) and (not assertions.check_float(self.__vector[__i2]))):
 				self.__vector[__i2] = assertions.force_float_number(self.__vector[__i2])
 
 	def __init__(self, tX0=None, tX1=None, tX2=None, tX3=None):
 		"""A function to initiate a four-vector object."""
-		for __anX in [tX0, tX1, tX2, tX3]:
-			assert ((__anX == None) or assertions.all_are_numbers([__anX]))
-		self.__positionsEmpty = [False,False,False,False]
-		self.__initialX0 , self.__initialX1 , self.__initialX2, self.__initialX3 = tX0 , tX1 , tX2 , tX3
-		##Track un-filled four-vectors (using self.__isEmpty = T/F) to prevent empty vector appearing as zero vector.
-		self.count_initially_empty()
-		assert ((self.__numberInitiallyEmpty == 0) or (self.__numberInitiallyEmpty == 4))
-		if (self.__numberInitiallyEmpty == 0):
-			self.__isEmpty = False
-			self.__initialX0, self.__initialX1 = self.__initialX0 , self.__initialX1
-			self.__initialX2, self.__initialX3 = self.__initialX2 , self.__initialX3
-			vector = [self.__initialX0,self.__initialX1,self.__initialX2,self.__initialX3]
-			assert assertions.all_are_numbers(vector)
-			self.__vector = vector
-		elif self.__numberInitiallyEmpty == 4:
-			self.__isEmpty = True
-			self.__vector = [0.0, 0.0, 0.0, 0.0]
-		self.force_float_vector()
+		if (tX0 is None):
+			assert ((tX1 is None) and (tX2 is None) and (tX3 is None))
+			self.__vector = [None,None,None,None]
+		else:
+			assert assertions.all_are_numbers([tX0, tX1, tX2, tX3])
+			self.__vector = [float(tX0),float(tX1),float(tX2),float(tX3)]
 
 	def copy(self):
 		"""A function to create an exact copy of a four-vector."""
-		__result1 = fourVector()
-		for __i3 in range(4):
-			__result1[__i3] = self.__vector[__i3]
+		__result1 = object.__new__(fourVector)
+		__result1.__vector = self.__vector[:]
 		return __result1
 
-	def update_empty(self):
-		"""A function to check whether a four-vector is no longer empty."""
-		if (all(__i4 == False for __i4 in self.__positionsEmpty)):
-			self.__isEmpty = False
-
 	def calculate_cartesian_magnitude(self):
 		"""A function to return the magnitude of the three-vector in a four-vector."""
 		assert self.__nonzero__()
-		return math.sqrt((self[1] * self[1]) + (self[2] * self[2]) + (self[3] * self[3]))
+		__vec = self.__vector
+		return math.sqrt((__vec[1] * __vec[1]) + (__vec[2] * __vec[2]) + (__vec[3] * __vec[3]))
 
 	def get_cartesian_unit_vector(self):
 		"""A function to return the cartesian unit three vector from a four-vector."""
 		__magnitude = self.calculate_cartesian_magnitude()
 		if (__magnitude == 0):
 			return fourVector(0.0,0.0,0.0,0.0)
-		__direction = fourVector(0.0,self[1],self[2],self[3])
-		__direction /= __magnitude
-		return __direction
+		__vec = self.__vector
+		return fourVector.from_floats(0.0,__vec[1]/__magnitude,__vec[2]/__magnitude,__vec[3]/__magnitude)
 
 	def __nonzero__(self):
 		"""A function to determine whether the four-vector is a zero object (empty / not fully initiated)."""
-		return not self.__isEmpty
+		return (None not in self.__vector)
 
 	def __getitem__(self, i5):
 		"""A function to get an entry in a four-vector object."""
@@ -115,22 +107,19 @@ class fourVector(object):
 		"""A function to assign an entry in a four-vector object."""
 		assert assertions.valid_four_vector_index(i6)
 		assert assertions.all_are_numbers([newValue])
-		__newValue = assertions.force_float_number(newValue)
-		self.__vector[i6] = __newValue
-		self.__positionsEmpty[i6] = False
-		self.update_empty()
+		self.__vector[i6] = float(newValue)
 
 	def __str__(self):
 		"""A function to return a string of a four-vector object."""
-		if (self.__isEmpty == True):
-			return "[empty four-vector" + str(self.__positionsEmpty) + "]"
+		if (not self.__nonzero__()):
+			return "[empty four-vector" + str(self.get_positions_empty()) + "]"
 		else:
 			return ("[" + str(self.__vector) + "]")
 
 	def __repr__(self):
 		"""A function to return a representation of a four-vector object."""
-		if self.__isEmpty == True:
-			return ("<four-vector([empty four-vector[" + str(self.__positionsEmpty) + "]])>")
+		if (not self.__nonzero__()):
+			return ("<four-vector([empty four-vector[" + str(self.get_positions_empty()) + "]])>")
 		else:
 			__vec = self.__vector
 			return ("<four-vector([tX0: " + str(__vec[0]) + ", tX1: " + str(__vec[1]) + ", tX2: " + str(__vec[2]) + ", tX3: " + str(__vec[3]) + "])>")
@@ -139,16 +128,18 @@ class fourVector(object):
 		"""A function for multiplying a four-vector by a scalar."""
 		assert assertions.all_are_numbers([multiplier])
 		assert self.__nonzero__()
-		__multiplier = assertions.force_float_number(multiplier)
+		__multiplier = float(multiplier)
+		__vec = self.__vector
 		for __i7 in range(4):
-			self[__i7] *= __multiplier
+			__vec[__i7] *= __multiplier
 		return self
 
 	def __mul__(fVA, fVB): ##Used for * to give Minkowski inner product.
 		"""A function for calculating the Minkowski inner product of four-vector objects."""
 		assert (check_is_fourVector(fVA) and check_is_fourVector(fVB))
 		assert (fVA.__nonzero__() and fVB.__nonzero__())
-		__result2 = ( fVA[0] * fVB[0] ) - ( (fVA[1] * fVB[1]) + (fVA[2] * fVB[2]) + (fVA[3] * fVB[3]) )
+		__a, __b = fVA.__vector, fVB.__vector
+		__result2 = ( __a[0] * __b[0] ) - ( (__a[1] * __b[1]) + (__a[2] * __b[2]) + (__a[3] * __b[3]) )
 		return __result2
 
 	def __idiv__(self,denominator): ##Used for /=
@@ -156,9 +147,10 @@ class fourVector(object):
 		assert assertions.all_are_numbers([denominator])
 		assert assertions.safe_division(denominator)
 		assert self.__nonzero__()
-		__denominator = assertions.force_float_number(denominator)
+		__denominator = float(denominator)
+		__vec = self.__vector
 		for __i8 in range(4):
-			self[__i8] /= __denominator
+			__vec[__i8] /= __denominator
 		return self
 
 	def __div__(self,denominator): ##Used for fVA / denominator.
@@ -166,44 +158,33 @@ class fourVector(object):
 		assert assertions.all_are_numbers([denominator])
 		assert assertions.safe_division(denominator)
 		assert self.__nonzero__()
-		__denominator = assertions.force_float_number(denominator)
-		__result3 = self.copy()
-		__result3 /= __denominator
-		return __result3
+		__denominator = float(denominator)
+		__vec = self.__vector
+		return fourVector.from_floats(__vec[0]/__denominator,__vec[1]/__denominator,__vec[2]/__denominator,__vec[3]/__denominator)
 
 	def __iadd__(self,toAdd): ##Used for += on four-vectors.
 		"""A function for adding another four-vector to itself."""
-		assert check_is_fourVector(toAdd)
-		assert (self.__nonzero__() and toAdd.__nonzero__())
-		__result4 = fourVector()
-		for __i9 in range(4):
-			__result4[__i9] = self[__i9] + toAdd[__i9]
-		return __result4
+		##Returns a new four-vector, as before, rather than changing this one in place.
+		return self.__add__(toAdd)
 
 	def __add__(fVA, fVB): ##Used for a + b on four-vectors.
 		"""A function for addition of four-vector objects."""
 		assert (check_is_fourVector(fVA) and check_is_fourVector(fVB))
 		assert (fVA.__nonzero__() and fVB.__nonzero__())
-		__result5 = fVA.copy()
-		__result5 += fVB
-		return __result5
+		__a, __b = fVA.__vector, fVB.__vector
+		return fourVector.from_floats(__a[0] + __b[0],__a[1] + __b[1],__a[2] + __b[2],__a[3] + __b[3])
 
 	def __isub__(self,toSubtract): ##Used for -= on four-vectors.
 		"""A function for subtracting another four-vector from itself."""
-		assert check_is_fourVector(toSubtract)
-		assert (self.__nonzero__() and toSubtract.__nonzero__())
-		__result6 = fourVector()
-		for __i10 in range(4):
-			__result6[__i10] = self[__i10] - toSubtract[__i10]
-		return __result6
+		##Returns a new four-vector, as before, rather than changing this one in place.
+		return self.__sub__(toSubtract)
 
 	def __sub__(fVA,fVB): ##Used for a - b on four-vectors.
 		"""A function for subtracting one four-vector from another."""
 		assert (check_is_fourVector(fVA) and check_is_fourVector(fVB))
 		assert (fVA.__nonzero__() and fVB.__nonzero__())
-		__result7 = fVA.copy()
-		__result7 -= fVB
-		return __result7
+		__a, __b = fVA.__vector, fVB.__vector
+		return fourVector.from_floats(__a[0] - __b[0],__a[1] - __b[1],__a[2] - __b[2],__a[3] - __b[3])
 
 	def __abs__(self):
 		"""A function to return the absolute value of a four-vector."""
@@ -215,7 +196,7 @@ class fourVector(object):
 		assert check_is_fourVector(other)
 		assert (self.__nonzero__() and other.__nonzero__())
 		for __i11 in range(4):
-			if not precision.check_numbers_equal(self[__i11],other[__i11]):
+			if not precision.check_numbers_equal(self.__vector[__i11],other.__vector[__i11]):
 				return False
 		return True
 
@@ -264,9 +245,7 @@ if __name__ == "__main__":
 	tAllZero *= 0.0
 	##~~~~~~~##
 	tEmpty1 = fourVector()
-	tEmpty1.count_initially_empty()
 	tEmpty2 = fourVector(1,2,3,4)
-	tEmpty2.count_initially_empty()
 	##~~~~~~~##
 	tMagnitude = fourVector(50,1.0,2.0,0.5)
 	##~~~~~~~~#
@@ -344,17 +323,17 @@ if __name__ == "__main__":
 	print "/////////////////////////"
 	assertions.pause(__name__)
 
-	##Test count_initially_empty, update_empty and __nonzero__:##
+	##Test count_initially_empty and __nonzero__:##
 	print "\n--------------------------------------------------\n"
-	print "Testing count_initially_empty, update_empty and __nonzero__:\n"
-	print "Initallising with no variables gives:" , tEmpty1._fourVector__numberInitiallyEmpty , "empty," , tEmpty1._fourVector__positionsEmpty
-	print "Initallising with 4 variable gives:" , tEmpty2._fourVector__numberInitiallyEmpty , "empty," , tEmpty2._fourVector__positionsEmpty
+	print "Testing count_initially_empty and __nonzero__:\n"
+	print "Initallising with no variables gives:" , tEmpty1.count_initially_empty() , "empty," , tEmpty1.get_positions_empty()
+	print "Initallising with 4 variable gives:" , tEmpty2.count_initially_empty() , "empty," , tEmpty2.get_positions_empty()
 	print "Checking __nonzero__ returns:" , tEmpty1.__nonzero__() , "and" , tEmpty2.__nonzero__()
 	if not ((tEmpty1.__nonzero__() == True) or (tEmpty2.__nonzero__() == False)):
 		print "\nTest successful!"
 	else:
 		print "\nTest failed!"
-	print "\nFinished testing count_initially_empty, update_empty and __nonzero__."
+	print "\nFinished testing count_initially_empty and __nonzero__."
 	assertions.pause(__name__)
 
 	##Test force_float_vector:##
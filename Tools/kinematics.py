@@ -183,25 +183,40 @@ def fix_energy_difference(difference,v2):
 	__nV2[0] = math.sqrt((v2[0]*v2[0]) + difference)
 	return __nV2
 
-def produce_new_vectors(v1,v3,PperpSquared,y):
+def fix_not_massless(v):
+	"""A function to return a four-vector with the same three-momentum as that given but exactly massless."""
+	##Used by the LHEF writers for rounding errors left by the kinematics, so the energy is set from the three-momentum.
+	assert fourVectors.check_is_fourVector(v)
+	assert v.__nonzero__()
+	return fourVectors.fourVector.from_floats(v.calculate_cartesian_magnitude(),v[1],v[2],v[3])
+
+def produce_new_vectors(v1,v3,PperpSquared,y,frame = None):
 	"""A function to boost two vectors, perform the kinematics and return the tResults after boosting back."""
 	##Requires v3 to be the recoiling vector, consistent with all kinematics in this project.
+	##A lorentz.dipoleFrame already built for v1 and v3, e.g. stored by a dipole, can be given to save rebuilding it.
 	assert (fourVectors.check_is_fourVector(v1) and fourVectors.check_is_fourVector(v3))
 	assert (v1.__nonzero__() and v3.__nonzero__())
 	assert assertions.all_are_numbers([PperpSquared,y])
 	__energyIn = v1[0] + v3[0] ##This is in the 'lab frame' as these are never actually boosted in the code.
-	__S123, __Pperp = Sijk([v1.copy(),v3.copy()]), math.sqrt(PperpSquared)
-	__boostRotate = lorentz.boostAndRotate(v1.copy(),v3.copy(),1) ##Given v3 as vector to recoil so need index 1 here.
+	__S123, __Pperp = Sijk([v1,v3]), math.sqrt(PperpSquared)
+	if (frame == None):
+		__frame = lorentz.dipoleFrame(v1,v3) ##Given v3 as vector to recoil, i.e along the -ve z-axis.
+	else:
+		assert lorentz.check_is_dipoleFrame(frame)
+		__frame = frame
 	__nBRV1, __nBRV2, __nBRV3 = calculate_split_ps(__S123,__Pperp,y)
 	assert precision.check_numbers_equal(0.0,__nBRV1[3]+__nBRV2[3]+__nBRV3[3])
-	__nV1, __nV2, __nV3 = __boostRotate/__nBRV1, __boostRotate/__nBRV2, __boostRotate/__nBRV3
+	__nV1, __nV3 = __frame/__nBRV1, __frame/__nBRV3
+	##Take nV2 from the total so four-momentum, and so energy in the 'lab' frame, is conserved exactly.
+	##This replaces fix_energy_difference and leaves any rounding error as a tiny mass for fix_not_massless in the writers.
+	__P = v1 + v3
+	__nV2 = fourVectors.fourVector.from_floats(__P[0] - __nV1[0] - __nV3[0],__P[1] - __nV1[1] - __nV3[1],__P[2] - __nV1[2] - __nV3[2],__P[3] - __nV1[3] - __nV3[3])
 	##Must also check energy out in the 'lab' frame too as not a Lorentz invariant quantity.
 	__energyOut = __nV1[0] + __nV2[0] + __nV3[0]
-	__energyDifference = __energyIn - __energyOut
-	__nV2 = fix_energy_difference(__energyDifference,__nV2)
+	assert precision.check_numbers_equal(0.0,__nV2*__nV2/__S123) ##Still massless up to the code precision.
 	##Check conservation rules:
 	assert precision.check_numbers_equal(__energyIn,__energyOut)
-	assert precision.check_numbers_equal(__S123,Sijk([__nV1.copy(), __nV2.copy(), __nV3.copy()]))
+	assert precision.check_numbers_equal(__S123,Sijk([__nV1, __nV2, __nV3]))
 	##No check for any momentums here as no longer have to sum to zero in this frame.
 	return __nV1, __nV2, __nV3
 
@@ -9,6 +9,7 @@
 
 ##Import required modules:##
 import math
+import numpy
 import assertions
 import precision
 import fourVectors
@@ -31,6 +32,10 @@ def check_is_boostAndRotate(toCheck):
 	"""A function to check for an instance of the boostAndRotate class."""
 	return isinstance(toCheck,boostAndRotate)
 
+def check_is_dipoleFrame(toCheck):
+	"""A function to check for an instance of the dipoleFrame class."""
+	return isinstance(toCheck,dipoleFrame)
+
 def check_timelike(pV):
 	"""A function to check whether a momentum vector is time-like (i.e P.P = M^2 > 0)."""
 	assert fourVectors.check_is_fourVector(pV)
@@ -52,6 +57,31 @@ def calculate_m_from_p_vector(pV):
 	assert pV.__nonzero__()
 	return math.sqrt(pV * pV)
 	
+def multiply_matrices(matrixA,matrixB):
+	"""A function to multiply two 4x4 matrices stored as lists of rows."""
+	return [[sum([matrixA[__i][__k]*matrixB[__k][__j] for __k in range(4)]) for __j in range(4)] for __i in range(4)]
+
+def apply_matrix(matrix,vectorIn):
+	"""A function to apply a 4x4 matrix, stored as a list of rows, to a four-vector."""
+	assert fourVectors.check_is_fourVector(vectorIn)
+	assert vectorIn.__nonzero__()
+	__v0, __v1, __v2, __v3 = vectorIn[0], vectorIn[1], vectorIn[2], vectorIn[3]
+	__r = [__row[0]*__v0 + __row[1]*__v1 + __row[2]*__v2 + __row[3]*__v3 for __row in matrix]
+	return fourVectors.fourVector.from_floats(__r[0],__r[1],__r[2],__r[3])
+
+def apply_matrix_to_all(matrix,vectorsIn):
+	"""A function to apply a 4x4 matrix to a list of four-vectors or an (N,4) array of four-momenta in one call."""
+	##An array in gives an array out and a list of four-vectors in gives a list of four-vectors out.
+	if isinstance(vectorsIn,numpy.ndarray):
+		assert ((vectorsIn.ndim == 2) and (vectorsIn.shape[1] == 4))
+		return numpy.dot(vectorsIn,numpy.array(matrix).T)
+	for __vectorIn in vectorsIn:
+		assert fourVectors.check_is_fourVector(__vectorIn)
+		assert __vectorIn.__nonzero__()
+	__arrayIn = numpy.array([[__v[0],__v[1],__v[2],__v[3]] for __v in vectorsIn],dtype=float).reshape(-1,4)
+	__arrayOut = numpy.dot(__arrayIn,numpy.array(matrix).T)
+	return [fourVectors.fourVector.from_floats(*[float(__x) for __x in __row]) for __row in __arrayOut]
+
 def check_v_not_faster_than_c(scalarVelocity):
 	"""A function to check that a scalar velocity isn't faster than the speed of light."""
 	##Allows equal to the speed of light to accommodate massless particles.
@@ -89,6 +119,18 @@ class lorentzBoost(object):
 		"""A function to return the mass associated with the CMF, in the lab frame."""
 		return self.__massOfCMF
 
+	def get_matrix(self,inverse = False):
+		"""A function to return the 4x4 matrix of the boost, or its inverse, as a list of rows."""
+		##Row 0 is (P0, -/+Pj)/M and row i is (-/+Pi/M, delta_ij + Pi*Pj/(M(M+P0))), with the lower signs for the inverse.
+		assert (inverse or not(inverse))
+		__P, __M = self.__momentumOfCMF, self.__massOfCMF
+		__sign = 1.0 if inverse else -1.0
+		__factor = __M*(__M + __P[0])
+		__matrix = [[__P[0]/__M] + [__sign*__P[__j]/__M for __j in [1,2,3]]]
+		for __i in [1,2,3]:
+			__matrix.append([__sign*__P[__i]/__M] + [float(__i == __j) + __P[__i]*__P[__j]/__factor for __j in [1,2,3]])
+		return __matrix
+
 	def get_beta(self):
 		"""A function to return the beta vector associated with the centre of mass frame."""
 		if check_timelike(self.__momentumOfCMF):
@@ -174,6 +216,17 @@ class lorentzRotation(object):
 		self.__r = self.__initialisingVector.calculate_cartesian_magnitude()
 		self.calculate_angles()
 
+	def get_matrix(self,inverse = False):
+		"""A function to return the 4x4 matrix of the rotation, or its inverse, as a list of rows."""
+		##The same elements as rotate, with the inverse as its transpose.
+		assert (inverse or not(inverse))
+		__c, __s, __t, __p = math.cos, math.sin, self.__theta, self.__phi
+		__ct, __st, __cp, __sp = __c(__t), __s(__t), __c(__p), __s(__p)
+		__matrix = [[1.0,0.0,0.0,0.0],[0.0,__ct*__cp,-__ct*__sp,__st],[0.0,__sp,__cp,0.0],[0.0,-__st*__cp,__st*__sp,__ct]]
+		if inverse:
+			return [[__matrix[__j][__i] for __j in range(4)] for __i in range(4)]
+		return __matrix
+
 	def rotate(self,vectorToRotate):
 		"""A function to apply the forward rotation to the given four-vector."""
 		##This is the rotation initialising four-vector onto z-axis.
@@ -229,20 +282,32 @@ class boostAndRotate(object):
 		else:
 			self.__boostedVector = self.__theBoost*self.__vector1
 			self.__theRotation = lorentzRotation(self.__boostedVector)
+		##Combine the boost and rotation once so each four-vector only needs one matrix multiplication:
+		self.__forwardMatrix = multiply_matrices(self.__theRotation.get_matrix(),self.__theBoost.get_matrix())
+		self.__inverseMatrix = multiply_matrices(self.__theBoost.get_matrix(True),self.__theRotation.get_matrix(True))
+
+	def get_matrix(self,inverse = False):
+		"""A function to return the combined 4x4 matrix of the boost and rotation, or its inverse, as a list of rows."""
+		assert (inverse or not(inverse))
+		if inverse:
+			return self.__inverseMatrix
+		return self.__forwardMatrix
 
 	def boost_rotate(self,vectorIn):
 		"""A function to apply the forward boost and rotation to the given four-vector."""
-		assert fourVectors.check_is_fourVector(vectorIn)
-		assert vectorIn.__nonzero__()
-		__vectorIn = vectorIn.copy()
-		return self.__theRotation*(self.__theBoost*__vectorIn)
+		return apply_matrix(self.__forwardMatrix,vectorIn)
 
 	def inverse_boost_rotate(self,vectorOut):
 		"""A function to apply the backwards boost and rotation to the given four-vector."""
-		assert fourVectors.check_is_fourVector(vectorOut)
-		assert vectorOut.__nonzero__()
-		__vectorOut = vectorOut.copy()
-		return self.__theBoost / (self.__theRotation / __vectorOut)
+		return apply_matrix(self.__inverseMatrix,vectorOut)
+
+	def boost_rotate_all(self,vectorsIn):
+		"""A function to apply the forward boost and rotation to a list of four-vectors or an (N,4) array in one call."""
+		return apply_matrix_to_all(self.__forwardMatrix,vectorsIn)
+
+	def inverse_boost_rotate_all(self,vectorsOut):
+		"""A function to apply the backwards boost and rotation to a list of four-vectors or an (N,4) array in one call."""
+		return apply_matrix_to_all(self.__inverseMatrix,vectorsOut)
 
 	def __mul__(self,vectorIn):
 		"""A function to call a lorentz boost and rotation on the four-vector multiplied by."""
@@ -258,6 +323,81 @@ class boostAndRotate(object):
 		__vectorOut = vectorOut.copy()
 		return self.inverse_boost_rotate(__vectorOut)
 
+class dipoleFrame(object):
+	"""A class for moving four-vectors to and from the orientated CMF of two particles using an orthonormal basis."""
+	##Gives the same frame as boostAndRotate(pV1,pV2,1) but without finding angles or building intermediate four-vectors.
+	##The basis vectors are the columns of the inverse rotation of lorentzRotation written in terms of the boosted pV1 direction, n:
+	##eX = (nx*nz/rho, ny*nz/rho, -rho), eY = (-ny/rho, nx/rho, 0), eZ = n, where rho = sqrt(nx^2 + ny^2).
+
+	def __init__(self,pV1,pV2):
+		"""A function to initialise the frame, with pV1 along the +ve z-axis and pV2 recoiling along the -ve z-axis."""
+		assert (fourVectors.check_is_fourVector(pV1) and fourVectors.check_is_fourVector(pV2))
+		assert (pV1.__nonzero__() and pV2.__nonzero__())
+		self.__P = [pV1[0] + pV2[0],pV1[1] + pV2[1],pV1[2] + pV2[2],pV1[3] + pV2[3]]
+		__P = self.__P
+		__MSquared = __P[0]*__P[0] - (__P[1]*__P[1] + __P[2]*__P[2] + __P[3]*__P[3])
+		assert (__MSquared > 0.0)
+		self.__M = math.sqrt(__MSquared)
+		##Boost pV1 into the CMF to find its direction there, as in lorentzBoost.boost:
+		__energyPrime = (__P[0]*pV1[0] - (__P[1]*pV1[1] + __P[2]*pV1[2] + __P[3]*pV1[3]))/self.__M
+		__alpha = (pV1[0] + __energyPrime)/(self.__M + __P[0])
+		__px, __py, __pz = pV1[1] - __alpha*__P[1], pV1[2] - __alpha*__P[2], pV1[3] - __alpha*__P[3]
+		__r = math.sqrt(__px*__px + __py*__py + __pz*__pz)
+		assert (__r > 0.0)
+		__nx, __ny, __nz = __px/__r, __py/__r, __pz/__r
+		__rho = math.sqrt(__nx*__nx + __ny*__ny)
+		if (__rho > 0.0):
+			__cosPhi, __sinPhi = __nx/__rho, __ny/__rho
+		else: ##Along the z-axis, where atan2 in lorentzRotation gives phi = 0.
+			__cosPhi, __sinPhi = 1.0, 0.0
+		self.__eX = [__cosPhi*__nz, __sinPhi*__nz, -__rho]
+		self.__eY = [-__sinPhi, __cosPhi, 0.0]
+		self.__eZ = [__nx, __ny, __nz]
+
+	def get_CMF_mass(self):
+		"""A function to return the mass associated with the CMF."""
+		return self.__M
+
+	def get_momentum_of_CMF(self):
+		"""A function to return the total four-momentum of the two particles in the lab frame."""
+		return fourVectors.fourVector.from_floats(self.__P[0],self.__P[1],self.__P[2],self.__P[3])
+
+	def boost_rotate(self,vectorIn):
+		"""A function to move a four-vector from the lab frame into the orientated CMF."""
+		assert fourVectors.check_is_fourVector(vectorIn)
+		assert vectorIn.__nonzero__()
+		__P, __M, __eX, __eY, __eZ = self.__P, self.__M, self.__eX, self.__eY, self.__eZ
+		__q0, __q1, __q2, __q3 = vectorIn[0], vectorIn[1], vectorIn[2], vectorIn[3]
+		__energyPrime = (__P[0]*__q0 - (__P[1]*__q1 + __P[2]*__q2 + __P[3]*__q3))/__M
+		__alpha = (__q0 + __energyPrime)/(__M + __P[0])
+		__px, __py, __pz = __q1 - __alpha*__P[1], __q2 - __alpha*__P[2], __q3 - __alpha*__P[3]
+		__x = __eX[0]*__px + __eX[1]*__py + __eX[2]*__pz
+		__y = __eY[0]*__px + __eY[1]*__py
+		__z = __eZ[0]*__px + __eZ[1]*__py + __eZ[2]*__pz
+		return fourVectors.fourVector.from_floats(__energyPrime,__x,__y,__z)
+
+	def inverse_boost_rotate(self,vectorOut):
+		"""A function to move a four-vector from the orientated CMF back into the lab frame."""
+		assert fourVectors.check_is_fourVector(vectorOut)
+		assert vectorOut.__nonzero__()
+		__P, __M, __eX, __eY, __eZ = self.__P, self.__M, self.__eX, self.__eY, self.__eZ
+		__q0, __a, __b, __c = vectorOut[0], vectorOut[1], vectorOut[2], vectorOut[3]
+		##Rotate back using the basis, then inverse boost as in lorentzBoost.inverse_boost:
+		__px = __a*__eX[0] + __b*__eY[0] + __c*__eZ[0]
+		__py = __a*__eX[1] + __b*__eY[1] + __c*__eZ[1]
+		__pz = __a*__eX[2] + __c*__eZ[2]
+		__energyOut = (__P[0]*__q0 + (__P[1]*__px + __P[2]*__py + __P[3]*__pz))/__M
+		__alpha = (__q0 + __energyOut)/(__M + __P[0])
+		return fourVectors.fourVector.from_floats(__energyOut,__px + __alpha*__P[1],__py + __alpha*__P[2],__pz + __alpha*__P[3])
+
+	def __mul__(self,vectorIn):
+		"""A function to move the four-vector multiplied by into the orientated CMF."""
+		return self.boost_rotate(vectorIn)
+
+	def __div__(self,vectorOut):
+		"""A function to move the four-vector divided by back into the lab frame."""
+		return self.inverse_boost_rotate(vectorOut)
+
 ##Module test code:##
 if __name__ == "__main__":
 	##Import modules required for testing:##
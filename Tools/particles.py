@@ -16,12 +16,23 @@ print "\n/////////////////////////"
 print "Loading particles module:"
 print "/////////////////////////\n"
 
+##Set up type flags:
+typeFlagsFromCode = {} ##Stores [isQuark, isGluon, isAntiParticle] for each PDG code once looked up.
+
 ##Functions:##
 
 def check_is_particle(toCheck):
 	"""A function to check for an instance of the particle class."""
 	return isinstance(toCheck,particle)
 
+def get_type_flags(lookUpCode):
+	"""A function to return the type flags [isQuark, isGluon, isAntiParticle] of a PDG code."""
+	if (not typeFlagsFromCode.has_key(lookUpCode)):
+		__isQuark = particleData.knownParticles.is_quark(lookUpCode)
+		__isGluon = (lookUpCode == particleData.knownParticles.get_code_from_name('gluon'))
+		typeFlagsFromCode[lookUpCode] = [__isQuark,__isGluon,(lookUpCode < 0)]
+	return typeFlagsFromCode[lookUpCode]
+
 def which_particle_most_energic(particle1,particle2):
 	"""A function to determine which of two particles is most energetic."""
 	assert (check_is_particle(particle1) and check_is_particle(particle2))
@@ -41,12 +52,12 @@ def which_particle_to_recoil_g_emission(particle1,particle2):
 	##Returns relevant dipole list index.
 	##calc_f_for_qg in sudakov is written (tX3^3 not tX1^3) under these assumptions.
 	##q-g, g-q, qBar-g or g-qBar -> g recoils:
-	if (particle1.is_quark() and particle2.get_name() == "gluon"):
+	if (particle1.is_quark() and particle2.is_gluon()):
 		return 1
-	elif (particle1.get_name() == "gluon" and particle2.is_quark()):
+	elif (particle1.is_gluon() and particle2.is_quark()):
 		return 0
 	##g-g -> Most energetic recoils:
-	elif ((particle1.get_name() == "gluon") and (particle1.get_name() == "gluon")):
+	elif (particle1.is_gluon() and particle2.is_gluon()):
 		#Ariadne does something angle related here?
 		return which_particle_most_energic(particle1,particle2)
 	##Source: 'From two to three jets in heavy boson decays: An algorithmic approach'.
@@ -66,6 +77,9 @@ def which_particle_to_recoil_g_emission(particle1,particle2):
 
 class particle(object):
 	"""A class for a particle."""
+	##Mothers, children and colours are stored as separate integers and the type flags are set once from the code.
+	__slots__ = ('__lookUpCode','__fourMomentum','__mother0','__mother1','__child0','__child1','__colour0','__colour1')
+	__slots__ += ('__statusCode','__uniqueID','__producedAt','__isQuark','__isGluon','__isAntiParticle')
 
 	def __init__(self,lookUpCodeOrName,fourMomentum = fourVectors.fourVector(),mothers = [0,0],children = [0,0],colours = [0,0], statusCode = 1):
 		"""A function to initiate a particle."""
@@ -85,18 +99,11 @@ class particle(object):
 			assert particleData.knownParticles.has_name(lookUpCodeOrName)
 			self.__lookUpCode = particleData.knownParticles.get_code_from_name(lookUpCodeOrName)
 		self.__fourMomentum = fourMomentum
-		self.__mothers = mothers
-		self.__children = children
-		self.__colours = colours
+		self.__mother0, self.__mother1 = mothers
+		self.__child0, self.__child1 = children
+		self.__colour0, self.__colour1 = colours
 		self.__statusCode = statusCode
-		self.__historyList = [False,False,False,False] ##Mothers then children (if set)
-		self.__colourSetList = [False, False]
-		for __i, __a in enumerate(self.__mothers+self.__children): ##Do both at once.
-			if __a != 0:
-				self.__historyList[__i] = True
-		for __i, __a in enumerate(self.__colours):
-			if __a != 0:
-				self.__colourSetList[__i]= True
+		self.__isQuark, self.__isGluon, self.__isAntiParticle = get_type_flags(self.__lookUpCode)
 		self.__uniqueID = 0
 		self.__producedAt = -1 ##Default value for not set, as 0 is actually used.
 
@@ -112,13 +119,14 @@ class particle(object):
 
 	def get_four_momentum(self):
 		"""A function to return the four-momentum of a particle."""
-		return self.__fourMomentum.copy()
+		##The stored four-vector is returned so must not be changed in place; replace it using set_four_momentum.
+		return self.__fourMomentum
       
 	def set_four_momentum(self,fourMomentumToSet):
 		"""A function to set the four-momentum of a particle."""
 		assert fourVectors.check_is_fourVector(fourMomentumToSet)
 		assert fourMomentumToSet.__nonzero__()
-		self.__fourMomentum = fourMomentumToSet.copy()
+		self.__fourMomentum = fourMomentumToSet ##The particle takes the four-vector given, as four-vectors aren't changed in place.
 
 	def get_unique_ID(self):
 		"""A function to get a particle's unique ID."""
@@ -158,15 +166,21 @@ class particle(object):
 
 	def copy(self):
 		"""A function to create an exact copy of a particle."""
-		__new = particle(self.__lookUpCode,self.__fourMomentum.copy(),self.__mothers,self.__children,self.__colours,self.__statusCode)
-		__new.set_unique_ID(self.__uniqueID)
-		__new.set_produced_at(self.__producedAt)
+		##Copies the fields directly as they are already checked.
+		##The four-momentum is shared as four-vectors are replaced rather than changed in place.
+		__new = object.__new__(particle)
+		__new.__lookUpCode, __new.__fourMomentum, __new.__statusCode = self.__lookUpCode, self.__fourMomentum, self.__statusCode
+		__new.__mother0, __new.__mother1 = self.__mother0, self.__mother1
+		__new.__child0, __new.__child1 = self.__child0, self.__child1
+		__new.__colour0, __new.__colour1 = self.__colour0, self.__colour1
+		__new.__isQuark, __new.__isGluon, __new.__isAntiParticle = self.__isQuark, self.__isGluon, self.__isAntiParticle
+		__new.__uniqueID, __new.__producedAt = self.__uniqueID, self.__producedAt
 		return __new
 
 	def __str__(self):
 		"""A function to return a string of a particle object."""
-		__theStr = ("[[" + self.get_name() + " | " + str(self.__fourMomentum) + " |\n" + str(self.__mothers) + " " + str(self.__children))
-		__theStr += (" | " + str(self.__colours) + " | " + str(self.__statusCode))
+		__theStr = ("[[" + self.get_name() + " | " + str(self.__fourMomentum) + " |\n" + str([self.__mother0,self.__mother1]) + " " + str([self.__child0,self.__child1]))
+		__theStr += (" | " + str([self.__colour0,self.__colour1]) + " | " + str(self.__statusCode))
 		__theStr += (" | " + str(self.__uniqueID) + " " + str(self.__producedAt) + " ]]")
 		return __theStr
 
@@ -176,8 +190,8 @@ class particle(object):
 
 	def __repr__(self):
 		"""A function to return a representation of a particle object."""
-		__theRepr = ("<particle([" + self.get_name() + " |\n" + repr(self.__fourMomentum) + " |\n" + str(self.__mothers) + " " + str(self.__children))
-		__theRepr += (" | " + str(self.__colours) + " | " + str(self.__statusCode))
+		__theRepr = ("<particle([" + self.get_name() + " |\n" + repr(self.__fourMomentum) + " |\n" + str([self.__mother0,self.__mother1]) + " " + str([self.__child0,self.__child1]))
+		__theRepr += (" | " + str([self.__colour0,self.__colour1]) + " | " + str(self.__statusCode))
 		__theRepr += (" | " + str(self.__uniqueID) + " " + str(self.__producedAt) + " ])>")
 		return __theRepr
 
@@ -217,8 +231,7 @@ class particle(object):
 		"""A function to return the mass of the particle from its four-momentum."""
 		##Mass is Minkowski scalar product of the E-p four-vector.
 		assert self.__nonzero__()
-		__v = self.get_four_momentum()
-		return __v*__v
+		return self.__fourMomentum*self.__fourMomentum
 
 	def get_width(self):
 		"""A function to return the width of the particle."""
@@ -236,52 +249,55 @@ class particle(object):
 		"""A function to return a mother of the particle given its index."""
 		assert (type(index) == int)
 		assert assertions.valid_dipole_index(index) ##As a list of the same dimensions.
-		return self.__mothers[index]
+		if (index == 0):
+			return self.__mother0
+		return self.__mother1
 
 	def set_mother(self,index,newValue):
 		"""A function to update a mother of the particle given its index and a new value."""
 		assert (type(index) == int)
 		assert assertions.valid_dipole_index(index) ##As a list of the same dimensions.
 		assert (type(newValue) == int)
-		self.__mothers[index] = newValue
-		if (newValue != 0):
-			self.__historyList[index] = True
+		if (index == 0):
+			self.__mother0 = newValue
 		else:
-			self.__historyList[index] = False
+			self.__mother1 = newValue
 
 	def get_child(self,index):
 		"""A function to return a child of the particle given its index."""
 		assert (type(index) == int)
 		assert assertions.valid_dipole_index(index) ##As a list of the same dimensions.
-		return self.__children[index]
+		if (index == 0):
+			return self.__child0
+		return self.__child1
 
 	def set_child(self,index,newValue):
 		"""A function to update a child of the particle given its index and a new value."""
 		assert (type(index) == int)
 		assert assertions.valid_dipole_index(index) ##As a list of the same dimensions.
 		assert (type(newValue) == int)
-		self.__children[index] = newValue
-		if (newValue != 0):
-			self.__historyList[index+2] = True
+		if (index == 0):
+			self.__child0 = newValue
 		else:
-			self.__historyList[index+2] = False
+			self.__child1 = newValue
 
 	def get_colour(self,index):
 		"""A function to return a colour of the particle given its index."""
 		assert (type(index) == int)
 		assert assertions.valid_dipole_index(index) ##As a list of the same dimensions.
-		return self.__colours[index]
+		if (index == 0):
+			return self.__colour0
+		return self.__colour1
 
 	def set_colour(self,index,newValue):
 		"""A function to update a colour of the particle given its index and a new value."""
 		assert (type(index) == int)
 		assert assertions.valid_dipole_index(index) ##As a list of the same dimensions.
 		assert (type(newValue) == int)
-		self.__colours[index] = newValue
-		if newValue != 0:
-			self.__colourSetList[index] = True
+		if (index == 0):
+			self.__colour0 = newValue
 		else:
-			self.__colourSetList[index] = False
+			self.__colour1 = newValue
 
 	def get_status_code(self):
 		"""A function to return the status code of the particle."""
@@ -293,7 +309,11 @@ class particle(object):
 
 	def is_quark(self):
 		"""A function to check if the particle is a quark."""
-		return particleData.knownParticles.is_quark(self.__lookUpCode)
+		return self.__isQuark
+
+	def is_gluon(self):
+		"""A function to check if the particle is a gluon."""
+		return self.__isGluon
 
 	def is_meson(self):
 		"""A function to check if the particle is a meson."""
@@ -321,18 +341,18 @@ class particle(object):
 
 	def is_anti_particle(self):
 		"""A function to check if the particle is an anti-particle."""
-		return particleData.knownParticles.is_anti_particle(self.__lookUpCode)
+		return self.__isAntiParticle
 
 	def history_set(self):
 		"""A function to return whether the history of a particle is set."""
-		if (sum(self.__historyList) == 4):
+		if (0 not in [self.__mother0,self.__mother1,self.__child0,self.__child1]):
 			return True
 		else:
 			return False
 
 	def colour_set(self):
 		"""A function to return whether a colour for a particle is set."""
-		if (sum(self.__colourSetList) >= 1): ##Currently only checks that one colour is set.
+		if ((self.__colour0 != 0) or (self.__colour1 != 0)): ##Currently only checks that one colour is set.
 			return True
 		else:
 			return False
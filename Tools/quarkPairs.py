@@ -14,6 +14,7 @@ import constants
 import particleData
 import runningCouplings
 import kinematics
+import trialBudgets
 
 print "\n//////////////////////////"
 print "Loading quarkPairs module:"
@@ -138,12 +139,19 @@ def calc_inverse_G_for_cos_theta(S123,fermionCode,valueIn):
 def get_quarks_theta(S123,fermionCode):
 	"""A function to get theta for a q-qBar pair produced from an e+e- collision."""
 	##Using veto algorithm in "PYTHIA 6.0 Physics and Manual".
+	##There is no shower to abort or dipole to skip here, so once over the trial budget the run stops, whatever the policy,..
+	##..rather than keep a vetoed trial and bias the angular distribution.
 	assert (type(S123) == float)
 	assert (type(fermionCode) == int)
 	assert (fermionCode in particleData.knownParticles.get_known_quarks())
 	__cosThetaMin, __cosThetaMax = -1.0, 1.0
 	__notChosen1 = True
+	__solveBudget, __rngState = trialBudgets.budget.get_solve_budget(), random.getstate()
+	__numTrials = 0
 	while __notChosen1:
+		if (__numTrials == __solveBudget):
+			trialBudgets.budget.fail('quarkPairs',[fermionCode,-fermionCode],S123,[],__numTrials,__rngState)
+		__numTrials += 1
 		__R1 = random.random()
 		__Gmin = calc_G_for_cos_theta(S123,fermionCode,__cosThetaMin)
 		__Gmax = calc_G_for_cos_theta(S123,fermionCode,__cosThetaMax)
@@ -0,0 +1,476 @@
+####~~ PyShower 1.0 ~~####
+###Copyright 2015/16, Daniel Osborne, All Rights Reserved###
+##Durham Thesis: 'Simulations for Particle Physics: Implementing the Colour Dipole Model with Invariant Transverse Momentum Ordering'.##
+##For: MPhys Theoretical Physics.##
+
+"""A module for showering a batch of events in lockstep, with their particles and dipoles stored in numpy arrays."""
+
+##The same shower as showers.qqBarShower, but each step carries out the next event of every unfinished event in the batch at once.
+##Particles are rows of arrays (momentum, code, colours, ...) and dipoles are pairs of particle rows, linked to their neighbours.
+##Each event's next emission is the hardest stored trial over all of its dipoles, which is the event the scheduler in..
+##..showers.qqBarShower picks over its chains, and gluon splittings just unlink the dipole between the new chains.
+##Particles are also linked left to right, so the results come out in the same order as showers.qqBarShower.save gives.
+##The trial budget of each event is kept here, as trialBudgets.budget counts one event at a time, with the same policy.
+##Random numbers are drawn from numpy.random, as in sudakovArrays.
+
+##Import required modules:##
+import math
+import numpy
+import assertions
+import constants
+import counters
+import particleData
+import fourVectors
+import fourVectorArrays
+import particles
+import kinematics
+import sudakovArrays
+import quarkPairs
+import chains
+import trialBudgets
+
+print "\n////////////////////////////"
+print "Loading showerArrays module:"
+print "////////////////////////////\n"
+
+##Functions:##
+
+def check_is_qqBarShowerBatch(toCheck):
+	"""A function to check for an instance of the qqBarShowerBatch class."""
+	return isinstance(toCheck,qqBarShowerBatch)
+
+def grow(arrayIn,minimumSize,fillValue):
+	"""A function to return an array with at least minimumSize rows, doubling its size and filling new rows with fillValue."""
+	if (arrayIn.shape[0] >= minimumSize):
+		return arrayIn
+	__newSize = max(minimumSize,2*arrayIn.shape[0])
+	__new = numpy.full((__newSize,) + arrayIn.shape[1:],fillValue,dtype=arrayIn.dtype)
+	__new[:arrayIn.shape[0]] = arrayIn
+	return __new
+
+def produce_new_momenta(v1s,v3s,PperpSquareds,ys):
+	"""A function to return the momenta after each dipole emits, with the v3s recoiling, as kinematics.produce_new_vectors for every row."""
+	##The emission is made in the orientated CMF of each dipole and taken back with fourVectorArrays, as lorentz.dipoleFrame.
+	##nV2 is taken from the total so four-momentum is conserved exactly.
+	__Ps = v1s + v3s
+	__sqrtS123s = numpy.sqrt(fourVectorArrays.masses_squared(__Ps))
+	__Pperps = numpy.sqrt(PperpSquareds)
+	__E1s = 0.5*(__sqrtS123s - __Pperps*numpy.exp(ys))
+	__E2s = __Pperps*numpy.cosh(ys)
+	__E3s = 0.5*(__sqrtS123s - __Pperps*numpy.exp(-1.0*ys))
+	for __i1 in range(__E1s.size): ##Stored for plotting graphs after showering, as in kinematics.calculate_split_ps.
+		kinematics.e1s.store(float(__E1s[__i1]))
+		kinematics.e2s.store(float(__E2s[__i1]))
+		kinematics.e3s.store(float(__E3s[__i1]))
+		kinematics.tX1s.store(float(2.0*__E1s[__i1]/__sqrtS123s[__i1]))
+		kinematics.tX3s.store(float(2.0*__E3s[__i1]/__sqrtS123s[__i1]))
+	for __i1 in range(numpy.count_nonzero((__E2s > __E1s) | (__E2s > __E3s))):
+		counters.kPerpProdWarningCounter.count()
+	__term2s = ((__E1s*__E1s) - (__E2s*__E2s) + (__E3s*__E3s))/(2.0*__E3s)
+	__kPerps = numpy.sqrt(numpy.maximum((__E1s*__E1s) - (__term2s*__term2s),0.0))
+	__phis = 2.0*math.pi*numpy.random.random(__E1s.size)
+	__pz1s = numpy.sqrt(numpy.maximum((__E1s*__E1s) - (__kPerps*__kPerps),0.0))
+	__pz2s = numpy.sqrt(numpy.maximum((__E2s*__E2s) - (__kPerps*__kPerps),0.0))
+	##Choose the directions along z that conserve the parallel momentum, as in kinematics.calculate_split_ps:
+	__imbalances = numpy.abs(numpy.column_stack((__pz1s + __pz2s - __E3s,__pz1s - __pz2s - __E3s,-__pz1s + __pz2s - __E3s)))
+	__configurations = numpy.argmin(__imbalances,axis=1)
+	__pz1s = numpy.where(__configurations == 2,-__pz1s,__pz1s)
+	__zeros = numpy.zeros(__E1s.size)
+	__nBRV1s = numpy.column_stack((__E1s,-__kPerps*numpy.cos(__phis),-__kPerps*numpy.sin(__phis),__pz1s))
+	__nBRV3s = numpy.column_stack((__E3s,__zeros,__zeros,-__E3s))
+	__axes = fourVectorArrays.boost_to_frames(v1s,__Ps) ##v1 lies along the +ve z-axis of each frame.
+	__nV1s = fourVectorArrays.inverse_boost_from_frames(fourVectorArrays.inverse_rotate_onto_z(__nBRV1s,__axes),__Ps)
+	__nV3s = fourVectorArrays.inverse_boost_from_frames(fourVectorArrays.inverse_rotate_onto_z(__nBRV3s,__axes),__Ps)
+	return __nV1s, __Ps - __nV1s - __nV3s, __nV3s
+
+##Classes:##
+
+class qqBarShowerBatch(object):
+	"""A class for showering a batch of qqBar events together in lockstep."""
+
+	def __init__(self,particlePairs,activeQCodes):
+		"""A function to initiate a batch from the starting q and qBar of each event, given as a list of pairs of particles."""
+		assert (type(particlePairs) == list)
+		for __pair in particlePairs:
+			assert (particles.check_is_particle(__pair[0]) and particles.check_is_particle(__pair[1]))
+			assert (__pair[0].get_code() == -1*__pair[1].get_code())
+		assert (type(activeQCodes) == list)
+		for qCode in activeQCodes:
+			assert qCode in particleData.knownParticles.get_known_quarks()
+		self.__activeQCodes = activeQCodes
+		self.__numEvents = len(particlePairs)
+		self.__startPairs = [[__pair[0].copy(),__pair[1].copy()] for __pair in particlePairs]
+		__startParticles = [__particle for __pair in particlePairs for __particle in __pair]
+		##Particles:
+		self.__numParticles = len(__startParticles)
+		self.__momenta = fourVectorArrays.from_particles(__startParticles)
+		self.__codes = numpy.array([__p.get_code() for __p in __startParticles],dtype=int)
+		self.__colours = numpy.array([[__p.get_colour(0),__p.get_colour(1)] for __p in __startParticles],dtype=int).reshape(-1,2)
+		self.__mothers = numpy.array([[__p.get_mother(0),__p.get_mother(1)] for __p in __startParticles],dtype=int).reshape(-1,2)
+		self.__children = numpy.array([[__p.get_child(0),__p.get_child(1)] for __p in __startParticles],dtype=int).reshape(-1,2)
+		self.__statusCodes = numpy.array([__p.get_status_code() for __p in __startParticles],dtype=int)
+		self.__uniqueIDs = numpy.array([__p.get_unique_ID() for __p in __startParticles],dtype=int)
+		self.__producedAt = numpy.array([__p.get_produced_at() for __p in __startParticles],dtype=float)
+		self.__particleEvents = numpy.repeat(numpy.arange(self.__numEvents),2)
+		self.__nextParticles = numpy.where(numpy.arange(self.__numParticles)%2 == 0,numpy.arange(self.__numParticles) + 1,-1) ##-1 at the right end.
+		self.__inChains = numpy.ones(self.__numParticles,dtype=bool) ##Photons leave the chains.
+		##Dipoles, starting with one per event:
+		self.__numDipoles = self.__numEvents
+		self.__dipoleParticles = numpy.arange(self.__numParticles).reshape(-1,2)
+		self.__dipoleEvents = numpy.arange(self.__numEvents)
+		self.__previousDipoles = numpy.full(self.__numDipoles,-1,dtype=int)
+		self.__nextDipoles = numpy.full(self.__numDipoles,-1,dtype=int)
+		self.__dipolesAlive = numpy.ones(self.__numDipoles,dtype=bool)
+		self.__trialPperpSquareds = numpy.full(self.__numDipoles,numpy.nan)
+		self.__trialYs = numpy.full(self.__numDipoles,numpy.nan)
+		self.__trialProcessCodes = numpy.zeros(self.__numDipoles,dtype=int)
+		self.__hasTrials = numpy.zeros(self.__numDipoles,dtype=bool)
+		##Events, each starting from the mass squared of its dipole as in chains.chain:
+		self.__maxPperpSquareds = fourVectorArrays.masses_squared(self.__momenta[0::2] + self.__momenta[1::2])
+		self.__particleCounters = numpy.full(self.__numEvents,5,dtype=int) ##As in showers.qqBarShower.
+		self.__colourCounters = numpy.full(self.__numEvents,502,dtype=int)
+		self.__finished = numpy.zeros(self.__numEvents,dtype=bool)
+		self.__startS123s = self.__maxPperpSquareds.copy()
+		self.__eventTrials = numpy.zeros(self.__numEvents,dtype=int)
+		self.__stopped, self.__aborted = numpy.zeros(self.__numEvents,dtype=bool), numpy.zeros(self.__numEvents,dtype=bool)
+		self.__results = None
+		self.__isRun = False
+
+	def is_run(self):
+		"""A function to determine whether the shower has been run."""
+		return self.__isRun
+
+	def number_events(self):
+		"""A function to return the number of events in the batch."""
+		return self.__numEvents
+
+	def number_unfinished(self):
+		"""A function to return the number of events still showering."""
+		return int(numpy.count_nonzero(~self.__finished))
+
+	def add_particles(self,numToAdd):
+		"""A function to add rows for new particles, returning their indices."""
+		__size = self.__numParticles + numToAdd
+		self.__momenta = grow(self.__momenta,__size,0.0)
+		self.__codes = grow(self.__codes,__size,0)
+		self.__colours = grow(self.__colours,__size,0)
+		self.__mothers = grow(self.__mothers,__size,0)
+		self.__children = grow(self.__children,__size,0)
+		self.__statusCodes = grow(self.__statusCodes,__size,1)
+		self.__uniqueIDs = grow(self.__uniqueIDs,__size,0)
+		self.__producedAt = grow(self.__producedAt,__size,-1.0)
+		self.__particleEvents = grow(self.__particleEvents,__size,-1)
+		self.__nextParticles = grow(self.__nextParticles,__size,-1)
+		self.__inChains = grow(self.__inChains,__size,True)
+		__indices = numpy.arange(self.__numParticles,__size)
+		self.__numParticles = __size
+		return __indices
+
+	def add_dipoles(self,numToAdd):
+		"""A function to add rows for new dipoles, returning their indices."""
+		__size = self.__numDipoles + numToAdd
+		self.__dipoleParticles = grow(self.__dipoleParticles,__size,-1)
+		self.__dipoleEvents = grow(self.__dipoleEvents,__size,-1)
+		self.__previousDipoles = grow(self.__previousDipoles,__size,-1)
+		self.__nextDipoles = grow(self.__nextDipoles,__size,-1)
+		self.__dipolesAlive = grow(self.__dipolesAlive,__size,True)
+		self.__trialPperpSquareds = grow(self.__trialPperpSquareds,__size,numpy.nan)
+		self.__trialYs = grow(self.__trialYs,__size,numpy.nan)
+		self.__trialProcessCodes = grow(self.__trialProcessCodes,__size,0)
+		self.__hasTrials = grow(self.__hasTrials,__size,False)
+		__indices = numpy.arange(self.__numDipoles,__size)
+		self.__numDipoles = __size
+		return __indices
+
+	def next_unique_IDs(self,events):
+		"""A function to return the next unique particle ID of each event given, as counters.counter.next."""
+		__uniqueIDs = self.__particleCounters[events].copy()
+		self.__particleCounters[events] += 1
+		return __uniqueIDs
+
+	def run_sudakovs(self):
+		"""A function to solve a Sudakov trial for every dipole without a valid stored one, all together."""
+		##Dipoles keep their trials until they change, as in chains.chain.run_sudakovs.
+		__dipoles = numpy.nonzero(self.__dipolesAlive[:self.__numDipoles] & ~self.__hasTrials[:self.__numDipoles] & ~self.__stopped[self.__dipoleEvents[:self.__numDipoles]])[0]
+		if (__dipoles.size == 0):
+			return
+		__lefts, __rights = self.__dipoleParticles[__dipoles,0], self.__dipoleParticles[__dipoles,1]
+		__S123s = fourVectorArrays.masses_squared(self.__momenta[__lefts] + self.__momenta[__rights])
+		__maxPperpSquareds = self.__maxPperpSquareds[self.__dipoleEvents[__dipoles]]
+		trialBudgets.budget.start_event() ##Only used for the trials of dipoles solved one by one.
+		__PperpSquareds, __ys, __processCodes, __numTrials = sudakovArrays.solve_array(__maxPperpSquareds,__S123s,self.__codes[__lefts],self.__codes[__rights])
+		self.__trialPperpSquareds[__dipoles], self.__trialYs[__dipoles], self.__trialProcessCodes[__dipoles] = __PperpSquareds, __ys, __processCodes
+		self.__hasTrials[__dipoles] = True
+		self.check_trial_budgets(self.__dipoleEvents[__dipoles],__numTrials)
+
+	def check_trial_budgets(self,events,numTrials):
+		"""A function to add the trials of the dipoles just solved to their events and stop any events over their budgets."""
+		##Dipoles over the budget of a solve already have no emission, so only 'abort' acts on them here.
+		self.__eventTrials += numpy.bincount(events,weights=numTrials,minlength=self.__numEvents).astype(int)
+		if (trialBudgets.budget.get_policy() == 'abort'):
+			self.stop_events(events[numTrials > trialBudgets.budget.get_solve_budget()],True)
+		for __event in numpy.nonzero(~self.__stopped & (self.__eventTrials >= trialBudgets.budget.get_event_budget()))[0]:
+			__codes = [__particle.get_code() for __particle in self.__startPairs[__event]]
+			__PperpSquaredRange = [float(self.__startS123s[__event]),float(self.__maxPperpSquareds[__event])]
+			trialBudgets.budget.exceeded('event',__codes,float(self.__startS123s[__event]),__PperpSquaredRange,int(self.__eventTrials[__event]),None)
+			self.stop_events(numpy.array([__event]),(trialBudgets.budget.get_policy() == 'abort'))
+
+	def stop_events(self,events,abort):
+		"""A function to stop showering the events given, giving them back unshowered if aborted."""
+		self.__stopped[events] = True
+		if abort:
+			self.__aborted[events] = True
+
+	def find_next_events(self):
+		"""A function to return the dipole with the hardest trial in each unfinished event, marking events with none as finished."""
+		__candidates = self.__dipolesAlive[:self.__numDipoles] & (self.__trialProcessCodes[:self.__numDipoles] > 0)
+		__candidates = numpy.nonzero(__candidates & ~self.__stopped[self.__dipoleEvents[:self.__numDipoles]])[0]
+		__order = numpy.lexsort((-self.__trialPperpSquareds[__candidates],self.__dipoleEvents[__candidates]))
+		__sorted = __candidates[__order]
+		__events, __firsts = numpy.unique(self.__dipoleEvents[__sorted],return_index=True)
+		self.__finished[:] = True
+		self.__finished[__events] = False
+		return __sorted[__firsts]
+
+	def find_recoil_indices(self,lefts,rights,processCodes):
+		"""A function to return the index in each dipole of the particle taking the recoil, as dipoles.dipole.get_index_to_recoil."""
+		__gC = particleData.knownParticles.get_code_from_name('gluon')
+		__leftGluons, __rightGluons = (self.__codes[lefts] == __gC), (self.__codes[rights] == __gC)
+		__leftEnergies, __rightEnergies = self.__momenta[lefts,0], self.__momenta[rights,0]
+		__Rs = numpy.random.random(lefts.size)
+		##Gluon emission and photon emission, as particles.which_particle_to_recoil_g_emission:
+		__emissionIndices = numpy.where(__leftEnergies > __rightEnergies,0,1) ##gg, most energetic recoils.
+		__emissionIndices = numpy.where(__leftEnergies == __rightEnergies,(__Rs < 0.5).astype(int),__emissionIndices)
+		__qqBarIndices = numpy.where(__Rs*(__leftEnergies*__leftEnergies + __rightEnergies*__rightEnergies) <= __leftEnergies*__leftEnergies,1,0)
+		__emissionIndices = numpy.where(~__leftGluons & ~__rightGluons,__qqBarIndices,__emissionIndices)
+		__emissionIndices = numpy.where(~__leftGluons & __rightGluons,1,__emissionIndices)
+		__emissionIndices = numpy.where(__leftGluons & ~__rightGluons,0,__emissionIndices)
+		##Gluon splitting, where the quark recoils and gg is chosen randomly:
+		__splittingIndices = numpy.where(__leftGluons & __rightGluons,(__Rs >= 0.5).astype(int),numpy.where(__leftGluons,1,0))
+		return numpy.where(processCodes == 2,__splittingIndices,__emissionIndices)
+
+	def set_new_colours_g_prod(self,emitters,gluons,recoilers,recoilIndices):
+		"""A function to set the new colours of the produced gluons and their dipoles, as chains.chain.set_new_colours_g_prod."""
+		##Each case uses one of four patterns of new colour, nC, where p1 emits and p3 recoils:
+		##A (e.g. qqBar): p2 = (nC, p1[0]), p3[1] = nC.   B (e.g. qBarq): p1[1] = nC, p2 = (nC, p3[0]).
+		##C (e.g. qBarg): p2 = (p1[1], nC), p3[0] = nC.   D (e.g. gqBar): p1[0] = nC, p2 = (p3[1], nC).
+		__gC = particleData.knownParticles.get_code_from_name('gluon')
+		__emitterCodes, __recoilerCodes = self.__codes[emitters], self.__codes[recoilers]
+		__emitterGluons, __recoilerGluons = (__emitterCodes == __gC), (__recoilerCodes == __gC)
+		__emitterQs, __emitterQBars = (~__emitterGluons & (__emitterCodes > 0)), (~__emitterGluons & (__emitterCodes < 0))
+		__recoilerQs, __recoilerQBars = (~__recoilerGluons & (__recoilerCodes > 0)), (~__recoilerGluons & (__recoilerCodes < 0))
+		__gg = __emitterGluons & __recoilerGluons
+		__optionA = (numpy.random.random(emitters.size) < 0.5) ##For gg, which end keeps its colour code.
+		__patternA = (__emitterQs & (__recoilerQBars | __recoilerGluons)) | (__gg & (recoilIndices == 1) & __optionA)
+		__patternB = ((__emitterQBars & __recoilerQs) | (__emitterGluons & __recoilerQs)) | (__gg & (recoilIndices == 0) & __optionA)
+		__patternC = (__emitterQBars & __recoilerGluons) | (__gg & (recoilIndices == 0) & ~__optionA)
+		__patternD = (__emitterGluons & __recoilerQBars) | (__gg & (recoilIndices == 1) & ~__optionA)
+		__newColours = self.__colourCounters[self.__particleEvents[gluons]].copy()
+		self.__colourCounters[self.__particleEvents[gluons]] += 1
+		__e, __g, __r, __nC = emitters[__patternA], gluons[__patternA], recoilers[__patternA], __newColours[__patternA]
+		self.__colours[__g,0], self.__colours[__g,1], self.__colours[__r,1] = __nC, self.__colours[__e,0], __nC
+		__e, __g, __r, __nC = emitters[__patternB], gluons[__patternB], recoilers[__patternB], __newColours[__patternB]
+		self.__colours[__e,1], self.__colours[__g,0], self.__colours[__g,1] = __nC, __nC, self.__colours[__r,0]
+		__e, __g, __r, __nC = emitters[__patternC], gluons[__patternC], recoilers[__patternC], __newColours[__patternC]
+		self.__colours[__g,0], self.__colours[__g,1], self.__colours[__r,0] = self.__colours[__e,1], __nC, __nC
+		__e, __g, __r, __nC = emitters[__patternD], gluons[__patternD], recoilers[__patternD], __newColours[__patternD]
+		self.__colours[__e,0], self.__colours[__g,0], self.__colours[__g,1] = __nC, self.__colours[__r,1], __nC
+
+	def perform_next_events(self,dipolesToRun):
+		"""A function to carry out the trial of each dipole given, one per event, updating the particles and dipoles."""
+		##Process codes: 1 = gluon emission, 2 = gluon splitting, 3 = photon emission.
+		__events = self.__dipoleEvents[dipolesToRun]
+		__PperpSquareds, __ys = self.__trialPperpSquareds[dipolesToRun], self.__trialYs[dipolesToRun]
+		__processCodes = self.__trialProcessCodes[dipolesToRun]
+		self.__maxPperpSquareds[__events] = __PperpSquareds ##Set the new maximum to that currently occuring.
+		__lefts, __rights = self.__dipoleParticles[dipolesToRun,0].copy(), self.__dipoleParticles[dipolesToRun,1].copy()
+		__recoilIndices = self.find_recoil_indices(__lefts,__rights,__processCodes)
+		__emitters = numpy.where(__recoilIndices == 0,__rights,__lefts)
+		__recoilers = numpy.where(__recoilIndices == 0,__lefts,__rights)
+		__nV1s, __nV2s, __nV3s = produce_new_momenta(self.__momenta[__emitters],self.__momenta[__recoilers],__PperpSquareds,__ys)
+		__emitterUniqueIDs = self.__uniqueIDs[__emitters].copy()
+		self.__momenta[__emitters], self.__momenta[__recoilers] = __nV1s, __nV3s
+		##Every event produces one new particle, p2, taking nV2:
+		__newParticles = self.add_particles(dipolesToRun.size)
+		self.__momenta[__newParticles] = __nV2s
+		self.__particleEvents[__newParticles] = __events
+		self.__statusCodes[__newParticles] = 1
+		self.__producedAt[__newParticles] = __PperpSquareds
+		__isEmission, __isSplitting, __isPhoton = (__processCodes == 1), (__processCodes == 2), (__processCodes == 3)
+		##Gluon and photon emission, where p2 is the new boson:
+		__bosons = ~__isSplitting
+		self.__codes[__newParticles[__isEmission]] = particleData.knownParticles.get_code_from_name('gluon')
+		self.__codes[__newParticles[__isPhoton]] = particleData.knownParticles.get_code_from_name('photon')
+		self.__uniqueIDs[__newParticles[__bosons]] = self.next_unique_IDs(__events[__bosons])
+		self.__mothers[__newParticles[__bosons],0] = __emitterUniqueIDs[__bosons]
+		self.__mothers[__newParticles[__bosons],1] = self.__uniqueIDs[__recoilers[__bosons]]
+		self.set_new_colours_g_prod(__emitters[__isEmission],__newParticles[__isEmission],__recoilers[__isEmission],__recoilIndices[__isEmission])
+		##Gluon splitting, where the gluon becomes p1 and p2 is its partner, as chains.chain.update_dipoles_g_split:
+		__splitters, __partners, __splitRecoilers = __emitters[__isSplitting], __newParticles[__isSplitting], __recoilers[__isSplitting]
+		__leftRecoils = (__recoilIndices[__isSplitting] == 0)
+		__qCodes = self.choose_quark_codes(__PperpSquareds[__isSplitting])
+		for __qCode in __qCodes:
+			chains.producedQuarkCodes.store(int(__qCode))
+		self.__codes[__splitters], self.__codes[__partners] = numpy.where(__leftRecoils,__qCodes,-__qCodes), numpy.where(__leftRecoils,-__qCodes,__qCodes)
+		self.__uniqueIDs[__splitters] = self.next_unique_IDs(__events[__isSplitting])
+		self.__uniqueIDs[__partners] = self.next_unique_IDs(__events[__isSplitting])
+		self.__producedAt[__splitters] = __PperpSquareds[__isSplitting]
+		self.__mothers[__splitters,0] = self.__uniqueIDs[__splitRecoilers]
+		self.__mothers[__partners,1] = self.__uniqueIDs[__splitRecoilers]
+		__gluonColours = self.__colours[__splitters].copy()
+		##The quark keeps the gluon's colour and the antiquark its anticolour:
+		self.__colours[__splitters] = numpy.where(__leftRecoils[:,numpy.newaxis],numpy.column_stack((__gluonColours[:,0],numpy.zeros(__splitters.size,dtype=int))),numpy.column_stack((numpy.zeros(__splitters.size,dtype=int),__gluonColours[:,1])))
+		self.__colours[__partners] = numpy.where(__leftRecoils[:,numpy.newaxis],numpy.column_stack((numpy.zeros(__splitters.size,dtype=int),__gluonColours[:,1])),numpy.column_stack((__gluonColours[:,0],numpy.zeros(__splitters.size,dtype=int))))
+		##Place p2 between the dipole's particles, or out of the chains for photons:
+		__inserted = ~__isPhoton
+		self.__nextParticles[__lefts[__inserted]] = __newParticles[__inserted]
+		self.__nextParticles[__newParticles[__inserted]] = __rights[__inserted]
+		self.__inChains[__newParticles[__isPhoton]] = False
+		self.update_dipoles(dipolesToRun,__newParticles,__isEmission,__isSplitting,__recoilIndices)
+		for __i1 in range(numpy.count_nonzero(__isEmission)):
+			counters.gluonProdCounter.count()
+		for __i1 in range(numpy.count_nonzero(__isSplitting)):
+			counters.gluonSplitCounter.count()
+		for __i1 in range(numpy.count_nonzero(__isPhoton)):
+			counters.photonProdCounter.count()
+
+	def update_dipoles(self,dipolesRun,newParticles,isEmission,isSplitting,recoilIndices):
+		"""A function to replace each dipole run with its new dipoles, or cut the chain for gluon splitting, clearing the trials that changed."""
+		##The dipole run becomes (left, p2), and emission adds (p2, right) after it. Splitting drops the dipole between the..
+		##..new q and qBar, as chains.chain.split. The neighbours' particles changed so, as with the dipoles run, need new trials.
+		__previousDipoles, __nextDipoles = self.__previousDipoles[dipolesRun].copy(), self.__nextDipoles[dipolesRun].copy()
+		self.__hasTrials[dipolesRun] = False
+		for __neighbours in [__previousDipoles,__nextDipoles]:
+			self.__hasTrials[__neighbours[__neighbours >= 0]] = False
+		##Gluon emission:
+		__run, __new = dipolesRun[isEmission], newParticles[isEmission]
+		__added = self.add_dipoles(__run.size)
+		self.__dipoleParticles[__added,0], self.__dipoleParticles[__added,1] = __new, self.__dipoleParticles[__run,1]
+		self.__dipoleParticles[__run,1] = __new
+		self.__dipoleEvents[__added] = self.__dipoleEvents[__run]
+		self.__previousDipoles[__added], self.__nextDipoles[__added] = __run, __nextDipoles[isEmission]
+		__hasNext = (__nextDipoles[isEmission] >= 0)
+		self.__previousDipoles[__nextDipoles[isEmission][__hasNext]] = __added[__hasNext]
+		self.__nextDipoles[__run] = __added
+		##Gluon splitting with the left recoiling, keeping (left, p2) and dropping (p2, right):
+		__leftRecoils = isSplitting & (recoilIndices == 0)
+		__run, __new, __next = dipolesRun[__leftRecoils], newParticles[__leftRecoils], __nextDipoles[__leftRecoils]
+		self.__dipoleParticles[__run,1] = __new
+		self.__nextDipoles[__run] = -1
+		self.__previousDipoles[__next[__next >= 0]] = -1
+		##Gluon splitting with the right recoiling, keeping (p2, right) and dropping (left, p2):
+		__rightRecoils = isSplitting & (recoilIndices == 1)
+		__run, __new, __previous = dipolesRun[__rightRecoils], newParticles[__rightRecoils], __previousDipoles[__rightRecoils]
+		self.__dipoleParticles[__run,0] = __new
+		self.__previousDipoles[__run] = -1
+		self.__nextDipoles[__previous[__previous >= 0]] = -1
+
+	def choose_quark_codes(self,PperpSquareds):
+		"""A function to return a weighted random quark code for each gluon splitting, as quarkPairs.get_quark_code."""
+		if (PperpSquareds.size == 0):
+			return numpy.zeros(0,dtype=int)
+		__qWeights = quarkPairs.get_quark_weights(float(PperpSquareds[0]),self.__activeQCodes) ##Weights don't depend on S123 here.
+		__cumulative = numpy.cumsum([__qWeights[__qCode] for __qCode in self.__activeQCodes])
+		__choices = numpy.minimum(numpy.searchsorted(__cumulative,numpy.random.random(PperpSquareds.size),side='right'),len(self.__activeQCodes) - 1)
+		return numpy.array(self.__activeQCodes,dtype=int)[__choices]
+
+	def run_shower(self):
+		"""A function to run the shower of every event in the batch to completion."""
+		self.run_sudakovs()
+		__dipolesToRun = self.find_next_events()
+		while (__dipolesToRun.size > 0):
+			self.perform_next_events(__dipolesToRun)
+			self.run_sudakovs()
+			__dipolesToRun = self.find_next_events()
+		self.__isRun = True
+		self.save()
+
+	def save(self):
+		"""A function to build the resulting particles of each event, in the order showers.qqBarShower.save gives."""
+		assert self.__isRun
+		__photonEvents = self.__particleEvents[:self.__numParticles][~self.__inChains[:self.__numParticles]]
+		__photons = numpy.nonzero(~self.__inChains[:self.__numParticles])[0]
+		self.__results = []
+		for __event in range(self.__numEvents):
+			if self.__aborted[__event]:
+				self.__results.append([__particle.copy() for __particle in self.__startPairs[__event]])
+				continue
+			__indices = []
+			__index = 2*__event ##The leftmost particle never changes.
+			while (__index >= 0):
+				__indices.append(__index)
+				__index = self.__nextParticles[__index]
+			__indices += list(__photons[__photonEvents == __event])
+			self.__results.append([self.build_particle(__i1) for __i1 in __indices])
+
+	def build_particle(self,index):
+		"""A function to return a particle object for a row of the arrays."""
+		__v = self.__momenta[index]
+		__particle = particles.particle(int(self.__codes[index]),fourVectors.fourVector.from_floats(float(__v[0]),float(__v[1]),float(__v[2]),float(__v[3])),
+			[int(self.__mothers[index,0]),int(self.__mothers[index,1])],[int(self.__children[index,0]),int(self.__children[index,1])],
+			[int(self.__colours[index,0]),int(self.__colours[index,1])],int(self.__statusCodes[index]))
+		__particle.set_unique_ID(int(self.__uniqueIDs[index]))
+		if (self.__producedAt[index] != -1.0):
+			__particle.set_produced_at(float(self.__producedAt[index]))
+		return __particle
+
+	def export_results(self,eventIndex):
+		"""A function to export the list of resulting particles of an event in the batch."""
+		assert self.__isRun
+		assert ((type(eventIndex) == int) and (0 <= eventIndex) and (eventIndex < self.__numEvents))
+		return self.__results[eventIndex]
+
+##Module test code:##
+if __name__ == "__main__":
+	##Import modules required for testing:##
+	import random
+	import precision
+
+	##Begin testing:##
+	print "\n----------------------------------------------------------------------"
+	print "----------------------------------------------------------------------\n"
+	print "////////////////////////////"
+	print "Testing showerArrays module:"
+	print "////////////////////////////"
+	assertions.pause(__name__)
+
+	##Setup here:##
+	print "\nGenerating test values..."
+	tMz = particleData.knownParticles.get_mass_from_code(particleData.knownParticles.get_code_from_name('Z-boson'))
+	tNumEvents = 500
+	tPairs = []
+	for tEvent in range(tNumEvents): ##As MEs.produce_quark_pair, in the x-z plane.
+		tQCode, tTheta = quarkPairs.get_code_and_theta(tMz*tMz,constants.active_q_codes())
+		tV1 = fourVectors.fourVector.from_floats(tMz/2.0,tMz*math.sin(tTheta)/2.0,0.0,tMz*math.cos(tTheta)/2.0)
+		tV2 = fourVectors.fourVector.from_floats(tMz/2.0,-tMz*math.sin(tTheta)/2.0,0.0,-tMz*math.cos(tTheta)/2.0)
+		tPairs.append([particles.particle(tQCode,tV1,[1,2],[0,0],[501,0],1),particles.particle(-tQCode,tV2,[1,2],[0,0],[0,501],1)])
+		for tParticle, tUniqueID in zip(tPairs[-1],[3,4]):
+			tParticle.set_unique_ID(tUniqueID)
+			tParticle.set_produced_at(tMz*tMz)
+
+	##Test qqBarShowerBatch:##
+	print "\n--------------------------------------------------\n"
+	print "Testing qqBarShowerBatch:\n"
+	tSuccessful = True
+	tBatch = qqBarShowerBatch(tPairs,constants.active_q_codes())
+	tBatch.run_shower()
+	tMultiplicities = []
+	for tEvent in range(tNumEvents):
+		tResults = tBatch.export_results(tEvent)
+		tMultiplicities.append(len(tResults))
+		tTotal = fourVectorArrays.sum_per_event(fourVectorArrays.from_particles(tResults),numpy.zeros(len(tResults),dtype=int))[0]
+		if not (precision.check_numbers_equal(tTotal[0],tMz) and precision.check_numbers_equal(kinematics.Sijk([tP.get_four_momentum() for tP in tResults]),tMz*tMz)):
+			tSuccessful = False
+	print "The mean number of particles out was", numpy.mean(tMultiplicities), "with a maximum of", max(tMultiplicities)
+	if tSuccessful:
+		print "\nTest successful!"
+	else:
+		print "\nTest failed!"
+	print "\nFinished testing qqBarShowerBatch."
+	assertions.pause(__name__)
+
+	##Done testing:##
+	print "\n---------------------------------------------\n"
+	print "//////////////////////////////////////"
+	print "Finished checking showerArrays module!"
+	print "//////////////////////////////////////"
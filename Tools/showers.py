@@ -6,6 +6,7 @@
 """A module for handling dipole showering."""
 
 ##Import required modules:##
+import heapq
 import assertions
 import counters
 import particleData
@@ -13,6 +14,7 @@ import particles
 import dipoles
 import chains
 import resultsContainers
+import trialBudgets
 
 print "\n///////////////////////"
 print "Loading showers module:"
@@ -116,42 +118,48 @@ class qqBarShower(object):
 				return False
 		return True
 
+	def schedule_chain(self,scheduler,chain,order):
+		"""A function to find the next event of a chain and add it to the scheduler if there is one."""
+		assert chains.check_is_chain(chain)
+		assert counters.check_is_counter(order)
+		__nextPperpSquared = chain.find_next_event()
+		if (__nextPperpSquared != None): ##Completed chains drop out of the scheduler.
+			##heapq gives the smallest first so use -PperpSquared. order breaks ties without comparing chains.
+			heapq.heappush(scheduler,(-1*__nextPperpSquared,order.next(),chain))
+
 	def run_shower(self):
 		"""A function to run the shower to completion."""
 		#Currently shower history can't be turned on.
-		while (not self.all_chains_showered()):
-			__breakInnerLoops = False
-			__numChains = len(self.__showerList)
-			for __showerListIndex in range(__numChains): ##Iterating length not list to prevent continuing when list updated.
-				__chain = self.__showerList[__showerListIndex]
-				if (not __chain.showering_completed() and (not __breakInnerLoops)):
-					__results = [4,None] ##Used to start while loop.
-					while ((__results[0] != 0) and (not __breakInnerLoops)):
-						__results = self.__showerList[__showerListIndex].evolve(self.__activeQCodes,self.__particleCounter,self.__colourCounter)
-						if (__results[0] == 1): ##Gluon emission occured and no action required here.
-							counters.gluonProdCounter.count()
-						if (__results[0] == 2): ##Gluon splitting occured.
-							counters.gluonSplitCounter.count()
-							__splitBeforeIndex, __newMaxPperpSquared = __results[1]
-							__chainPart1 = __chain.get_chain_list()[:(__splitBeforeIndex)] ##The 'middle' dipole is not needed.
-							__chainPart2 = __chain.get_chain_list()[(__splitBeforeIndex + 1):]
-							__orderedList1, __orderedList2 = [], []
-							for __dipole in __chainPart1:
-								__orderedList1.append(__dipole[0])
-							__orderedList1.append(__chainPart1[-1][1]) ##Don't forget last particle.
-							for __dipole in __chainPart2:
-								__orderedList2.append(__dipole[0])
-							__orderedList2.append(__chainPart2[-1][1]) ##Don't forget last particle.
-							#Splitting of loops not yet treated here:
-							__newChain1 = chains.chain(__orderedList1,False,__newMaxPperpSquared)
-							__newChain2 = chains.chain(__orderedList2,False,__newMaxPperpSquared)
-							self.__showerList[__showerListIndex] = __newChain1
-							self.__showerList.insert(__showerListIndex + 1,__newChain2)
-							__breakInnerLoops = True
-						if (__results[0] == 3): ##Photon emission occured.
-							counters.photonProdCounter.count()
-							__producedPhoton = __results[1]
-							self.__photonList.append(__producedPhoton.copy())
+		##The scheduler always holds the next event of each unfinished chain so the hardest pending event..
+		##..across all chains is carried out next. Events in other chains remain valid as the veto algorithm is memoryless.
+		##Stops early once over the event's trial budget, or when a budget is exceeded with the 'abort' policy, which gives back..
+		##..the starting qqBar unshowered.
+		trialBudgets.budget.start_event()
+		__startCodes = [self.__startParticle1.get_code(),self.__startParticle2.get_code()]
+		__startS123 = self.__startDipole.get_mass_squared()
+		__scheduler = []
+		__order = counters.counter(0)
+		for __chain in self.__showerList:
+			self.schedule_chain(__scheduler,__chain,__order)
+		while (__scheduler and (not trialBudgets.budget.event_stopped(__startCodes,__startS123,[__startS123,-__scheduler[0][0]]))):
+			__chain = heapq.heappop(__scheduler)[2]
+			__results = __chain.perform_next_event(self.__activeQCodes,self.__particleCounter,self.__colourCounter)
+			if (__results[0] == 1): ##Gluon emission occured and no action required here.
+				counters.gluonProdCounter.count()
+			if (__results[0] == 2): ##Gluon splitting occured.
+				counters.gluonSplitCounter.count()
+				##The chain keeps the LHS of the split and the RHS is returned as a new chain.
+				__newChain = __results[1]
+				self.__showerList.insert(self.__showerList.index(__chain) + 1,__newChain)
+				self.schedule_chain(__scheduler,__newChain,__order)
+			if (__results[0] == 3): ##Photon emission occured.
+				counters.photonProdCounter.count()
+				__producedPhoton = __results[1]
+				self.__photonList.append(__producedPhoton.copy())
+			self.schedule_chain(__scheduler,__chain,__order)
+		if trialBudgets.budget.event_aborted():
+			self.__showerList, self.__photonList = [self.__startChain], []
+		assert (self.all_chains_showered() or trialBudgets.budget.event_stopped())
 		self.__isRun = True
 		self.save()
 
@@ -0,0 +1,354 @@
+####~~ PyShower 1.0 ~~####
+###Copyright 2015/16, Daniel Osborne, All Rights Reserved###
+##Durham Thesis: 'Simulations for Particle Physics: Implementing the Colour Dipole Model with Invariant Transverse Momentum Ordering'.##
+##For: MPhys Theoretical Physics.##
+
+"""A module for solving the Sudakov form factors of many dipoles at once, with each dipole a lane of numpy arrays."""
+
+##The functions here mirror those in sudakovs, running the same veto algorithm with the same overestimates on every lane together.
+##Random numbers are drawn in blocks from numpy.random, so it must be seeded for a batch to be reproduced, and lanes..
+##..drop out as they are accepted or fall below the cut-off. Dipoles covered by tables, or every dipole while the competition..
+##..solver is on, are passed to sudakovs.solve one by one.
+
+##Import required modules:##
+import math
+import numpy
+import assertions
+import constants
+import particleData
+import runningCouplings
+import sudakovs
+import trialBudgets
+
+print "\n/////////////////////////////"
+print "Loading sudakovArrays module:"
+print "/////////////////////////////\n"
+
+##Process codes of each differential cross section Id, as in sudakovs.solve_case_group_0/1/2:##
+processCodesOfIds = numpy.array([1,1,1,2,2,2,3])
+
+##Functions:##
+
+def check_is_overestimatePrimitiveArray(toCheck):
+	"""A function to check for an instance of the overestimatePrimitiveArray class."""
+	return isinstance(toCheck,overestimatePrimitiveArray)
+
+def Nf_array(QSquareds):
+	"""A function to return the number of quark flavours that can be produced at each centre of mass energy squared."""
+	__quarkMasses = numpy.array([particleData.knownParticles.get_mass_from_code(__quarkCode) for __quarkCode in particleData.knownParticles.get_known_quarks()])
+	return numpy.sum(2.0*__quarkMasses[numpy.newaxis,:] < numpy.sqrt(QSquareds)[:,numpy.newaxis],axis=1)
+
+def alphaS_array(QSquareds):
+	"""A function to calculate the one-loop strong coupling constant at each COM energy squared, as runningCouplings.oneLoopAlphaS."""
+	__alphaSOfMzSquared = constants.one_loop_alphaS_of_Mz_squared()
+	__Mz = particleData.knownParticles.get_mass_from_code(particleData.knownParticles.get_code_from_name('Z-boson'))
+	__beta0s = runningCouplings.beta0(Nf_array(QSquareds)) / (4.0*math.pi)
+	return __alphaSOfMzSquared / (1.0 + (__alphaSOfMzSquared*__beta0s*numpy.log(QSquareds/(__Mz*__Mz))))
+
+def alphaEM_array(QSquareds):
+	"""A function to calculate the one-loop fine structure constant at each COM energy squared, as runningCouplings.oneLoopAlphaEM."""
+	__alphaEMOfMzSquared = constants.one_loop_alphaEM_of_Mz_squared()
+	__Mz = particleData.knownParticles.get_mass_from_code(particleData.knownParticles.get_code_from_name('Z-boson'))
+	return __alphaEMOfMzSquared / (1.0 - (__alphaEMOfMzSquared*numpy.log(QSquareds/(__Mz*__Mz))/(3.0*math.pi)))
+
+def alphaS_overestimates(PperpSquareds):
+	"""A function to calculate the one-loop running overestimate of alphaS at each PperpSquared, as sudakovs.calc_alphaS_overestimate."""
+	__alphaSMax = sudakovs.alphaS.get_shower_max()
+	__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
+	return __alphaSMax / (1.0 + __alphaSMax*sudakovs.alphaSOverestimateB*numpy.log(PperpSquareds/__cutOff))
+
+def rapidity_limits(S123s,PperpSquareds):
+	"""A function to calculate the largest magnitude of rapidity allowed for each PperpSquared, as sudakovs.calc_rapidity_limit."""
+	return numpy.arccosh(numpy.maximum(numpy.sqrt(S123s/PperpSquareds)/2.0,1.0))
+
+def lambert_w0_array(zs):
+	"""A function to calculate the principal branch of the Lambert W function for each -1/e <= z <= 0 by Halley's method, as sudakovs.lambert_w0."""
+	__zs = numpy.asarray(zs,dtype=float)
+	__p = numpy.sqrt(numpy.maximum(2.0*(math.e*__zs + 1.0),0.0))
+	__ws = numpy.where(__zs < -0.3,-1.0 + __p - (__p*__p)/3.0 + (11.0/72.0)*__p*__p*__p,__zs)
+	for __i1 in range(50):
+		__ews = numpy.exp(__ws)
+		__fs = __ws*__ews - __zs
+		__atBranchPoint = ((__ws + 1.0) <= 0.0)
+		__wsPlus1 = numpy.where(__atBranchPoint,1.0,__ws + 1.0)
+		__steps = numpy.where(__atBranchPoint,0.0,__fs / (__ews*__wsPlus1 - (__ws + 2.0)*__fs/(2.0*__wsPlus1)))
+		__ws = numpy.where(__atBranchPoint,-1.0,__ws - __steps)
+		if numpy.all(numpy.abs(__steps) <= 1.0e-15*(1.0 + numpy.abs(__ws))):
+			break
+	return __ws
+
+def case_group_ids(code1s,code2s):
+	"""A function to return the case group of each dipole from its codes, 0 for two quarks, 1 for a quark and a gluon and 2 for two gluons."""
+	__gC = particleData.knownParticles.get_code_from_name('gluon')
+	return (numpy.asarray(code1s) == __gC).astype(int) + (numpy.asarray(code2s) == __gC).astype(int)
+
+def process_masks(caseGroupIds):
+	"""A function to return which of the differential cross section Ids 0 to 6 are possible for each dipole's case group."""
+	__masks = numpy.array([[(__id in sudakovs.case_group_cross_section_ids(__caseGroupId)) for __id in range(7)] for __caseGroupId in range(3)])
+	return __masks[caseGroupIds]
+
+def charge_products(code1s,code2s):
+	"""A function to return the magnitude of the product of the charges of each dipole, used for photon emission."""
+	return numpy.array([abs(particleData.knownParticles.get_charge_from_code(int(__code1))*particleData.knownParticles.get_charge_from_code(int(__code2))) for __code1, __code2 in zip(code1s,code2s)],dtype=float)
+
+def calc_cSs_array(S123s,PperpSquareds,ys,chargeProducts):
+	"""A function to return the cross section of every process Id 0 to 6 for each lane, as the columns of an (N,7) array, as sudakovs.calc_cSs."""
+	__alphaSNow = alphaS_array(PperpSquareds)
+	__Pperps, __sqrtS123s = numpy.sqrt(PperpSquareds), numpy.sqrt(S123s)
+	__x1s = 1.0 - (__Pperps*numpy.exp(ys)/__sqrtS123s)
+	__x3s = 1.0 - (__Pperps*numpy.exp(-1.0*ys)/__sqrtS123s)
+	__x2s = (2.0*__Pperps*numpy.cosh(ys))/__sqrtS123s
+	__emissionDenominators = (1.0 - __x1s)*(1.0 - __x3s)
+	__cSs = numpy.empty((S123s.size,7))
+	__cSs[:,0] = ((2.0*__alphaSNow)/(3.0*math.pi))*(((__x1s*__x1s) + (__x3s*__x3s))/__emissionDenominators)
+	__cSs[:,1] = ((3.0*__alphaSNow)/(4.0*math.pi))*(((__x1s*__x1s) + (__x3s*__x3s*__x3s))/__emissionDenominators)
+	__cSs[:,2] = ((3.0*__alphaSNow)/(4.0*math.pi))*(((__x1s*__x1s*__x1s) + (__x3s*__x3s*__x3s))/__emissionDenominators)
+	__splittingRates = ((3.0*__alphaSNow)/(8.0*math.pi))*((((1.0 - __x1s)*(1.0 - __x1s)) + ((1.0 - __x2s)*(1.0 - __x2s)))/(1.0 - __x3s))
+	__cSs[:,3], __cSs[:,4], __cSs[:,5] = __splittingRates, __splittingRates, __splittingRates
+	__cSs[:,6] = ((alphaEM_array(PperpSquareds)*chargeProducts)/(2.0*math.pi))*(((__x1s*__x1s) + (__x3s*__x3s))/__emissionDenominators)
+	return __cSs
+
+def choose_processes(cSs,randomNumbers):
+	"""A function to choose the process Id of each lane, weighted by its cross sections, with one random number per lane, as sudakovs.choose_process."""
+	__cumulative = numpy.cumsum(cSs,axis=1)
+	__cumulative /= __cumulative[:,-1:]
+	return numpy.argmax(randomNumbers[:,numpy.newaxis] < __cumulative,axis=1)
+
+def record_ratios(caseGroupIds,S123s,ratios):
+	"""A function to record the veto ratios of the lanes with sudakovs.overestimates, only going lane by lane where they are needed."""
+	for __lane in numpy.nonzero(ratios > 1.0)[0]: ##Only ratios above 1 are kept.
+		sudakovs.overestimates.record(int(caseGroupIds[__lane]),float(S123s[__lane]),float(ratios[__lane]))
+
+def run_veto_algorithm_array(PperpSquaredMaxs,S123s,caseGroupIds,chargeProducts,code1s,code2s):
+	"""A function to generate a PperpSquared and y for the summed processes of each lane, returning their cross sections and trials too."""
+	##As sudakovs.run_veto_algorithm, with every unresolved lane trying once per pass. Lanes with no emission have NaN.
+	##Lanes that use the trial budget of a solve drop out with no emission, counted as one trial more, as in sudakovs.run_veto_algorithm.
+	__solveBudget, __rngState = trialBudgets.budget.get_solve_budget(), numpy.random.get_state()
+	__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
+	__numLanes = S123s.size
+	__overestimate = overestimatePrimitiveArray(S123s)
+	__prefactors = numpy.array([sudakovs.overestimates.get_prefactor(int(__caseGroupId),float(__S123)) for __caseGroupId, __S123 in zip(caseGroupIds,S123s)],dtype=float)
+	__masks = process_masks(caseGroupIds)
+	__PperpSquaredsMinus1 = numpy.minimum(PperpSquaredMaxs,S123s/4.0) ##The maximum physically possible!
+	__PperpSquareds, __ys, __cSs = numpy.full(__numLanes,numpy.nan), numpy.full(__numLanes,numpy.nan), numpy.zeros((__numLanes,7))
+	__numTrials = numpy.zeros(__numLanes,dtype=int)
+	__lanes = numpy.arange(__numLanes)
+	while (__lanes.size > 0):
+		__numTrials[__lanes] += 1
+		trialBudgets.budget.count_trials(int(__lanes.size))
+		__R1s, __R2s, __R3s = numpy.random.random((3,__lanes.size))
+		__Gs = __overestimate.calc_G(__PperpSquaredsMinus1[__lanes],__lanes)
+		__PperpSquaredis = __overestimate.calc_inv_G(numpy.log(__R1s)/__prefactors[__lanes] + __Gs,__lanes)
+		__PperpSquaredis = numpy.minimum(__PperpSquaredis,__PperpSquaredsMinus1[__lanes]) ##Never higher than the last, even by rounding.
+		__aboveCutOff = (__PperpSquaredis >= __cutOff) ##Lanes below have no emission and drop out.
+		__lanes, __PperpSquaredis, __R2s, __R3s = __lanes[__aboveCutOff], __PperpSquaredis[__aboveCutOff], __R2s[__aboveCutOff], __R3s[__aboveCutOff]
+		__S123is = S123s[__lanes]
+		__ymaxs = rapidity_limits(__S123is,__PperpSquaredis)
+		__yis = __R2s*2.0*__ymaxs - __ymaxs
+		##The cross sections are per dx1*dx3 = dPperp^2*dy/S123, so divide by S123 to compare with g:
+		__gTimesRanges = __S123is*__prefactors[__lanes]*(3.0*alphaS_overestimates(__PperpSquaredis)/(2.0*math.pi*__PperpSquaredis))*__overestimate.calc_h(__PperpSquaredis,__lanes)
+		__cSis = calc_cSs_array(__S123is,__PperpSquaredis,__yis,chargeProducts[__lanes])
+		__ratios = numpy.sum(__cSis*__masks[__lanes],axis=1)*(2.0*__ymaxs) / __gTimesRanges
+		record_ratios(caseGroupIds[__lanes],__S123is,__ratios)
+		__accepted = (__ratios > __R3s)
+		__acceptedLanes = __lanes[__accepted]
+		__PperpSquareds[__acceptedLanes], __ys[__acceptedLanes], __cSs[__acceptedLanes] = __PperpSquaredis[__accepted], __yis[__accepted], __cSis[__accepted]
+		__PperpSquaredsMinus1[__lanes[~__accepted]] = __PperpSquaredis[~__accepted]
+		__lanes = __lanes[~__accepted]
+		__overBudget = (__numTrials[__lanes] == __solveBudget)
+		for __lane in __lanes[__overBudget]:
+			__codes = [int(code1s[__lane]),int(code2s[__lane])]
+			__PperpSquaredRange = [float(PperpSquaredMaxs[__lane]),float(__PperpSquaredsMinus1[__lane])]
+			trialBudgets.budget.exceeded('sudakovArrays',__codes,float(S123s[__lane]),__PperpSquaredRange,__solveBudget,__rngState)
+		__numTrials[__lanes[__overBudget]] += 1
+		trialBudgets.budget.count_trials(int(numpy.count_nonzero(__overBudget)))
+		__lanes = __lanes[~__overBudget]
+	return __PperpSquareds, __ys, __cSs, __numTrials
+
+def solve_array(PperpSquaredMaxs,S123s,code1s,code2s):
+	"""A function to return the next Pperp^2, y, winning process and trials taken for each dipole given, as sudakovs.solve, with NaN where there is no emission."""
+	##Process codes: 0 = stop shower, 1 = gluon emission, 2 = gluon splitting, 3 = photon emission.
+	##A dipole stopped by the trial budget of a solve is given one trial more than the budget.
+	__PperpSquaredMaxs, __S123s = numpy.asarray(PperpSquaredMaxs,dtype=float), numpy.asarray(S123s,dtype=float)
+	__code1s, __code2s = numpy.asarray(code1s,dtype=int), numpy.asarray(code2s,dtype=int)
+	assert ((__PperpSquaredMaxs.shape == __S123s.shape) and (__code1s.shape == __S123s.shape) and (__code2s.shape == __S123s.shape))
+	__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
+	__numLanes = __S123s.size
+	__PperpSquareds, __ys, __processCodes = numpy.full(__numLanes,numpy.nan), numpy.full(__numLanes,numpy.nan), numpy.zeros(__numLanes,dtype=int)
+	__numTrials = numpy.zeros(__numLanes,dtype=int)
+	__caseGroupIds = case_group_ids(__code1s,__code2s)
+	__open = ((__PperpSquaredMaxs >= __cutOff) & (__S123s/4.0 > __cutOff)) ##No phase space above the cut-off otherwise.
+	##Dipoles sudakovs would not solve with the summed veto algorithm are solved there:
+	__byLane = numpy.zeros(__numLanes,dtype=bool)
+	for __lane in numpy.nonzero(__open)[0]:
+		__difCrossSecIds = sudakovs.case_group_cross_section_ids(int(__caseGroupIds[__lane]))
+		if (sudakovs.competitionSolverOn or (sudakovs.find_tables(float(__PperpSquaredMaxs[__lane]),float(__S123s[__lane]),__difCrossSecIds,int(__code1s[__lane]),int(__code2s[__lane])) != None)):
+			__byLane[__lane] = True
+			__eventTrials = trialBudgets.budget.get_event_trials()
+			__PperpSquared, __y, __processCodes[__lane] = sudakovs.solve(float(__PperpSquaredMaxs[__lane]),float(__S123s[__lane]),int(__code1s[__lane]),int(__code2s[__lane]))
+			__numTrials[__lane] = trialBudgets.budget.get_event_trials() - __eventTrials
+			if (__PperpSquared != None):
+				__PperpSquareds[__lane], __ys[__lane] = __PperpSquared, __y
+	__lanes = numpy.nonzero(__open & ~__byLane)[0]
+	if (__lanes.size == 0):
+		return __PperpSquareds, __ys, __processCodes, __numTrials
+	__chargeProducts = numpy.zeros(__lanes.size)
+	__quarkPairs = (__caseGroupIds[__lanes] == 0)
+	__chargeProducts[__quarkPairs] = charge_products(__code1s[__lanes][__quarkPairs],__code2s[__lanes][__quarkPairs])
+	__PperpSquaredis, __yis, __cSis, __numTrials[__lanes] = run_veto_algorithm_array(__PperpSquaredMaxs[__lanes],__S123s[__lanes],__caseGroupIds[__lanes],__chargeProducts,__code1s[__lanes],__code2s[__lanes])
+	__emitted = ~numpy.isnan(__PperpSquaredis)
+	__emittedLanes = __lanes[__emitted]
+	__PperpSquareds[__emittedLanes], __ys[__emittedLanes] = __PperpSquaredis[__emitted], __yis[__emitted]
+	__cSs = __cSis[__emitted]*process_masks(__caseGroupIds[__emittedLanes])
+	__processCodes[__emittedLanes] = processCodesOfIds[choose_processes(__cSs,numpy.random.random(__emittedLanes.size))]
+	##Case group 1 logs its gluon splitting and production cross sections, as in sudakovs.solve_case_group_1:
+	for __cSi, __caseGroupId in zip(__cSis[__emitted],__caseGroupIds[__emittedLanes]):
+		if (__caseGroupId == 1):
+			sudakovs.crossSecsGluSplit.store(float(__cSi[3]))
+			sudakovs.crossSecsGluProd.store(float(__cSi[1]))
+	return __PperpSquareds, __ys, __processCodes, __numTrials
+
+##Classes:##
+
+class overestimatePrimitiveArray(object):
+	"""A class for the primitive G of the overestimate and its inverse for each lane's S123, as sudakovs.overestimatePrimitive."""
+	##Every lane has a piece for each rapidity tangent point, with those beyond its own pieces given no width so they are never chosen.
+	##Methods take the lanes the values given are for, so lanes can drop out of the veto algorithm as they are resolved.
+
+	def __init__(self,S123s):
+		"""A function to initiate the pieces of the primitive for each S123 given."""
+		__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
+		assert numpy.all(S123s/4.0 > __cutOff)
+		self.__aB = sudakovs.alphaS.get_shower_max()*sudakovs.alphaSOverestimateB
+		self.__cutOff = __cutOff
+		self.__C = 3.0 / (2.0*math.pi*sudakovs.alphaSOverestimateB)
+		__lnSs = numpy.log(S123s/__cutOff)[:,numpy.newaxis]
+		__tangentLs = math.log(4.0) + numpy.array(sudakovs.rapidityTangentPoints)
+		__numPieces = 1 + numpy.sum(__tangentLs[numpy.newaxis,:] < __lnSs,axis=1)
+		##Piece i runs down from edge i to edge i + 1 and is tangent at point min(i,last), as in sudakovs.overestimatePrimitive:
+		__edgeLs = numpy.concatenate(([math.log(4.0)],__tangentLs))
+		__pieceTangentLs = numpy.concatenate((__tangentLs,__tangentLs[-1:]))
+		__xs = numpy.exp(0.5*__pieceTangentLs)/2.0
+		__slopes = __xs/numpy.sqrt(__xs*__xs - 1.0)
+		self.__ps = 2.0*numpy.arccosh(__xs) + __slopes*(__lnSs - __pieceTangentLs)
+		self.__qs = numpy.tile(-__slopes,(S123s.size,1))
+		self.__alphas, self.__betas = self.__ps - self.__qs/self.__aB, self.__qs/self.__aB
+		__hasLowEdge = (numpy.arange(__edgeLs.size)[numpy.newaxis,:] + 1 < __numPieces[:,numpy.newaxis])
+		__nextEdgeLs = numpy.concatenate((__edgeLs[1:],__edgeLs[-1:]))
+		self.__lowEdges = numpy.where(__hasLowEdge,S123s[:,numpy.newaxis]*numpy.exp(-__nextEdgeLs),0.0)
+		self.__uHighs = 1.0 + self.__aB*(__lnSs - __edgeLs)
+		__uLows = numpy.where(__hasLowEdge,1.0 + self.__aB*(__lnSs - __nextEdgeLs),self.__uHighs)
+		__pieceGs = self.__C*(self.__alphas*numpy.log(self.__uHighs/__uLows) + self.__betas*(self.__uHighs - __uLows))
+		self.__offsets = -numpy.concatenate((numpy.zeros((S123s.size,1)),numpy.cumsum(__pieceGs,axis=1)[:,:-1]),axis=1)
+		##Pieces past a lane's last never start, so inv_G never reaches them:
+		self.__startOffsets = numpy.where(numpy.arange(__edgeLs.size)[numpy.newaxis,:] < __numPieces[:,numpy.newaxis],self.__offsets,-numpy.inf)
+
+	def find_pieces(self,PperpSquareds,lanes):
+		"""A function to return the index of the piece containing each PperpSquared."""
+		return numpy.sum(PperpSquareds[:,numpy.newaxis] < self.__lowEdges[lanes],axis=1)
+
+	def calc_h(self,PperpSquareds,lanes):
+		"""A function to calculate the overestimate, h, of the allowed rapidity range at each PperpSquared."""
+		__pieces = self.find_pieces(PperpSquareds,lanes)
+		return self.__ps[lanes,__pieces] + self.__qs[lanes,__pieces]*numpy.log(PperpSquareds/self.__cutOff)
+
+	def calc_G(self,PperpSquareds,lanes):
+		"""A function to calculate G, the primitive of g1(PperpSquared)*h(PperpSquared), at each PperpSquared."""
+		__pieces = self.find_pieces(PperpSquareds,lanes)
+		__us, __uHighs = 1.0 + self.__aB*numpy.log(PperpSquareds/self.__cutOff), self.__uHighs[lanes,__pieces]
+		return self.__offsets[lanes,__pieces] - self.__C*(self.__alphas[lanes,__pieces]*numpy.log(__uHighs/__us) + self.__betas[lanes,__pieces]*(__uHighs - __us))
+
+	def calc_inv_G(self,valuesIn,lanes):
+		"""A function to calculate the inverse of G for each value given."""
+		__pieces = numpy.sum(valuesIn[:,numpy.newaxis] < self.__startOffsets[lanes,1:],axis=1)
+		__alphas, __betas, __uHighs = self.__alphas[lanes,__pieces], self.__betas[lanes,__pieces], self.__uHighs[lanes,__pieces]
+		##alpha*ln(u) + beta*u = w rearranges to (beta*u/alpha)*exp(beta*u/alpha) = (beta/alpha)*exp(w/alpha):
+		__ws = (valuesIn - self.__offsets[lanes,__pieces])/self.__C + __alphas*numpy.log(__uHighs) + __betas*__uHighs
+		__ss = __betas/__alphas
+		__zs = numpy.maximum(__ss*numpy.exp(__ws/__alphas),-1.0/math.e)
+		__us = lambert_w0_array(__zs)/__ss
+		##At the pole of the overestimate coupling, far below the cut-off, give 0:
+		return numpy.where(__us <= 0.0,0.0,self.__cutOff*numpy.exp((numpy.maximum(__us,0.0) - 1.0)/self.__aB))
+
+##Module test code:##
+if __name__ == "__main__":
+	##Import modules required for testing:##
+	import random
+
+	##Begin testing:##
+	print "\n----------------------------------------------------------------------"
+	print "----------------------------------------------------------------------\n"
+	print "//////////////////////////////"
+	print "Testing sudakovArrays module:"
+	print "//////////////////////////////"
+	assertions.pause(__name__)
+
+	##Setup here:##
+	print "\nGenerating test values..."
+	tMz = particleData.knownParticles.get_mass_from_code(particleData.knownParticles.get_code_from_name('Z-boson'))
+	tS123s = numpy.array([tMz*tMz,1000.0,100.0,10.0,5.0])
+	tPperpSquareds = tS123s/(4.0*numpy.array([1.0,2.0,5.0,1.5,1.1]))
+	print "S123s:", tS123s
+	print "PperpSquareds:", tPperpSquareds
+
+	##Test overestimatePrimitiveArray:##
+	print "\n--------------------------------------------------\n"
+	print "Testing overestimatePrimitiveArray against sudakovs.overestimatePrimitive:\n"
+	tSuccessful = True
+	tOverestimate = overestimatePrimitiveArray(tS123s)
+	tLanes = numpy.arange(tS123s.size)
+	tGs = tOverestimate.calc_G(tPperpSquareds,tLanes)
+	for tLane in tLanes:
+		tScalar = sudakovs.overestimatePrimitive(tS123s[tLane])
+		print "S123", tS123s[tLane], "G:", tGs[tLane], "scalar G:", tScalar.calc_G(tPperpSquareds[tLane])
+		if (abs(tGs[tLane] - tScalar.calc_G(tPperpSquareds[tLane])) > 1.0e-9*(1.0 + abs(tGs[tLane]))):
+			tSuccessful = False
+	tInvGs = tOverestimate.calc_inv_G(tGs - 1.0,tLanes)
+	for tLane in tLanes:
+		tScalarInvG = sudakovs.overestimatePrimitive(tS123s[tLane]).calc_inv_G(tGs[tLane] - 1.0)
+		print "S123", tS123s[tLane], "inverse of G - 1:", tInvGs[tLane], "scalar:", tScalarInvG
+		if (abs(tInvGs[tLane] - tScalarInvG) > 1.0e-9*(1.0 + abs(tScalarInvG))):
+			tSuccessful = False
+	if tSuccessful:
+		print "\nTest successful!"
+	else:
+		print "\nTest failed!"
+	print "\nFinished testing overestimatePrimitiveArray."
+	assertions.pause(__name__)
+
+	##Test calc_cSs_array:##
+	print "\n--------------------------------------------------\n"
+	print "Testing calc_cSs_array against sudakovs.calc_cSs:\n"
+	tSuccessful = True
+	tYs = numpy.array([0.5*random.uniform(-1.0,1.0)*sudakovs.calc_rapidity_limit(tS123,tPperpSquared) for tS123, tPperpSquared in zip(tS123s,tPperpSquareds)])
+	tCSs = calc_cSs_array(tS123s,tPperpSquareds,tYs,numpy.full(tS123s.size,2.0/9.0))
+	for tLane in tLanes:
+		tScalarCSs = sudakovs.calc_cSs(range(7),tS123s[tLane],tPperpSquareds[tLane],tYs[tLane],2,-1)
+		print "S123", tS123s[tLane], "cross sections:", tCSs[tLane]
+		if not numpy.allclose(tCSs[tLane],tScalarCSs,rtol=1.0e-9):
+			tSuccessful = False
+	if tSuccessful:
+		print "\nTest successful!"
+	else:
+		print "\nTest failed!"
+	print "\nFinished testing calc_cSs_array."
+	assertions.pause(__name__)
+
+	##Test solve_array:##
+	print "\n--------------------------------------------------\n"
+	print "Testing solve_array:\n"
+	tNumLanes = 2000
+	tPperpSquareds, tYs, tProcessCodes, tNumTrials = solve_array(numpy.full(tNumLanes,tMz*tMz),numpy.full(tNumLanes,tMz*tMz),numpy.full(tNumLanes,2),numpy.full(tNumLanes,-2))
+	tEmitted = ~numpy.isnan(tPperpSquareds)
+	print "For", tNumLanes, "qqBar dipoles at the Z pole,", numpy.mean(~tEmitted), "had no emission and the mean ln(Pperp^2) was", numpy.mean(numpy.log(tPperpSquareds[tEmitted]))
+	tScalarResults = [sudakovs.solve(tMz*tMz,tMz*tMz,2,-2) for tLane in range(tNumLanes)]
+	tScalarPperpSquareds = [tResult[0] for tResult in tScalarResults if (tResult[0] != None)]
+	print "Solving one by one,", 1.0 - len(tScalarPperpSquareds)/float(tNumLanes), "had no emission and the mean ln(Pperp^2) was", numpy.mean(numpy.log(tScalarPperpSquareds))
+	print "\nFinished testing solve_array."
+	assertions.pause(__name__)
+
+	##Done testing:##
+	print "\n---------------------------------------------\n"
+	print "///////////////////////////////////////"
+	print "Finished checking sudakovArrays module!"
+	print "///////////////////////////////////////"
@@ -0,0 +1,320 @@
+####~~ PyShower 1.0 ~~####
+###Copyright 2015/16, Daniel Osborne, All Rights Reserved###
+##Durham Thesis: 'Simulations for Particle Physics: Implementing the Colour Dipole Model with Invariant Transverse Momentum Ordering'.##
+##For: MPhys Theoretical Physics.##
+
+"""A module for tabulating the dipole Sudakov form factors so the next emission can be sampled without the veto algorithm."""
+
+##For a dipole of a given S123 the tables hold I(Pperp^2) = int_{Pperp^2}^{S123/4} dPperp'^2 int dy sum(cSs)/S123,
+##so the no-emission probability from PperpSquaredMax down to Pperp^2 is exp(-(I(Pperp^2) - I(PperpSquaredMax))),
+##and the cumulative distribution of y at each Pperp^2 in terms of w = (y + yMax)/(2*yMax).
+##The grid is uniform in ln(S123) and in v = ln(Pperp^2/cutOff^2)/ln(S123/(4*cutOff^2)), so every S123 has the same number of Pperp^2 points.
+##Tables hold for the cut-off, couplings and process switches they were built with, so are for production samples with fixed settings.
+
+##Import required modules:##
+import random
+import math
+import numpy
+import assertions
+import constants
+import particleData
+import sudakovs
+
+print "\n/////////////////////////////"
+print "Loading sudakovTables module:"
+print "/////////////////////////////\n"
+
+##Functions:##
+
+def check_is_sudakovTable(toCheck):
+	"""A function to check for an instance of the sudakovTable class."""
+	return isinstance(toCheck,sudakovTable)
+
+def check_is_sudakovTableSet(toCheck):
+	"""A function to check for an instance of the sudakovTableSet class."""
+	return isinstance(toCheck,sudakovTableSet)
+
+def check_is_firstEmissionCache(toCheck):
+	"""A function to check for an instance of the firstEmissionCache class."""
+	return isinstance(toCheck,firstEmissionCache)
+
+def table_key(difCrossSecIds,code1,code2):
+	"""A function to return the key of the table for a set of processes, including the charges when photon emission is one of them."""
+	assert (type(difCrossSecIds) == list)
+	if (6 in difCrossSecIds):
+		__charge1 = particleData.knownParticles.get_charge_from_code(code1)
+		__charge2 = particleData.knownParticles.get_charge_from_code(code2)
+		return (tuple(difCrossSecIds),int(round(9.0*abs(__charge1*__charge2))))
+	return (tuple(difCrossSecIds),0)
+
+def ks_distance(samples1,samples2):
+	"""A function to return the largest difference between the empirical cumulative distributions of two samples."""
+	__samples1, __samples2 = numpy.sort(numpy.asarray(samples1,dtype=float)), numpy.sort(numpy.asarray(samples2,dtype=float))
+	if ((__samples1.size == 0) or (__samples2.size == 0)):
+		return 0.0
+	__all = numpy.concatenate((__samples1,__samples2))
+	__cdf1 = numpy.searchsorted(__samples1,__all,side='right')/float(__samples1.size)
+	__cdf2 = numpy.searchsorted(__samples2,__all,side='right')/float(__samples2.size)
+	return float(numpy.max(numpy.abs(__cdf1 - __cdf2)))
+
+##Classes:##
+
+class sudakovTable(object):
+	"""A class for the tabulated Sudakov form factor and rapidity distributions of one type of dipole."""
+
+	def __init__(self,difCrossSecIds,code1,code2,maxS123,numS123 = 24,numPperpSquared = 96,numY = 32):
+		"""A function to build the tables for the processes given up to maxS123, with the grid sizes given setting the accuracy."""
+		assert (type(difCrossSecIds) == list)
+		assert assertions.all_are_numbers([maxS123])
+		assert ((type(numS123) == int) and (type(numPperpSquared) == int) and (type(numY) == int))
+		assert ((numS123 > 1) and (numPperpSquared > 1) and (numY > 1))
+		self.__difCrossSecIds, self.__code1, self.__code2 = list(difCrossSecIds), code1, code2
+		self.__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
+		assert (maxS123 > 4.0*self.__cutOff)
+		self.__maxS123 = float(maxS123)
+		self.__lnS123s = numpy.linspace(math.log(4.0*self.__cutOff),math.log(self.__maxS123),numS123)
+		self.__vs = numpy.linspace(0.0,1.0,numPperpSquared)
+		self.__ws = numpy.linspace(0.0,1.0,numY)
+		self.__integrals = numpy.zeros((numS123,numPperpSquared))
+		self.__yCDFs = numpy.zeros((numS123,numPperpSquared,numY))
+		for __iS, __lnS123 in enumerate(self.__lnS123s):
+			self.fill_row(__iS,math.exp(__lnS123))
+
+	def fill_row(self,iS,S123):
+		"""A function to fill the tables for one S123 of the grid."""
+		__lnPMin, __lnPMax = math.log(self.__cutOff), math.log(S123/4.0)
+		__densities = numpy.zeros(self.__vs.size) ##dI/dln(Pperp^2).
+		for __j, __v in enumerate(self.__vs):
+			__PperpSquared = math.exp(__lnPMin + __v*(__lnPMax - __lnPMin))
+			__yMax = sudakovs.calc_rapidity_limit(S123,__PperpSquared)
+			if (__yMax <= 0.0): ##At the kinematic limit there is no y-range.
+				self.__yCDFs[iS,__j] = self.__ws
+				continue
+			__ys = -__yMax + 2.0*__yMax*self.__ws
+			__rates = numpy.array([sum(sudakovs.calc_cSs(self.__difCrossSecIds,S123,__PperpSquared,float(__y),self.__code1,self.__code2)) for __y in __ys])
+			__cumulative = numpy.concatenate(([0.0],numpy.cumsum(0.5*(__rates[1:] + __rates[:-1])*(__ys[1:] - __ys[:-1]))))
+			__densities[__j] = __PperpSquared*__cumulative[-1]/S123
+			self.__yCDFs[iS,__j] = __cumulative/__cumulative[-1]
+		##Integrate down from the kinematic limit, where I = 0:
+		__dLnP = (__lnPMax - __lnPMin)*(self.__vs[1] - self.__vs[0])
+		__steps = 0.5*(__densities[1:] + __densities[:-1])*__dLnP
+		self.__integrals[iS,:-1] = numpy.cumsum(__steps[::-1])[::-1]
+
+	def covers(self,S123):
+		"""A function to return whether a dipole S123 is inside the tables and they still match the cut-off in use."""
+		return ((S123 <= self.__maxS123) and (self.__cutOff == constants.cut_off_energy()*constants.cut_off_energy()))
+
+	def get_max_S123(self):
+		"""A function to return the largest S123 the tables were built for."""
+		return self.__maxS123
+
+	def get_process_ids(self):
+		"""A function to return the differential cross section Ids the tables were built for."""
+		return list(self.__difCrossSecIds)
+
+	def get_codes(self):
+		"""A function to return the particle codes the tables were built with."""
+		return [self.__code1,self.__code2]
+
+	def solve(self,PperpSquaredMax,S123,code1,code2):
+		"""A function to sample the next Pperp^2, y and process by inverting the tabulated distributions."""
+		##The process is still chosen from the exact cross sections at the sampled point, as in sudakovs.solve_sudakovs.
+		assert assertions.all_are_numbers([PperpSquaredMax,S123])
+		assert self.covers(S123)
+		if ((PperpSquaredMax < self.__cutOff) or (S123/4.0 < self.__cutOff)):
+			return None, None, None
+		##Interpolate the integral between the two nearest S123 rows:
+		__x = (math.log(S123) - self.__lnS123s[0])/(self.__lnS123s[1] - self.__lnS123s[0])
+		__iS = min(max(int(__x),0),self.__lnS123s.size - 2)
+		__f = min(max(__x - __iS,0.0),1.0)
+		__column = (1.0 - __f)*self.__integrals[__iS] + __f*self.__integrals[__iS + 1]
+		__lnPMin, __lnPMax = math.log(self.__cutOff), math.log(S123/4.0)
+		__PperpSquaredMax = min(float(PperpSquaredMax),S123/4.0)
+		__vMax = (math.log(__PperpSquaredMax) - __lnPMin)/(__lnPMax - __lnPMin)
+		__R1 = random.random()
+		__target = float(numpy.interp(__vMax,self.__vs,__column)) - math.log(__R1)
+		if (__target >= __column[0]): ##No emission above the cut-off.
+			return None, None, None
+		__k = int(numpy.searchsorted(-__column,-__target))
+		__k = min(max(__k,1),self.__vs.size - 1)
+		__v = self.__vs[__k - 1] + (self.__vs[__k] - self.__vs[__k - 1])*(__column[__k - 1] - __target)/(__column[__k - 1] - __column[__k])
+		__PperpSquared = min(math.exp(__lnPMin + __v*(__lnPMax - __lnPMin)),__PperpSquaredMax)
+		##Interpolate the y distribution between the four nearest grid points:
+		__jf = __v*(self.__vs.size - 1)
+		__j = min(max(int(__jf),0),self.__vs.size - 2)
+		__g = min(max(__jf - __j,0.0),1.0)
+		__cdf = (1.0 - __f)*((1.0 - __g)*self.__yCDFs[__iS,__j] + __g*self.__yCDFs[__iS,__j + 1])
+		__cdf += __f*((1.0 - __g)*self.__yCDFs[__iS + 1,__j] + __g*self.__yCDFs[__iS + 1,__j + 1])
+		__R2 = random.random()
+		__w = float(numpy.interp(__R2,__cdf,self.__ws))
+		__yMax = sudakovs.calc_rapidity_limit(S123,__PperpSquared)
+		__y = -__yMax + 2.0*__yMax*__w
+		__cSs = sudakovs.calc_cSs(self.__difCrossSecIds,S123,__PperpSquared,__y,code1,code2)
+		return __PperpSquared, __y, sudakovs.choose_process(self.__difCrossSecIds,__cSs)
+
+class sudakovTableSet(object):
+	"""A class for the Sudakov tables of every type of dipole in a shower, which can be given to sudakovs.set_sudakov_tables."""
+
+	def __init__(self,activeQCodes,maxS123,numS123 = 24,numPperpSquared = 96,numY = 32):
+		"""A function to build the tables for each case group, and each charge combination for photon emission, up to maxS123."""
+		assert (type(activeQCodes) == list)
+		for __qCode in activeQCodes:
+			assert __qCode in particleData.knownParticles.get_known_quarks()
+		__gC = particleData.knownParticles.get_code_from_name('gluon')
+		__codePairs = [[__qCode1,-__qCode2] for __qCode1 in activeQCodes for __qCode2 in activeQCodes]
+		__codePairs += [[activeQCodes[0],__gC],[__gC,__gC]]
+		self.__tables = {}
+		for __code1, __code2 in __codePairs:
+			if (__code2 == __gC):
+				__difCrossSecIds = sudakovs.case_group_cross_section_ids(1 if (__code1 != __gC) else 2)
+			else:
+				__difCrossSecIds = sudakovs.case_group_cross_section_ids(0)
+			__key = table_key(__difCrossSecIds,__code1,__code2)
+			if not (__key in self.__tables):
+				self.__tables[__key] = sudakovTable(__difCrossSecIds,__code1,__code2,maxS123,numS123,numPperpSquared,numY)
+
+	def covers(self,difCrossSecIds,S123,code1,code2):
+		"""A function to return whether there is a table for a dipole."""
+		__key = table_key(difCrossSecIds,code1,code2)
+		return ((__key in self.__tables) and self.__tables[__key].covers(S123))
+
+	def solve(self,PperpSquaredMax,S123,difCrossSecIds,code1,code2):
+		"""A function to sample the next Pperp^2, y and process for a dipole from its table."""
+		return self.__tables[table_key(difCrossSecIds,code1,code2)].solve(PperpSquaredMax,S123,code1,code2)
+
+	def validate(self,numSamples = 2000):
+		"""A function to compare sampling from each table with the veto algorithm in sudakovs and print a report."""
+		##Compares the no-emission fraction, mean ln(Pperp^2) and mean |y| and the largest difference in the Pperp^2 distributions (KS distance).
+		assert ((type(numSamples) == int) and (numSamples > 0))
+		__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
+		__tablesInUse = sudakovs.sudakovTablesInUse
+		__results = []
+		print "\n-------------------------------"
+		print "Sudakov table validation report:"
+		print "-------------------------------"
+		print "(KS distances up to about", 1.36*math.sqrt(2.0/numSamples), "are expected from statistics alone.)"
+		for __key in sorted(self.__tables.keys()):
+			__table = self.__tables[__key]
+			__code1, __code2 = __table.get_codes()
+			for __S123 in [__table.get_max_S123(),__table.get_max_S123()/10.0,__table.get_max_S123()/100.0]:
+				if (__S123 <= 16.0*__cutOff):
+					continue
+				__samples = {}
+				for __method in ['table','veto']:
+					__PperpSquareds, __ys, __none = [], [], 0
+					for __i1 in range(numSamples):
+						if (__method == 'table'):
+							__PperpSquared, __y, __id = __table.solve(__S123/4.0,__S123,__code1,__code2)
+						else:
+							sudakovs.set_sudakov_tables(None)
+							try:
+								__PperpSquared, __y, __id = sudakovs.solve_sudakovs(__S123/4.0,__S123,__table.get_process_ids(),__code1,__code2)
+							finally:
+								sudakovs.set_sudakov_tables(__tablesInUse)
+						if (__PperpSquared == None):
+							__none += 1
+						else:
+							__PperpSquareds.append(math.log(__PperpSquared))
+							__ys.append(abs(__y))
+					__samples[__method] = [__none/float(numSamples),numpy.mean(__PperpSquareds) if __PperpSquareds else 0.0,numpy.mean(__ys) if __ys else 0.0,__PperpSquareds]
+				__ks = ks_distance(__samples['table'][3],__samples['veto'][3])
+				__results.append([__key,__S123,__samples['table'][:3],__samples['veto'][:3],__ks])
+				print "\nProcesses", list(__key[0]), "charge key", __key[1], "at S123 =", __S123
+				print "No emission fraction, table:", __samples['table'][0], "veto:", __samples['veto'][0]
+				print "Mean ln(Pperp^2), table:", __samples['table'][1], "veto:", __samples['veto'][1]
+				print "Mean |y|, table:", __samples['table'][2], "veto:", __samples['veto'][2]
+				print "KS distance of ln(Pperp^2):", __ks
+		return __results
+
+class firstEmissionCache(object):
+	"""A class for tables of the first emission of dipoles whose S123 and codes repeat from event to event, as in fixed energy e+e- samples."""
+
+	def __init__(self,minRepeats = 3,numPperpSquared = 128,numY = 48,maxTracked = 64):
+		"""A function to initiate an empty cache, which builds a table once the same starting dipole has been seen minRepeats times."""
+		##Each table has a single S123 so is finer than a sudakovTableSet for the same cost. Once more than maxTracked..
+		##..different dipoles are waiting the least recently seen that haven't repeated are forgotten, so samples with..
+		##..varying S123 build nothing while a starting dipole that repeats keeps its count among one-off dipoles.
+		##Building a table takes about 1 s and saves about 0.4 ms a first emission, so only pays after ~2500 events per table.
+		assert ((type(minRepeats) == int) and (minRepeats > 0))
+		assert ((type(numPperpSquared) == int) and (type(numY) == int) and (type(maxTracked) == int))
+		self.__minRepeats, self.__maxTracked = minRepeats, maxTracked
+		self.__numPperpSquared, self.__numY = numPperpSquared, numY
+		self.__counts = {} ##The number of times each dipole has been seen and when it was last seen.
+		self.__numCounted = 0
+		self.__tables = {}
+
+	def get_key(self,difCrossSecIds,S123,code1,code2):
+		"""A function to return the key of a starting dipole, with S123 rounded to allow for rounding in its momenta."""
+		return (table_key(difCrossSecIds,code1,code2),round(S123,6))
+
+	def covers(self,difCrossSecIds,S123,code1,code2):
+		"""A function to return whether there is a table for a starting dipole, counting it and building one if it has repeated enough."""
+		__key = self.get_key(difCrossSecIds,S123,code1,code2)
+		if (__key in self.__tables):
+			return self.__tables[__key].covers(S123)
+		if (S123/4.0 <= constants.cut_off_energy()*constants.cut_off_energy()):
+			return False
+		self.__numCounted += 1
+		__count = self.__counts.get(__key,[0,0])[0] + 1
+		self.__counts[__key] = [__count,self.__numCounted]
+		if (__count < self.__minRepeats):
+			if (len(self.__counts) > self.__maxTracked):
+				self.forget_counts()
+			return False
+		del self.__counts[__key]
+		##The top of the table is kept just above S123 so later events rounding up are still covered:
+		self.__tables[__key] = sudakovTable(difCrossSecIds,code1,code2,S123*(1.0 + 1.0e-9),2,self.__numPperpSquared,self.__numY)
+		return self.__tables[__key].covers(S123)
+
+	def forget_counts(self):
+		"""A function to forget the least recently seen dipoles that haven't repeated, down to half the number that may be tracked."""
+		##If every dipole waiting has repeated the least recently seen of them are forgotten instead, so the counts stay bounded.
+		__forgettable = [(__seen,__key) for __key, (__count,__seen) in self.__counts.items() if (__count == 1)]
+		if not __forgettable:
+			__forgettable = [(__seen,__key) for __key, (__count,__seen) in self.__counts.items()]
+		for __seen, __key in sorted(__forgettable)[:len(self.__counts) - self.__maxTracked/2]:
+			del self.__counts[__key]
+
+	def solve(self,PperpSquaredMax,S123,difCrossSecIds,code1,code2):
+		"""A function to sample the first Pperp^2, y and process for a starting dipole from its table."""
+		return self.__tables[self.get_key(difCrossSecIds,S123,code1,code2)].solve(PperpSquaredMax,S123,code1,code2)
+
+	def number_tables(self):
+		"""A function to return the number of starting dipoles with a table."""
+		return len(self.__tables)
+
+##Module test code:##
+if __name__ == "__main__":
+	##Begin testing:##
+	print "\n----------------------------------------------------------------------"
+	print "----------------------------------------------------------------------\n"
+	print "//////////////////////////////"
+	print "Testing sudakovTables module:"
+	print "//////////////////////////////"
+	assertions.pause(__name__)
+
+	##Setup here:##
+	tMz = particleData.knownParticles.get_mass_from_code(particleData.knownParticles.get_code_from_name('Z-boson'))
+	print "\nBuilding tables up to S123 = Mz^2..."
+	tTables = sudakovTableSet(constants.active_q_codes(),tMz*tMz)
+
+	##Test sudakovTableSet.validate:##
+	print "\n--------------------------------------------------\n"
+	print "Testing sudakovTableSet.validate:\n"
+	tResults = tTables.validate(2000)
+	tSuccessful = True
+	for tResult in tResults:
+		if (tResult[4] > 2.0*1.36*math.sqrt(2.0/2000)):
+			tSuccessful = False
+	if tSuccessful:
+		print "\nTest successful!"
+	else:
+		print "\nTest failed!"
+	print "\nFinished testing sudakovTableSet.validate."
+	assertions.pause(__name__)
+
+	##Done testing:##
+	print "\n---------------------------------------------\n"
+	print "///////////////////////////////////////"
+	print "Finished checking sudakovTables module!"
+	print "///////////////////////////////////////"
@@ -17,6 +17,7 @@ import dataLoggers
 import particleData
 import runningCouplings
 import kinematics
+import trialBudgets
 
 print "\n///////////////////////"
 print "Loading sudakov module:"
@@ -26,19 +27,62 @@ print "///////////////////////\n"
 alphaS = runningCouplings.oneLoopAlphaS()
 alphaEM = runningCouplings.oneLoopAlphaEM()
 
+##Running of the overestimate coupling, using the smallest beta0 of any number of flavours so it never falls below alphaS:##
+alphaSOverestimateB = runningCouplings.beta0(len(particleData.knownParticles.get_known_quarks())) / (4.0*math.pi)
+
+##Values of ln(S123/Pperp^2) - ln(4) where the tangents overestimating the allowed rapidity range are taken:##
+rapidityTangentPoints = [0.05,0.2,0.6,1.5,3.5]
+
+##Sudakov solver choice, changed with set_competition_solver:##
+competitionSolverOn = False
+
+##Tabulated Sudakovs to sample from instead of the veto algorithm, set with set_sudakov_tables:##
+sudakovTablesInUse = None
+
+##Tables for the first emission of dipoles that repeat from event to event, set with set_first_emission_cache:##
+firstEmissionCacheInUse = None
+
 ##Initialise data loggers:##
 crossSecsGluSplit = dataLoggers.dataLogger()
 crossSecsGluProd = dataLoggers.dataLogger()
 
 ##Functions:##
 
+def check_is_overestimatePrimitive(toCheck):
+	"""A function to check for an instance of the overestimatePrimitive class."""
+	return isinstance(toCheck,overestimatePrimitive)
+
+def check_is_overestimatePrefactors(toCheck):
+	"""A function to check for an instance of the overestimatePrefactors class."""
+	return isinstance(toCheck,overestimatePrefactors)
+
+def S123_band(S123):
+	"""A function to return the index of the band of S123 values an overestimate prefactor is kept for."""
+	##Bands are a factor of 4 wide, starting from the smallest S123 with phase space above the cut-off.
+	assert assertions.all_are_numbers([S123])
+	__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
+	if (S123 <= 4.0*__cutOff):
+		return 0
+	return int(math.log(S123/(4.0*__cutOff))/math.log(4.0))
+
+def S123_band_max(band):
+	"""A function to return the largest S123 in a band of S123_band."""
+	assert ((type(band) == int) and (band >= 0))
+	__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
+	return 4.0*__cutOff*math.pow(4.0,band + 1)
+
+def calc_rapidity_limit(S123,PperpSquared):
+	"""A function to calculate the largest magnitude of rapidity allowed for a given PperpSquared."""
+	##Using equation 49 of Initial-state showering based on colour dipoles connected to incoming parton lines.
+	##Limited to 0 at the kinematic limit, Pperp^2 = S123/4, to absorb rounding errors.
+	return math.acosh(max(math.sqrt(S123/PperpSquared)/2.0,1.0))
+
 def check_rapidity_allowed(S123,PperpSquared,y):
 	"""A function to check if the rapidity is in the allowed region of phase space."""
-	##Using equation 49 of Initial-state showering based on colour dipoles connected to incoming parton lines.
 	assert (type(S123) == float)
 	assert (type(PperpSquared) == float)
 	assert (type(y) == float)
-	__yMagMax = math.acosh(math.sqrt(S123/PperpSquared)/2.0)
+	__yMagMax = calc_rapidity_limit(S123,PperpSquared)
 	if (abs(y) > __yMagMax):
 		return False
 	else:
@@ -119,58 +163,107 @@ def qqBar_to_qpqBar_cS(S123,PperpSquared,y,code1,code2): ##difCrossSecId = 6
 	__denominator = (1.0 - __x1)*(1.0 - __x3)
 	return __preFactor*(__numerator/__denominator)
 
-def sum_cSs(difCrossSecIds,S123,PperpSquared,y,code1,code2):
-	"""A function to return the sum of each cross section from its process code in the list given."""
+def calc_cSs(difCrossSecIds,S123,PperpSquared,y,code1,code2):
+	"""A function to return the cross section for each process code in the list given, in the same order, from one evaluation of the point."""
+	##Gives the same values as the separate cross section functions above, but finds the couplings and x values only once.
 	assert (type(difCrossSecIds) == list)
 	assert assertions.all_are_numbers([S123,PperpSquared,y])
 	__kQs = particleData.knownParticles.get_known_quarks()
 	__gC = particleData.knownParticles.get_code_from_name('gluon')
 	__expectedCodes = __kQs + [-x for x in __kQs] + [__gC]
 	assert ((code1 in __expectedCodes) and (code2 in __expectedCodes))
-	__result = 0.0
+	__alphaSNow = alphaS.calculate(PperpSquared)
+	__Pperp, __sqrtS123 = math.sqrt(PperpSquared), math.sqrt(S123)
+	__x1 = 1.0 - (__Pperp*math.exp(y)/__sqrtS123)
+	__x3 = 1.0 - (__Pperp*math.exp((-1.0)*y)/__sqrtS123)
+	__emissionDenominator = (1.0 - __x1)*(1.0 - __x3)
+	__splittingRate = None ##Shared by codes 3, 4 and 5 so only found once.
+	__results = []
 	for __difCrossSecId in difCrossSecIds:
 		assert ((0 <= __difCrossSecId) and (__difCrossSecId <= 6))
 		if __difCrossSecId == 0:
-			__result += qqBar_to_qgqBar_cS(S123,PperpSquared,y)
+			__preFactor = (2.0*__alphaSNow)/(3.0*math.pi)
+			__results.append(__preFactor*(((__x1*__x1) + (__x3*__x3))/__emissionDenominator))
 		elif __difCrossSecId == 1:
-			__result += qg_to_qgg_cS(S123,PperpSquared,y)
+			__preFactor = (3.0*__alphaSNow)/(4.0*math.pi)
+			__results.append(__preFactor*(((__x1*__x1) + (__x3*__x3*__x3))/__emissionDenominator))
 		elif __difCrossSecId == 2:
-			__result += gg_to_ggg_cS(S123,PperpSquared,y)
-		elif __difCrossSecId == 3:
-			__result += qg_to_qQQBar_cS(S123,PperpSquared,y)
-		elif __difCrossSecId == 4:
-			__result += gg_to_gQQBar_cS(S123,PperpSquared,y)
-		elif __difCrossSecId == 5:
-			__result += gg_to_gQQBar_cS(S123,PperpSquared,y)
+			__preFactor = (3.0*__alphaSNow)/(4.0*math.pi)
+			__results.append(__preFactor*(((__x1*__x1*__x1) + (__x3*__x3*__x3))/__emissionDenominator))
+		elif __difCrossSecId in [3,4,5]:
+			if (__splittingRate == None):
+				__x2 = (2.0*__Pperp*math.cosh(y))/__sqrtS123
+				__preFactor = (3.0*__alphaSNow)/(8.0*math.pi)
+				__numerator = ((1.0 - __x1)*(1.0 - __x1)) + ((1.0 - __x2)*(1.0 - __x2))
+				__splittingRate = __preFactor*(__numerator/(1.0 - __x3))
+			__results.append(__splittingRate)
 		elif __difCrossSecId == 6:
-			__result += qqBar_to_qpqBar_cS(S123,PperpSquared,y,code1,code2)
-	return __result
+			__alphaEMNow = alphaEM.calculate(PperpSquared)
+			__charge1 = particleData.knownParticles.get_charge_from_code(code1)
+			__charge2 = particleData.knownParticles.get_charge_from_code(code2)
+			__preFactor = (__alphaEMNow*abs(__charge1)*abs(__charge2))/(2.0*math.pi)
+			__results.append(__preFactor*(((__x1*__x1) + (__x3*__x3))/__emissionDenominator))
+	return __results
+
+def sum_cSs(difCrossSecIds,S123,PperpSquared,y,code1,code2):
+	"""A function to return the sum of each cross section from its process code in the list given."""
+	return sum(calc_cSs(difCrossSecIds,S123,PperpSquared,y,code1,code2))
 
 ##~~Overestimate Functions~~##
 
+##The overestimate coupling runs at one loop from alphaS_max at the cut-off, aOver(Pperp^2) = a/(1 + a*B*ln(Pperp^2/cutOff^2)).
+##The allowed rapidity range, 2*acosh(sqrt(S123/Pperp^2)/2), is concave in L = ln(S123/Pperp^2) so is overestimated by tangents to it.
+##With u = 1 + a*B*ln(Pperp^2/cutOff^2) each tangent, h = p + q*ln(Pperp^2/cutOff^2), gives the primitive C*(alpha*ln(u) + beta*u),
+##where C = 3/(2*Pi*B), alpha = p - q/(a*B) and beta = q/(a*B), which is inverted with the principal branch of the Lambert W function.
+
+def lambert_w0(z):
+	"""A function to calculate the principal branch of the Lambert W function, W0(z) for -1/e <= z <= 0, by Halley's method."""
+	assert assertions.all_are_numbers([z])
+	assert ((-1.0/math.e <= z) and (z <= 0.0))
+	if (z == 0.0):
+		return 0.0
+	if (z < -0.3): ##Series about the branch point at -1/e.
+		__p = math.sqrt(max(2.0*(math.e*z + 1.0),0.0))
+		__w = -1.0 + __p - (__p*__p)/3.0 + (11.0/72.0)*__p*__p*__p
+	else:
+		__w = z
+	for __i1 in range(50):
+		__ew = math.exp(__w)
+		__f = __w*__ew - z
+		__wPlus1 = __w + 1.0
+		if (__wPlus1 <= 0.0): ##At the branch point itself.
+			return -1.0
+		__step = __f / (__ew*__wPlus1 - (__w + 2.0)*__f/(2.0*__wPlus1))
+		__w -= __step
+		if (abs(__step) <= 1.0e-15*(1.0 + abs(__w))):
+			break
+	return __w
+
+def calc_alphaS_overestimate(PperpSquared):
+	"""A function to calculate the one-loop running overestimate of alphaS used by the overestimation function g."""
+	assert assertions.all_are_numbers([PperpSquared])
+	__alphaSMax = alphaS.get_shower_max()
+	__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
+	return __alphaSMax / (1.0 + __alphaSMax*alphaSOverestimateB*math.log(PperpSquared/__cutOff))
+
 def calc_g(PperpSquared,y): ##Calculate the function g(Pperpsquared,y) = g1(Pperpsquared)*g2(y).
 	"""A function to calculate the overestimation function g for all processes."""
 	assert assertions.all_are_numbers([PperpSquared,y])
-	__alphaSMax = alphaS.get_shower_max()
-	return (3.0*__alphaSMax) / (2.0*math.pi*PperpSquared)
+	return (3.0*calc_alphaS_overestimate(PperpSquared)) / (2.0*math.pi*PperpSquared)
 
 def calc_G(PperpSquared,S123):
 	"""A function to calculate the overestimation function G, the primitive of g(PperpSquared) = g1(PperpSquared)*int{g2(y) dy}, for all processes."""
 	assert assertions.all_are_numbers([PperpSquared,S123])
-	__alphaSMax = alphaS.get_shower_max()
-	__term1 = ((-3.0)*__alphaSMax) / (4.0*math.pi)
-	return __term1*math.log(S123/PperpSquared)*math.log(S123/PperpSquared)
+	return overestimatePrimitive(S123).calc_G(PperpSquared)
 
 def calc_inv_G(valueIn,S123):
 	"""A function to calculate the inverse of G for for all processes."""
 	assert assertions.all_are_numbers([valueIn,S123])
-	__alphaSMax = alphaS.get_shower_max()
-	__term1 = ((-4.0)*math.pi*valueIn) / (3.0*__alphaSMax)
-	__exp = math.exp(math.sqrt(__term1))
-	return S123/__exp
+	return overestimatePrimitive(S123).calc_inv_G(valueIn)
 
 def calc_G2(y):
 	"""A function to calculate the overestimation function G2, the primitive of g2, for all processes."""
+	##Uniform between the exact rapidity limits, so only used inside the allowed region.
 	assert assertions.all_are_numbers([y])
 	return y
 
@@ -181,55 +274,108 @@ def calc_inv_G2(valueIn):
 
 ##~~Top Functions~~##
 
-def solve_sudakovs(PperpSquaredMax,S123,difCrossSecIds,code1,code2,logCrosSecs = None):
-	"""A function to generate a PperpSquared and y for an emission or splitting, using the Sudakov form factor."""
-	##Codes 1,2 still needed to get the charges for EM radiation.
+def set_competition_solver(on):
+	"""A function to set whether each process has its own Sudakov trial sequence, in competition, instead of one summed veto."""
+	global competitionSolverOn
+	assert (type(on) == bool)
+	competitionSolverOn = on
+
+def set_sudakov_tables(tables):
+	"""A function to set the tabulated Sudakovs (e.g. a sudakovTables.sudakovTableSet) to sample from where they cover a dipole, or None for the veto algorithm."""
+	global sudakovTablesInUse
+	sudakovTablesInUse = tables
+
+def set_first_emission_cache(cache):
+	"""A function to set the first emission cache (e.g. a sudakovTables.firstEmissionCache) to sample from when a dipole starts from its full phase space, or None."""
+	global firstEmissionCacheInUse
+	firstEmissionCacheInUse = cache
+
+def find_tables(PperpSquaredMax,S123,difCrossSecIds,code1,code2):
+	"""A function to return the tables in use that cover a dipole, or None if it is solved with the veto algorithm."""
+	##A dipole starting from its full phase space, as the first of each event does, may have a first emission table.
+	if ((firstEmissionCacheInUse != None) and (PperpSquaredMax >= S123/4.0) and firstEmissionCacheInUse.covers(difCrossSecIds,S123,code1,code2)):
+		return firstEmissionCacheInUse
+	if ((sudakovTablesInUse != None) and sudakovTablesInUse.covers(difCrossSecIds,S123,code1,code2)):
+		return sudakovTablesInUse
+	return None
+
+def calc_process_prefactor(difCrossSecId,S123,code1,code2):
+	"""A function to return the prefactor of g bounding a single process, used by the competition solver."""
+	##Relative to g the gluon emission ratios are prefactor*(alphaS/aOver)*numerator*(range/h) with numerator <= 2,
+	##and the splitting ratio is (3/8Pi)/(3/2Pi)*(1 - x1)*((1 - x1)^2 + (1 - x2)^2) <= 1/4 as x1 + x2 >= 1.
+	##alphaEM grows and aOver falls with PperpSquared, so both are taken at the kinematic limit for photon emission.
+	assert ((0 <= difCrossSecId) and (difCrossSecId <= 6))
+	if (difCrossSecId == 0):
+		return 8.0/9.0
+	elif (difCrossSecId in [1,2]):
+		return 1.0
+	elif (difCrossSecId in [3,4,5]):
+		return 0.25
+	__charge1 = particleData.knownParticles.get_charge_from_code(code1)
+	__charge2 = particleData.knownParticles.get_charge_from_code(code2)
+	__alphaEMMax = alphaEM.calculate(S123/4.0)
+	return (2.0*__alphaEMMax*abs(__charge1)*abs(__charge2)) / (3.0*calc_alphaS_overestimate(S123/4.0))
+
+def calc_case_group_prefactor(caseGroupId,S123):
+	"""A function to return the prefactor of g bounding the summed processes of a case group for any dipole up to S123, at most 1."""
+	##The sum of the single process bounds of calc_process_prefactor, taking the largest quark charges for photon emission.
+	##Photon emission's bound grows with S123, so S123 should be the largest in the range it is used for.
+	__kQs = particleData.knownParticles.get_known_quarks()
+	__maxChargeCode = max(__kQs,key=lambda __code: abs(particleData.knownParticles.get_charge_from_code(__code)))
+	__prefactors = [calc_process_prefactor(__id,S123,__maxChargeCode,__maxChargeCode) for __id in case_group_cross_section_ids(caseGroupId)]
+	return min(sum(__prefactors),1.0)
+
+def run_veto_algorithm(PperpSquaredMax,S123,difCrossSecIds,code1,code2,prefactor,overestimate,caseGroupId = None):
+	"""A function to generate a PperpSquared and y for the summed processes given, returning their cross sections there too."""
 	##Using veto algorithm in "PYTHIA 6.0 Physics and Manual".
 	##And p198 of "Monte Carlo simulations of hard QCD radiation" for bivariant algorithm.
 	##And p16 of "Initial-state showering based on colour dipoles connected to incoming parton lines" for real y limits.
-	##And p5 of "Fooling around with the Sudakov veto algorithm" for multiple emission form.
-	assert assertions.all_are_numbers([PperpSquaredMax,S123])
-	assert (type(difCrossSecIds) == list)
-	__kQs = particleData.knownParticles.get_known_quarks()
-	__gC = particleData.knownParticles.get_code_from_name('gluon')
-	__expectedCodes = __kQs + [-x for x in __kQs] + [__gC]
-	assert ((code1 in __expectedCodes) and (code2 in __expectedCodes))
+	##The overestimate is g scaled by the prefactor, so G is scaled too and inverted with the log divided through.
+	##The y-range is exact, so g covers an overestimate of it, h, and the veto ratio is weighted by the true range over h.
+	##Gives no emission once the trial budget of the solve is used, with the random state it began from kept to reproduce it.
+	assert check_is_overestimatePrimitive(overestimate)
 	__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
-	if (PperpSquaredMax < __cutOff):
-		return None, None, None
-	__notChosen1, __y, __PperpSquaredi = True, 0, assertions.force_float_number(PperpSquaredMax)
-	__PperpSquarediMinus1 = __PperpSquaredi
+	__notChosen1 = True
+	__PperpSquarediMinus1 = min(assertions.force_float_number(PperpSquaredMax),S123/4.0) ##The maximum physically possible!
+	__solveBudget, __rngState = trialBudgets.budget.get_solve_budget(), random.getstate()
+	__numTrials = 0
 	while __notChosen1: ##i += 1
-		__notChosen2 = True
-		while __notChosen2:
-			__R1 = random.random()
-			__PperpSquaredi = calc_inv_G((math.log(__R1) + calc_G(__PperpSquarediMinus1,S123)),S123)
-			if (__PperpSquaredi > S123/4.0): ##The maximum physically possible!
-				__notChosen2 = True
-				__PperpSquarediMinus1 = __PperpSquaredi
-				continue #Re-run the while loop
-			if (__PperpSquaredi <= __PperpSquarediMinus1): ##Don't update __PperpSquaredi if fails as would start allowing higher values!
-				__notChosen2 = False ##Move on
+		if (__numTrials == __solveBudget): ##Counted as one trial more, the one it was stopped before.
+			trialBudgets.budget.count_trials(__numTrials + 1)
+			trialBudgets.budget.exceeded('sudakovs',[code1,code2],S123,[PperpSquaredMax,__PperpSquarediMinus1],__numTrials,__rngState)
+			return None, None, None
+		__numTrials += 1
+		__R1 = random.random()
+		__PperpSquaredi = overestimate.calc_inv_G(math.log(__R1)/prefactor + overestimate.calc_G(__PperpSquarediMinus1))
+		__PperpSquaredi = min(__PperpSquaredi,__PperpSquarediMinus1) ##Never higher than the last, even by rounding.
 		if (__PperpSquaredi < __cutOff):
+			trialBudgets.budget.count_trials(__numTrials)
 			return None, None, None
 		__R2 = random.random()
-		__ymin, __ymax = -0.5*math.log(S123/__PperpSquaredi), 0.5*math.log(S123/__PperpSquaredi)
+		__ymax = calc_rapidity_limit(S123,__PperpSquaredi)
+		__ymin = -__ymax
 		__yi = calc_inv_G2(__R2*(calc_G2(__ymax) - calc_G2(__ymin)) + calc_G2(__ymin))
-		if not check_rapidity_allowed(S123,__PperpSquaredi,__yi): ##Veto incorrect y-range. On the boundary is allowed.
-			__PperpSquarediMinus1 = __PperpSquaredi
-			continue ##Don't accept, notChosen1 == True, while will run again.
 		__R3 = random.random()
-		__numberCSIds = len(difCrossSecIds)
-		__ratio = sum_cSs(difCrossSecIds,S123,__PperpSquaredi,__yi,code1,code2) / __numberCSIds*calc_g(__PperpSquaredi,__yi)
+		##The cross sections are per dx1*dx3 = dPperp^2*dy/S123, so divide by S123 to compare with g:
+		__gTimesRange = S123*prefactor*calc_g(__PperpSquaredi,__yi)*overestimate.calc_h(__PperpSquaredi)
+		__cSs = calc_cSs(difCrossSecIds,S123,__PperpSquaredi,__yi,code1,code2) ##Kept for choosing the process if accepted.
+		__ratio = sum(__cSs)*(__ymax - __ymin) / __gTimesRange
+		if (__ratio > 1.0):
+			overestimates.record(caseGroupId,S123,__ratio)
 		if (__ratio <= __R3):
 			__PperpSquarediMinus1 = __PperpSquaredi
 			continue ##Don't accept, notChosen1 == True, while will run again.
 		else:
 			__notChosen1 = False ##Accept.
+	trialBudgets.budget.count_trials(__numTrials)
+	return __PperpSquaredi, __yi, __cSs
+
+def choose_process(difCrossSecIds,cSs):
+	"""A function to choose which process occurs, weighted by their cross sections at the chosen point."""
 	##Prepare weights for choosing Id of process occuring:
 	__idWeights = {} ##Empty dictionary initiated.
-	for __difCrossSecId in difCrossSecIds: ##Uses the Ids given so will weight for the chosen set.
-		__idWeights[__difCrossSecId] = sum_cSs([__difCrossSecId],S123,__PperpSquaredi,__yi,code1,code2)
+	for __difCrossSecId, __cS in zip(difCrossSecIds,cSs): ##Uses the Ids given so will weight for the chosen set.
+		__idWeights[__difCrossSecId] = __cS
 	__total = sum(__idWeights.itervalues())
 	__idWeights.update((x, y/__total) for x, y in __idWeights.items()) ##Normalise them
 	assert precision.check_numbers_equal(sum(__idWeights.itervalues()),1.0) ##i.e they should now be normalised to 1.
@@ -238,9 +384,6 @@ def solve_sudakovs(PperpSquaredMax,S123,difCrossSecIds,code1,code2,logCrosSecs =
 	__sumSoFar = 0.0
 	__chosenId = None
 	__chosen = False
-	if (logCrosSecs == 1):
-		crossSecsGluSplit.store(qg_to_qQQBar_cS(S123,__PperpSquaredi,__yi))
-		crossSecsGluProd.store(qg_to_qgg_cS(S123,__PperpSquaredi,__yi))
 	for __difCrossSecId in difCrossSecIds:
 		if (not __chosen):
 			__sumSoFar += __idWeights[__difCrossSecId]
@@ -248,8 +391,84 @@ def solve_sudakovs(PperpSquaredMax,S123,difCrossSecIds,code1,code2,logCrosSecs =
 				__chosenId = __difCrossSecId
 				__chosen = True
 	assert (not (__chosenId == None)) ##Should have chosen by now!
+	return __chosenId
+
+def store_cross_sections(S123,PperpSquared,y,difCrossSecIds,cSs,code1,code2):
+	"""A function to log the gluon splitting and production cross sections at a chosen point, reusing those already found."""
+	if ((3 in difCrossSecIds) and (1 in difCrossSecIds)):
+		__gluSplitCS, __gluProdCS = cSs[difCrossSecIds.index(3)], cSs[difCrossSecIds.index(1)]
+	else:
+		__gluSplitCS, __gluProdCS = calc_cSs([3,1],S123,PperpSquared,y,code1,code2)
+	crossSecsGluSplit.store(__gluSplitCS)
+	crossSecsGluProd.store(__gluProdCS)
+
+def solve_sudakovs(PperpSquaredMax,S123,difCrossSecIds,code1,code2,logCrosSecs = None,caseGroupId = None):
+	"""A function to generate a PperpSquared and y for an emission or splitting, using the Sudakov form factor."""
+	##Codes 1,2 still needed to get the charges for EM radiation.
+	##Using p5 of "Fooling around with the Sudakov veto algorithm" for multiple emission form.
+	##Processes are summed in one veto then one is chosen by weight, unless the competition solver is in use.
+	assert assertions.all_are_numbers([PperpSquaredMax,S123])
+	assert (type(difCrossSecIds) == list)
+	__kQs = particleData.knownParticles.get_known_quarks()
+	__gC = particleData.knownParticles.get_code_from_name('gluon')
+	__expectedCodes = __kQs + [-x for x in __kQs] + [__gC]
+	assert ((code1 in __expectedCodes) and (code2 in __expectedCodes))
+	__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
+	if ((PperpSquaredMax < __cutOff) or (S123/4.0 < __cutOff)): ##No phase space above the cut-off.
+		return None, None, None
+	__tables = find_tables(PperpSquaredMax,S123,difCrossSecIds,code1,code2)
+	if (__tables != None):
+		__PperpSquaredi, __yi, __chosenId = __tables.solve(PperpSquaredMax,S123,difCrossSecIds,code1,code2)
+		if ((logCrosSecs == 1) and (__PperpSquaredi != None)):
+			store_cross_sections(S123,__PperpSquaredi,__yi,[],[],code1,code2)
+		return __PperpSquaredi, __yi, __chosenId
+	if competitionSolverOn:
+		return solve_sudakovs_competition(PperpSquaredMax,S123,difCrossSecIds,code1,code2,logCrosSecs)
+	__prefactor = overestimates.get_prefactor(caseGroupId,S123)
+	__PperpSquaredi, __yi, __cSs = run_veto_algorithm(PperpSquaredMax,S123,difCrossSecIds,code1,code2,__prefactor,overestimatePrimitive(S123),caseGroupId)
+	if (__PperpSquaredi == None):
+		return None, None, None
+	__chosenId = choose_process(difCrossSecIds,__cSs)
+	if (logCrosSecs == 1):
+		store_cross_sections(S123,__PperpSquaredi,__yi,difCrossSecIds,__cSs,code1,code2)
 	return __PperpSquaredi, __yi, __chosenId
 
+def solve_sudakovs_competition(PperpSquaredMax,S123,difCrossSecIds,code1,code2,logCrosSecs = None):
+	"""A function to generate a PperpSquared, y and process by giving each process its own overestimate and keeping the highest PperpSquared."""
+	##The competition (or 'winner takes all') form of the veto algorithm, p5 of "Fooling around with the Sudakov veto algorithm".
+	##Each process has its own trial sequence with the tight prefactor from calc_process_prefactor, so rare processes cost few trials.
+	__overestimate = overestimatePrimitive(S123)
+	__winningPperpSquared, __winningY, __chosenId = None, None, None
+	for __difCrossSecId in difCrossSecIds:
+		__prefactor = calc_process_prefactor(__difCrossSecId,S123,code1,code2)
+		__PperpSquaredi, __yi, __cSs = run_veto_algorithm(PperpSquaredMax,S123,[__difCrossSecId],code1,code2,__prefactor,__overestimate)
+		if ((__PperpSquaredi != None) and ((__winningPperpSquared == None) or (__PperpSquaredi > __winningPperpSquared))):
+			__winningPperpSquared, __winningY, __chosenId = __PperpSquaredi, __yi, __difCrossSecId
+	if (__winningPperpSquared == None):
+		return None, None, None
+	if (logCrosSecs == 1):
+		store_cross_sections(S123,__winningPperpSquared,__winningY,[],[],code1,code2)
+	return __winningPperpSquared, __winningY, __chosenId
+
+def case_group_cross_section_ids(caseGroupId):
+	"""A function to return the differential cross section Ids of the processes possible for a case group."""
+	assert (caseGroupId in [0,1,2])
+	if (caseGroupId == 0):
+		__difCrossSecIds = [0] ##Gluon emission always possible.
+		if assertions.EM_radiation_on():
+			__difCrossSecIds.append(6) ##Photon emission possible.
+	elif (caseGroupId == 1):
+		__difCrossSecIds = [1] ##Gluon emission always possible.
+		if assertions.gluon_splitting_on():
+			__difCrossSecIds.append(3) ##Gluon splitting possible.
+	elif (caseGroupId == 2):
+		__difCrossSecIds = [2] ##Gluon emission always possible.
+		if assertions.gluon_splitting_on():
+			__difCrossSecIds.append(4) ##Gluon 1 splitting possible.
+			__difCrossSecIds.append(5) ##Gluon 2 splitting possible.
+			##Note that gluons 1,2 to not refer to a specific gluon in the dipole, only that there are two gluons.
+	return __difCrossSecIds
+
 def solve_case_group_0(PperpSquaredMax,S123,code1,code2):
 	"""A function to return the next Pperp^2, y and winning process for case group 0/A."""
 	##qqBar, qBarq, qq or qBarqBar so gluon emission or photon emission.
@@ -257,10 +476,8 @@ def solve_case_group_0(PperpSquaredMax,S123,code1,code2):
 	__kQs = particleData.knownParticles.get_known_quarks()
 	__expectedCodes = __kQs + [-x for x in __kQs]
 	assert ((code1 in __expectedCodes) and (code2 in __expectedCodes))
-	__difCrossSecIds = [0] ##Gluon emission always possible.
-	if assertions.EM_radiation_on():
-		__difCrossSecIds.append(6) ##Photon emission possible.
-	__PperpSquared, __y, __difCrossSecId = solve_sudakovs(PperpSquaredMax,S123,__difCrossSecIds,code1,code2)
+	__difCrossSecIds = case_group_cross_section_ids(0)
+	__PperpSquared, __y, __difCrossSecId = solve_sudakovs(PperpSquaredMax,S123,__difCrossSecIds,code1,code2,None,0)
 	__convertIdToProcessCode = {None:0,0:1,1:1,2:1,6:3}
 	return __PperpSquared, __y, __convertIdToProcessCode[__difCrossSecId]
 
@@ -274,10 +491,8 @@ def solve_case_group_1(PperpSquaredMax,S123,code1,code2):
 	assert ((code1 in __expectedCodes) and (code2 in __expectedCodes))
 	assert ((code1 == __gC) or (code2 == __gC)) ##One must be a gluon.
 	assert (not ((code1 == __gC) and (code2 == __gC))) ##One must be q/qBar.
-	__difCrossSecIds = [1] ##Gluon emission always possible.
-	if assertions.gluon_splitting_on():
-		__difCrossSecIds.append(3) ##Gluon splitting possible.
-	__PperpSquared, __y, __difCrossSecId = solve_sudakovs(PperpSquaredMax,S123,__difCrossSecIds,code1,code2,1)
+	__difCrossSecIds = case_group_cross_section_ids(1)
+	__PperpSquared, __y, __difCrossSecId = solve_sudakovs(PperpSquaredMax,S123,__difCrossSecIds,code1,code2,1,1)
 	__convertIdToProcessCode = {None:0,0:1,1:1,2:1,3:2,4:2,5:2}
 	return __PperpSquared, __y, __convertIdToProcessCode[__difCrossSecId]
 
@@ -287,12 +502,8 @@ def solve_case_group_2(PperpSquaredMax,S123,code1,code2):
 	assert assertions.all_are_numbers([PperpSquaredMax,S123])
 	__gC = particleData.knownParticles.get_code_from_name('gluon')
 	assert ((code1 == __gC) and (code2 == __gC))
-	__difCrossSecIds = [2] ##Gluon emission always possible.
-	if assertions.gluon_splitting_on():
-		__difCrossSecIds.append(4) ##Gluon 1 splitting possible.
-		__difCrossSecIds.append(5) ##Gluon 2 splitting possible.
-		##Note that gluons 1,2 to not refer to a specific gluon in the dipole, only that there are two gluons.
-	__PperpSquared, __y, __difCrossSecId = solve_sudakovs(PperpSquaredMax,S123,__difCrossSecIds,code1,code2)
+	__difCrossSecIds = case_group_cross_section_ids(2)
+	__PperpSquared, __y, __difCrossSecId = solve_sudakovs(PperpSquaredMax,S123,__difCrossSecIds,code1,code2,None,2)
 	__convertIdToProcessCode = {None:0,0:1,1:1,2:1,3:2,4:2,5:2}
 	return __PperpSquared, __y, __convertIdToProcessCode[__difCrossSecId]
 
@@ -333,6 +544,138 @@ def solve(PperpSquaredMax,S123,code1,code2):
 
 ##Classes:##
 
+class overestimatePrimitive(object):
+	"""A class for the primitive G of the overestimate, g1(PperpSquared)*h(PperpSquared), and its inverse for a given S123."""
+	##h overestimates the allowed rapidity range with a tangent on each piece between the kinematic limit and zero Pperp^2.
+	##Each piece is tangent at its low Pperp^2 end, or beyond it, so h >= 0 on it as the range is concave and increasing in ln(S123/Pperp^2).
+	##G is zero at Pperp^2 = S123/4 and decreases to -infinity as the overestimate coupling diverges below the cut-off.
+
+	def __init__(self,S123):
+		"""A function to initiate the pieces of the primitive for a given S123."""
+		assert assertions.all_are_numbers([S123])
+		__cutOff = constants.cut_off_energy()*constants.cut_off_energy()
+		assert (S123/4.0 > __cutOff)
+		__alphaSMax = alphaS.get_shower_max()
+		self.__aB = __alphaSMax*alphaSOverestimateB
+		self.__cutOff = __cutOff
+		self.__C = 3.0 / (2.0*math.pi*alphaSOverestimateB)
+		__lnS = math.log(S123/__cutOff)
+		__tangentLs = [math.log(4.0) + __x for __x in rapidityTangentPoints]
+		##Pieces down to the cut-off, with the last carrying on below it:
+		__edgeLs = [math.log(4.0)] + [__L for __L in __tangentLs if (__L < __lnS)]
+		self.__lowEdges, self.__alphas, self.__betas, self.__ps, self.__qs, self.__offsets = [], [], [], [], [], []
+		__offset = 0.0
+		for __i1, __edgeL in enumerate(__edgeLs):
+			__tangentL = __tangentLs[min(__i1,len(__tangentLs) - 1)]
+			__x = math.exp(0.5*__tangentL)/2.0
+			__range = 2.0*math.acosh(__x)
+			__slope = __x/math.sqrt(__x*__x - 1.0)
+			##h = range + slope*(L - tangentL) with L = lnS - ln(Pperp^2/cutOff^2):
+			__p, __q = __range + __slope*(__lnS - __tangentL), -__slope
+			__alpha, __beta = __p - __q/self.__aB, __q/self.__aB
+			self.__ps.append(__p)
+			self.__qs.append(__q)
+			self.__alphas.append(__alpha)
+			self.__betas.append(__beta)
+			self.__offsets.append(__offset)
+			if (__i1 + 1 < len(__edgeLs)):
+				self.__lowEdges.append(S123*math.exp(-__edgeLs[__i1 + 1]))
+				__uHigh, __uLow = 1.0 + self.__aB*(__lnS - __edgeL), 1.0 + self.__aB*(__lnS - __edgeLs[__i1 + 1])
+				__offset -= self.__C*(__alpha*math.log(__uHigh/__uLow) + __beta*(__uHigh - __uLow))
+			else:
+				self.__lowEdges.append(0.0)
+		self.__uHighs = [1.0 + self.__aB*(__lnS - __edgeL) for __edgeL in __edgeLs]
+
+	def find_piece(self,PperpSquared):
+		"""A function to return the index of the piece containing a PperpSquared."""
+		__i1 = 0
+		while (PperpSquared < self.__lowEdges[__i1]):
+			__i1 += 1
+		return __i1
+
+	def calc_h(self,PperpSquared):
+		"""A function to calculate the overestimate, h, of the allowed rapidity range at a PperpSquared."""
+		__i1 = self.find_piece(PperpSquared)
+		return self.__ps[__i1] + self.__qs[__i1]*math.log(PperpSquared/self.__cutOff)
+
+	def calc_G(self,PperpSquared):
+		"""A function to calculate G, the primitive of g1(PperpSquared)*h(PperpSquared)."""
+		assert assertions.all_are_numbers([PperpSquared])
+		__i1 = self.find_piece(PperpSquared)
+		__u, __uHigh = 1.0 + self.__aB*math.log(PperpSquared/self.__cutOff), self.__uHighs[__i1]
+		return self.__offsets[__i1] - self.__C*(self.__alphas[__i1]*math.log(__uHigh/__u) + self.__betas[__i1]*(__uHigh - __u))
+
+	def calc_inv_G(self,valueIn):
+		"""A function to calculate the inverse of G."""
+		assert assertions.all_are_numbers([valueIn])
+		__i1 = 0
+		while ((__i1 + 1 < len(self.__offsets)) and (valueIn < self.__offsets[__i1 + 1])):
+			__i1 += 1
+		__alpha, __beta, __uHigh = self.__alphas[__i1], self.__betas[__i1], self.__uHighs[__i1]
+		##alpha*ln(u) + beta*u = w rearranges to (beta*u/alpha)*exp(beta*u/alpha) = (beta/alpha)*exp(w/alpha):
+		__w = (valueIn - self.__offsets[__i1])/self.__C + __alpha*math.log(__uHigh) + __beta*__uHigh
+		__s = __beta/__alpha
+		__z = max(__s*math.exp(__w/__alpha),-1.0/math.e)
+		__u = lambert_w0(__z)/__s
+		if (__u <= 0.0): ##At the pole of the overestimate coupling, far below the cut-off.
+			return 0.0
+		return self.__cutOff*math.exp((__u - 1.0)/self.__aB)
+
+class overestimatePrefactors(object):
+	"""A class for the prefactor of the overestimation function g for each case group and S123 band."""
+	##Each prefactor is the analytic bound of calc_case_group_prefactor for the band, so is an overestimate without any..
+	##..warm-up sample. Veto ratios above 1 would mean the overestimate was not one there, so they are kept to be reported..
+	##..and the prefactor of that case group and band is raised at once to cover them with the safety margin.
+
+	def __init__(self):
+		"""A function to initiate the prefactors, each worked out when first needed."""
+		self.__safetyMargin = constants.overestimate_safety_margin()
+		assert (self.__safetyMargin >= 0.0)
+		self.__prefactors = {}
+		self.__violations = []
+
+	def get_prefactor(self,caseGroupId,S123):
+		"""A function to return the prefactor of g for a case group and S123."""
+		if (caseGroupId == None):
+			return 1.0
+		__key = (caseGroupId,S123_band(S123))
+		if (__key not in self.__prefactors):
+			self.__prefactors[__key] = calc_case_group_prefactor(caseGroupId,S123_band_max(__key[1]))
+		return self.__prefactors[__key]
+
+	def record(self,caseGroupId,S123,ratio):
+		"""A function to record a veto ratio above 1 for a case group and S123, raising its prefactor to cover it."""
+		if ((caseGroupId == None) or (ratio <= 1.0)):
+			return
+		self.__violations.append([caseGroupId,S123,ratio])
+		##The ratio is to g with the prefactor in use, so the prefactor needed is that times the ratio.
+		__prefactor = self.get_prefactor(caseGroupId,S123)
+		__raised = min(__prefactor*ratio*(1.0 + self.__safetyMargin),1.0)
+		self.__prefactors[(caseGroupId,S123_band(S123))] = max(__prefactor,__raised)
+
+	def get_prefactors(self):
+		"""A function to return the prefactor for each (case group, S123 band) used so far."""
+		return dict(self.__prefactors)
+
+	def get_violations(self):
+		"""A function to return the case group, S123 and ratio of every veto ratio seen above 1."""
+		return [list(__violation) for __violation in self.__violations]
+
+	def report(self):
+		"""A function to print the prefactors used and any veto ratios seen above 1."""
+		print "\n-------------------------------"
+		print "Sudakov overestimate report:"
+		print "-------------------------------"
+		for __key in sorted(self.__prefactors.keys()):
+			print "Case group", __key[0], "S123 band", __key[1], "had prefactor", self.__prefactors[__key]
+		if self.__violations:
+			print "\nWARNING:", len(self.__violations), "veto ratios were above 1, the largest being", max([__v[2] for __v in self.__violations])
+		else:
+			print "\nNo veto ratios were above 1."
+
+##Set up the overestimate prefactors:##
+overestimates = overestimatePrefactors()
+
 ##Module test code:##
 if __name__ == "__main__":
 	##Import modules required for testing:##
@@ -0,0 +1,201 @@
+####~~ PyShower 1.0 ~~####
+###Copyright 2015/16, Daniel Osborne, All Rights Reserved###
+##Durham Thesis: 'Simulations for Particle Physics: Implementing the Colour Dipole Model with Invariant Transverse Momentum Ordering'.##
+##For: MPhys Theoretical Physics.##
+
+"""A module for limiting the number of veto trials a solve or an event may take, so a runaway veto loop can't stall a run."""
+
+##Each veto loop stops once its solve has taken the solve budget and the showers stop an event once it has taken the event budget.
+##What then happens follows the policy: 'abort' showers no more of the event, which is given back unshowered, 'skip' gives..
+##..the dipole (or, for the event budget, the rest of the event) no more emissions and 'fail' stops the run by raising..
+##..trialBudgetExceeded, which carries the diagnostic so a driver running many jobs can catch it and log it.
+##Every hit stores a diagnostic, with the random number generator state the solve began from so it can be reproduced.
+##Solves outside any shower, as in the matrix element generator, call fail instead so always stop the run, leaving the shower alone.
+
+##Import required modules:##
+import constants
+import counters
+
+print "\n////////////////////////////"
+print "Loading trialBudgets module:"
+print "////////////////////////////\n"
+
+##Policies a trial budget can follow:##
+policies = ['abort','skip','fail']
+
+##Functions:##
+
+def check_is_trialBudget(toCheck):
+	"""A function to check for an instance of the trialBudget class."""
+	return isinstance(toCheck,trialBudget)
+
+##Classes:##
+
+class trialBudgetExceeded(RuntimeError):
+	"""A class for the error raised when a trial budget is exceeded with the 'fail' policy, carrying its diagnostic."""
+	##Raised rather than asserted so the run still stops with python -O.
+
+	def __init__(self,diagnostic):
+		"""A function to initiate the error from the diagnostic of the budget exceeded."""
+		RuntimeError.__init__(self,"Trial budget exceeded by " + str(diagnostic['source']) + " with the policy 'fail'.")
+		self.diagnostic = diagnostic
+
+class trialBudget(object):
+	"""A class for counting the veto trials of each solve and event against their budgets and acting on any exceeded."""
+
+	def __init__(self):
+		"""A function to initiate a trial budget with the default budgets and policy."""
+		self.set_budgets(constants.solve_trial_budget(),constants.event_trial_budget(),constants.trial_budget_policy())
+		self.__diagnostics = []
+		self.start_event()
+
+	def set_budgets(self,solveBudget,eventBudget,policy):
+		"""A function to set the number of trials a solve and an event may take and the policy followed when exceeded."""
+		assert ((type(solveBudget) == int) and (solveBudget > 0))
+		assert ((type(eventBudget) == int) and (eventBudget > 0))
+		assert (policy in policies)
+		self.__solveBudget, self.__eventBudget, self.__policy = solveBudget, eventBudget, policy
+
+	def get_solve_budget(self):
+		"""A function to return the number of trials a solve may take."""
+		return self.__solveBudget
+
+	def get_event_budget(self):
+		"""A function to return the number of trials an event may take."""
+		return self.__eventBudget
+
+	def get_policy(self):
+		"""A function to return the policy followed when a budget is exceeded."""
+		return self.__policy
+
+	def start_event(self):
+		"""A function to begin counting the trials of a new event."""
+		self.__eventTrials = 0
+		self.__eventStopped, self.__eventAborted = False, False
+
+	def count_trials(self,numTrials):
+		"""A function to add trials to those of the current event."""
+		self.__eventTrials += numTrials
+
+	def get_event_trials(self):
+		"""A function to return the number of trials the current event has taken."""
+		return self.__eventTrials
+
+	def event_aborted(self):
+		"""A function to return whether the current event is to be given back unshowered."""
+		return self.__eventAborted
+
+	def store_diagnostic(self,source,codes,S123,PperpSquaredRange,numTrials,rngState,policy):
+		"""A function to store, count and print a diagnostic for a budget exceeded, returning it."""
+		__diagnostic = {'source':source,'codes':list(codes),'S123':S123,'PperpSquaredRange':list(PperpSquaredRange)}
+		__diagnostic.update({'trials':numTrials,'policy':policy,'rngState':rngState})
+		self.__diagnostics.append(__diagnostic)
+		if (source == 'event'):
+			counters.eventBudgetHitCounter.count()
+		else:
+			counters.solveBudgetHitCounter.count()
+		print "Trial budget exceeded:", dict([(__key,__value) for __key, __value in __diagnostic.items() if (__key != 'rngState')])
+		return __diagnostic
+
+	def exceeded(self,source,codes,S123,PperpSquaredRange,numTrials,rngState):
+		"""A function to store a diagnostic for a budget exceeded and follow the policy, with the Pperp^2 range the trials covered."""
+		##source is the solver, or 'event' for the event budget. Only 'fail' stops here, the caller ends its loop otherwise.
+		__diagnostic = self.store_diagnostic(source,codes,S123,PperpSquaredRange,numTrials,rngState,self.__policy)
+		if (self.__policy == 'fail'):
+			print "Stopping the run as the trial budget policy is 'fail'!"
+			raise trialBudgetExceeded(dict(__diagnostic))
+		elif (self.__policy == 'abort'):
+			self.__eventAborted = True
+
+	def fail(self,source,codes,S123,PperpSquaredRange,numTrials,rngState):
+		"""A function to store a diagnostic for a budget exceeded by a solve outside any shower and stop, whatever the policy."""
+		##e.g. the matrix element generator, which has no event to abort or dipole to skip, and mustn't change the state of the shower.
+		raise trialBudgetExceeded(dict(self.store_diagnostic(source,codes,S123,PperpSquaredRange,numTrials,rngState,'fail')))
+
+	def event_stopped(self,codes = [],S123 = None,PperpSquaredRange = []):
+		"""A function to return whether the current event should stop showering, checking its budget with what it is showering."""
+		if ((not self.__eventStopped) and (self.__eventTrials >= self.__eventBudget)):
+			self.__eventStopped = True
+			self.exceeded('event',codes,S123,PperpSquaredRange,self.__eventTrials,None)
+		return (self.__eventStopped or self.__eventAborted)
+
+	def get_diagnostics(self):
+		"""A function to return the diagnostic of every budget exceeded."""
+		return [dict(__diagnostic) for __diagnostic in self.__diagnostics]
+
+	def report(self):
+		"""A function to print the number of budgets exceeded and where."""
+		print "\n--------------------"
+		print "Trial budget report:"
+		print "--------------------"
+		print "Solves may take", self.__solveBudget, "trials and events", self.__eventBudget, "with the policy '" + self.__policy + "'."
+		print "There were", counters.solveBudgetHitCounter.counted(), "solves and", counters.eventBudgetHitCounter.counted(), "events over budget."
+		for __diagnostic in self.__diagnostics:
+			print __diagnostic['source'], "with codes", __diagnostic['codes'], "and S123", __diagnostic['S123'], "took", __diagnostic['trials'], "trials."
+
+##Set up the trial budget:##
+budget = trialBudget()
+
+##Module test code:##
+if __name__ == "__main__":
+	##Import modules required for testing:##
+	import assertions
+	import random
+
+	##Begin testing:##
+	print "\n----------------------------------------------------------------------"
+	print "----------------------------------------------------------------------\n"
+	print "////////////////////////////"
+	print "Testing trialBudgets module:"
+	print "////////////////////////////"
+	assertions.pause(__name__)
+
+	##Setup here:##
+	tBudget = trialBudget()
+	tBudget.set_budgets(10,25,'skip')
+
+	##Test check_is_trialBudget:##
+	print "\n--------------------------------------------------\n"
+	print "Testing check_is_trialBudget:\n"
+	print "Calling check_is_trialBudget on instance: " , check_is_trialBudget(tBudget)
+	print "Calling check_is_trialBudget on 1.055: " , check_is_trialBudget(1.055)
+	print "Calling check_is_trialBudget on 'word': " , check_is_trialBudget('word')
+	tResults = [check_is_trialBudget(tBudget),check_is_trialBudget(1.055),check_is_trialBudget('word')]
+	if (sum(tResults) == 1):
+		print "\nTest successful!"
+	else:
+		print "\nTest failed!"
+	print "\nFinished testing check_is_trialBudget."
+	assertions.pause(__name__)
+
+	##Test trialBudget class:##
+	print "\n--------------------------------------------------\n"
+	print "Testing trialBudget:\n"
+	tBudget.start_event()
+	tBudget.count_trials(20)
+	tStopped1 = tBudget.event_stopped([1,-1],8315.0,[8315.0,1.0])
+	tBudget.count_trials(10)
+	tStopped2 = tBudget.event_stopped([1,-1],8315.0,[8315.0,1.0])
+	tBudget.set_budgets(10,25,'abort')
+	tBudget.exceeded('sudakovs',[21,21],100.0,[25.0,2.0],10,random.getstate())
+	print "The event stopped after 20 and 30 trials:", tStopped1, tStopped2, "and was aborted:", tBudget.event_aborted()
+	tBudget.report()
+	tBudget.set_budgets(10,25,'fail')
+	try:
+		tBudget.exceeded('sudakovs',[21,21],100.0,[25.0,2.0],10,random.getstate())
+		tRaised = None
+	except trialBudgetExceeded as tError:
+		tRaised = tError.diagnostic
+	print "The 'fail' policy raised an error with the diagnostic:", (tRaised != None)
+	if ((not tStopped1) and tStopped2 and tBudget.event_aborted() and (len(tBudget.get_diagnostics()) == 3) and (tRaised != None)):
+		print "\nTest successful!"
+	else:
+		print "\nTest failed!"
+	print "\nFinished testing trialBudget."
+	assertions.pause(__name__)
+
+	##Done testing:##
+	print "\n---------------------------------------------\n"
+	print "//////////////////////////////////////"
+	print "Finished checking trialBudgets module!"
+	print "//////////////////////////////////////"